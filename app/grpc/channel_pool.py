@@ -0,0 +1,114 @@
+import grpc
+import itertools
+import os
+from app.grpc.clients_grpc_client import AsyncClientsGrpcClient
+from app.grpc.products_grpc_client import AsyncProductsGrpcClient
+from app.grpc.orders_grpc_client import AsyncOrdersGrpcClient
+
+# Opciones comunes para canales de larga duración:
+# keepalive para detectar conexiones muertas y subchannel pool local para que
+# cada canal del pool abra su propia conexión HTTP/2 en vez de compartirla
+CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", int(os.getenv("GRPC_KEEPALIVE_TIME_MS", 30000))),
+    ("grpc.keepalive_timeout_ms", int(os.getenv("GRPC_KEEPALIVE_TIMEOUT_MS", 10000))),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.use_local_subchannel_pool", 1),
+]
+
+# Upstreams conocidos: nombre → (variable host, variable puerto, puerto por defecto, clase cliente)
+UPSTREAMS = {
+    "clients": ("CLIENTS_GRPC_HOST", "CLIENTS_GRPC_PORT", "50051", AsyncClientsGrpcClient),
+    "products": ("PRODUCTS_GRPC_HOST", "PRODUCTS_GRPC_PORT", "50052", AsyncProductsGrpcClient),
+    "orders": ("ORDERS_GRPC_HOST", "ORDERS_GRPC_PORT", "50053", AsyncOrdersGrpcClient),
+}
+
+
+class _UpstreamPool:
+    """N canales grpc.aio abiertos hacia un mismo upstream, repartidos en round-robin"""
+
+    def __init__(self, name, target, client_class, size):
+        self.name = name
+        self.target = target
+        self.channels = []
+        self.clients = []
+
+        for _ in range(size):
+            channel = grpc.aio.insecure_channel(target, options=CHANNEL_OPTIONS)
+            self.channels.append(channel)
+            # Un cliente (y su stub) por canal, compartido por todas las peticiones
+            self.clients.append(client_class(channel=channel))
+            # Inicia la conexión sin esperar a la primera petición
+            channel.get_state(try_to_connect=True)
+
+        self._next = itertools.cycle(range(size))
+
+    def next_client(self):
+        return self.clients[next(self._next)]
+
+    def states(self):
+        return [channel.get_state(try_to_connect=False).name for channel in self.channels]
+
+    async def close(self):
+        for channel in self.channels:
+            await channel.close()
+
+
+class GrpcChannelRegistry:
+    """
+    Registro de canales gRPC compartidos por toda la aplicación.
+    Lo abre y cierra el lifespan de FastAPI (app/main.py).
+    """
+
+    def __init__(self):
+        self._pools = {}
+
+    @property
+    def is_open(self):
+        return bool(self._pools)
+
+    def open(self):
+        """Abrir los canales hacia todos los upstreams (debe llamarse dentro del event loop)"""
+        if self.is_open:
+            return
+        size = max(1, int(os.getenv("GRPC_CHANNELS_PER_UPSTREAM", 1)))
+        for name, (host_var, port_var, default_port, client_class) in UPSTREAMS.items():
+            host = os.getenv(host_var, "localhost")
+            port = os.getenv(port_var, default_port)
+            self._pools[name] = _UpstreamPool(name, f"{host}:{port}", client_class, size)
+
+    async def close(self):
+        """Cerrar todos los canales abiertos"""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.close()
+
+    def get(self, name):
+        """Obtener un cliente compartido del upstream indicado"""
+        if not self.is_open:
+            # Uso fuera del lifespan (scripts, pruebas manuales): abrir bajo demanda
+            self.open()
+        return self._pools[name].next_client()
+
+    def clients(self) -> AsyncClientsGrpcClient:
+        return self.get("clients")
+
+    def products(self) -> AsyncProductsGrpcClient:
+        return self.get("products")
+
+    def orders(self) -> AsyncOrdersGrpcClient:
+        return self.get("orders")
+
+    def connectivity(self):
+        """Estado de conectividad de cada canal, por upstream"""
+        return {
+            name: {
+                "target": pool.target,
+                "channels": pool.states(),
+            }
+            for name, pool in self._pools.items()
+        }
+
+
+# Instancia única usada por las rutas
+channel_registry = GrpcChannelRegistry()
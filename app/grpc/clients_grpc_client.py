@@ -1,42 +1,57 @@
 import grpc
 from app.grpc import clients_pb2, clients_pb2_grpc
+from app.grpc.coalescing import coalesced_call
 import os
 
-class ClientsGrpcClient:
-    def __init__(self):
-        host = os.getenv('CLIENTS_GRPC_HOST', 'localhost')
-        port = os.getenv('CLIENTS_GRPC_PORT', '50051')
-        self.channel = grpc.insecure_channel(f'{host}:{port}')
+class AsyncClientsGrpcClient:
+    """Cliente grpc.aio del microservicio: las llamadas no bloquean el event loop"""
+
+    def __init__(self, channel=None):
+        # Si se recibe un canal compartido (channel_pool), no es responsabilidad de este cliente cerrarlo
+        self._owns_channel = channel is None
+        if channel is None:
+            host = os.getenv('CLIENTS_GRPC_HOST', 'localhost')
+            port = os.getenv('CLIENTS_GRPC_PORT', '50051')
+            channel = grpc.aio.insecure_channel(f'{host}:{port}')
+        self.channel = channel
         self.stub = clients_pb2_grpc.ClientServiceStub(self.channel)
-    
-    def create_client(self, data):
+
+    async def create_client(self, data):
         request = clients_pb2.CreateClientRequest(**data)
-        return self.stub.CreateClient(request)
-    
-    def get_all_clients(self, filters=None):
+        return await self.stub.CreateClient(request)
+
+    async def get_all_clients(self, filters=None):
+        if filters is None:
+            filters = {}
+        request = clients_pb2.GetAllClientsRequest(**filters)
+        return await coalesced_call("clients.GetAllClients", self.stub.GetAllClients, request)
+
+    def stream_clients(self, filters=None):
+        # Server streaming: devuelve la llamada, los mensajes se leen a medida que llegan
         if filters is None:
             filters = {}
         request = clients_pb2.GetAllClientsRequest(**filters)
-        return self.stub.GetAllClients(request)
-    
-    def get_client_by_id(self, client_id, include_password=False):
+        return self.stub.StreamClients(request)
+
+    async def get_client_by_id(self, client_id, include_password=False):
         request = clients_pb2.GetClientByIdRequest(
             id=client_id,
             includePassword=include_password
         )
-        return self.stub.GetClientById(request)
-    
-    def update_client(self, client_id, data):
+        return await coalesced_call("clients.GetClientById", self.stub.GetClientById, request)
+
+    async def update_client(self, client_id, data):
         request = clients_pb2.UpdateClientRequest(id=client_id, **data)
-        return self.stub.UpdateClient(request)
-    
-    def update_password(self, client_id, password):
+        return await self.stub.UpdateClient(request)
+
+    async def update_password(self, client_id, password):
         request = clients_pb2.UpdatePasswordRequest(id=client_id, password=password)
-        return self.stub.UpdatePassword(request)
-    
-    def delete_client(self, client_id):
+        return await self.stub.UpdatePassword(request)
+
+    async def delete_client(self, client_id):
         request = clients_pb2.DeleteClientRequest(id=client_id)
-        return self.stub.DeleteClient(request)
-    
-    def close(self):
-        self.channel.close()
\ No newline at end of file
+        return await self.stub.DeleteClient(request)
+
+    async def close(self):
+        if self._owns_channel:
+            await self.channel.close()
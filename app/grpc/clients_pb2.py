@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rclients.proto\x12\x07\x63lients\"\xa0\x01\n\x13\x43reateClientRequest\x12\x11\n\tfirstName\x18\x01 \x01(\t\x12\x10\n\x08lastName\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\x12\x10\n\x08username\x18\x04 \x01(\t\x12\x10\n\x08password\x18\x05 \x01(\t\x12\x11\n\tbirthDate\x18\x06 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x07 \x01(\t\x12\r\n\x05phone\x18\x08 \x01(\t\"W\n\x14GetAllClientsRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\x12\x10\n\x08username\x18\x03 \x01(\t\x12\x10\n\x08isActive\x18\x04 \x01(\t\";\n\x14GetClientByIdRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x17\n\x0fincludePassword\x18\x02 \x01(\x08\"\x9a\x01\n\x13UpdateClientRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\tfirstName\x18\x02 \x01(\t\x12\x10\n\x08lastName\x18\x03 \x01(\t\x12\r\n\x05\x65mail\x18\x04 \x01(\t\x12\x10\n\x08username\x18\x05 \x01(\t\x12\x11\n\tbirthDate\x18\x06 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x07 \x01(\t\x12\r\n\x05phone\x18\x08 \x01(\t\"5\n\x15UpdatePasswordRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"!\n\x13\x44\x65leteClientRequest\x12\n\n\x02id\x18\x01 \x01(\t\"\xfe\x01\n\x0e\x43lientResponse\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\tfirstName\x18\x02 \x01(\t\x12\x10\n\x08lastName\x18\x03 \x01(\t\x12\r\n\x05\x65mail\x18\x04 \x01(\t\x12\x10\n\x08username\x18\x05 \x01(\t\x12\x10\n\x08password\x18\x06 \x01(\t\x12\x11\n\tbirthDate\x18\x07 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x08 \x01(\t\x12\r\n\x05phone\x18\t \x01(\t\x12\x0c\n\x04role\x18\n \x01(\t\x12\x10\n\x08isActive\x18\x0b \x01(\x08\x12\x11\n\tcreatedAt\x18\x0c \x01(\t\x12\x11\n\tupdatedAt\x18\r \x01(\t\x12\x0f\n\x07message\x18\x0e \x01(\t\"M\n\x12\x43lientListResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12(\n\x07\x63lients\x18\x02 \x03(\x0b\x32\x17.clients.ClientResponse\"\"\n\x0fMessageResponse\x12\x0f\n\x07message\x18\x01 \x01(\t2\xc7\x03\n\rClientService\x12\x45\n\x0c\x43reateClient\x12\x1c.clients.CreateClientRequest\x1a\x17.clients.ClientResponse\x12K\n\rGetAllClients\x12\x1d.clients.GetAllClientsRequest\x1a\x1b.clients.ClientListResponse\x12G\n\rGetClientById\x12\x1d.clients.GetClientByIdRequest\x1a\x17.clients.ClientResponse\x12\x45\n\x0cUpdateClient\x12\x1c.clients.UpdateClientRequest\x1a\x17.clients.ClientResponse\x12J\n\x0eUpdatePassword\x12\x1e.clients.UpdatePasswordRequest\x1a\x18.clients.MessageResponse\x12\x46\n\x0c\x44\x65leteClient\x12\x1c.clients.DeleteClientRequest\x1a\x18.clients.MessageResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rclients.proto\x12\x07\x63lients\"\xa0\x01\n\x13\x43reateClientRequest\x12\x11\n\tfirstName\x18\x01 \x01(\t\x12\x10\n\x08lastName\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\x12\x10\n\x08username\x18\x04 \x01(\t\x12\x10\n\x08password\x18\x05 \x01(\t\x12\x11\n\tbirthDate\x18\x06 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x07 \x01(\t\x12\r\n\x05phone\x18\x08 \x01(\t\"W\n\x14GetAllClientsRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\x12\x10\n\x08username\x18\x03 \x01(\t\x12\x10\n\x08isActive\x18\x04 \x01(\t\";\n\x14GetClientByIdRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x17\n\x0fincludePassword\x18\x02 \x01(\x08\"\x9a\x01\n\x13UpdateClientRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\tfirstName\x18\x02 \x01(\t\x12\x10\n\x08lastName\x18\x03 \x01(\t\x12\r\n\x05\x65mail\x18\x04 \x01(\t\x12\x10\n\x08username\x18\x05 \x01(\t\x12\x11\n\tbirthDate\x18\x06 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x07 \x01(\t\x12\r\n\x05phone\x18\x08 \x01(\t\"5\n\x15UpdatePasswordRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"!\n\x13\x44\x65leteClientRequest\x12\n\n\x02id\x18\x01 \x01(\t\"\xfe\x01\n\x0e\x43lientResponse\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\tfirstName\x18\x02 \x01(\t\x12\x10\n\x08lastName\x18\x03 \x01(\t\x12\r\n\x05\x65mail\x18\x04 \x01(\t\x12\x10\n\x08username\x18\x05 \x01(\t\x12\x10\n\x08password\x18\x06 \x01(\t\x12\x11\n\tbirthDate\x18\x07 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x08 \x01(\t\x12\r\n\x05phone\x18\t \x01(\t\x12\x0c\n\x04role\x18\n \x01(\t\x12\x10\n\x08isActive\x18\x0b \x01(\x08\x12\x11\n\tcreatedAt\x18\x0c \x01(\t\x12\x11\n\tupdatedAt\x18\r \x01(\t\x12\x0f\n\x07message\x18\x0e \x01(\t\"M\n\x12\x43lientListResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12(\n\x07\x63lients\x18\x02 \x03(\x0b\x32\x17.clients.ClientResponse\"\"\n\x0fMessageResponse\x12\x0f\n\x07message\x18\x01 \x01(\t2\x92\x04\n\rClientService\x12\x45\n\x0c\x43reateClient\x12\x1c.clients.CreateClientRequest\x1a\x17.clients.ClientResponse\x12K\n\rGetAllClients\x12\x1d.clients.GetAllClientsRequest\x1a\x1b.clients.ClientListResponse\x12G\n\rGetClientById\x12\x1d.clients.GetClientByIdRequest\x1a\x17.clients.ClientResponse\x12\x45\n\x0cUpdateClient\x12\x1c.clients.UpdateClientRequest\x1a\x17.clients.ClientResponse\x12J\n\x0eUpdatePassword\x12\x1e.clients.UpdatePasswordRequest\x1a\x18.clients.MessageResponse\x12\x46\n\x0c\x44\x65leteClient\x12\x1c.clients.DeleteClientRequest\x1a\x18.clients.MessageResponse\x12I\n\rStreamClients\x12\x1d.clients.GetAllClientsRequest\x1a\x17.clients.ClientResponse0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -50,5 +50,5 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_MESSAGERESPONSE']._serialized_start=922
   _globals['_MESSAGERESPONSE']._serialized_end=956
   _globals['_CLIENTSERVICE']._serialized_start=959
-  _globals['_CLIENTSERVICE']._serialized_end=1414
+  _globals['_CLIENTSERVICE']._serialized_end=1489
 # @@protoc_insertion_point(module_scope)
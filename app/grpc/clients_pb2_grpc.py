@@ -4,6 +4,7 @@ import grpc
 import warnings
 
 from . import clients_pb2 as clients__pb2
+
 GRPC_GENERATED_VERSION = '1.76.0'
 GRPC_VERSION = grpc.__version__
 _version_not_supported = False
@@ -63,6 +64,11 @@ class ClientServiceStub(object):
                 request_serializer=clients__pb2.DeleteClientRequest.SerializeToString,
                 response_deserializer=clients__pb2.MessageResponse.FromString,
                 _registered_method=True)
+        self.StreamClients = channel.unary_stream(
+                '/clients.ClientService/StreamClients',
+                request_serializer=clients__pb2.GetAllClientsRequest.SerializeToString,
+                response_deserializer=clients__pb2.ClientResponse.FromString,
+                _registered_method=True)
 
 
 class ClientServiceServicer(object):
@@ -104,6 +110,13 @@ class ClientServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamClients(self, request, context):
+        """Igual que GetAllClients, pero envía los clientes uno a uno (server streaming)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ClientServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -137,6 +150,11 @@ def add_ClientServiceServicer_to_server(servicer, server):
                     request_deserializer=clients__pb2.DeleteClientRequest.FromString,
                     response_serializer=clients__pb2.MessageResponse.SerializeToString,
             ),
+            'StreamClients': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamClients,
+                    request_deserializer=clients__pb2.GetAllClientsRequest.FromString,
+                    response_serializer=clients__pb2.ClientResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'clients.ClientService', rpc_method_handlers)
@@ -309,3 +327,30 @@ class ClientService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamClients(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/clients.ClientService/StreamClients',
+            clients__pb2.GetAllClientsRequest.SerializeToString,
+            clients__pb2.ClientResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
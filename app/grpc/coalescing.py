@@ -0,0 +1,28 @@
+import os
+from app.services.single_flight import SingleFlight
+
+# Agrupar lecturas gRPC idénticas que están en curso al mismo tiempo
+GRPC_COALESCE_READS = os.getenv('GRPC_COALESCE_READS', 'true').lower() == 'true'
+
+# Compartido por todos los clientes y canales del pool: la clave incluye el método
+_reads = SingleFlight()
+
+
+async def coalesced_call(method_name, method, request):
+    """
+    Ejecutar una RPC de lectura unaria agrupándola con las idénticas en curso
+    (mismo método y mismo request serializado). Cada solicitante recibe su
+    propia copia del mensaje de respuesta, que puede modificar sin afectar a los demás.
+    """
+    if not GRPC_COALESCE_READS:
+        return await method(request)
+    key = (method_name, request.SerializeToString(deterministic=True))
+    response = await _reads.do(key, lambda: method(request))
+    copy = type(response)()
+    copy.CopyFrom(response)
+    return copy
+
+
+def coalescing_stats():
+    """Contadores de lecturas gRPC ejecutadas y agrupadas"""
+    return {"enabled": GRPC_COALESCE_READS, **_reads.stats()}
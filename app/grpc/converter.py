@@ -0,0 +1,122 @@
+import base64
+from operator import attrgetter
+from google.protobuf.descriptor import FieldDescriptor
+
+# Conversión protobuf → dict listo para JSON a partir del descriptor de cada mensaje.
+# Los campos se leen todos juntos con attrgetter (una tupla armada en C) y solo los que
+# necesitan conversión (Timestamp, mensajes, repeated, map, bytes) pasan por Python
+
+TIMESTAMP = "google.protobuf.Timestamp"
+
+
+def converter(message_type, fields=None):
+    """
+    Función mensaje → dict para un tipo de mensaje (clase generada o descriptor).
+
+    fields limita y ordena los campos de salida: cada elemento es un nombre o un par
+    (nombre, campos) para elegir también los campos de un mensaje anidado. Sin fields
+    se incluyen todos los campos del mensaje en el orden del .proto.
+
+    Conversión de valores: Timestamp → ISO 8601 (datetime.isoformat()), mensajes
+    anidados → dict, repeated → list, map → dict, bytes → base64; el resto sin cambios.
+
+    Armar el conversor solo recorre el descriptor: las rutas lo crean una vez por
+    tupla de campos y para ?fields= en cada consulta, sin caché.
+    """
+    descriptor = getattr(message_type, "DESCRIPTOR", message_type)
+    return _build(descriptor, fields, {})
+
+
+def to_dict(message, fields=None):
+    """Convertir un mensaje con un conversor de su tipo"""
+    return converter(message.DESCRIPTOR, fields)(message)
+
+
+def _build(descriptor, fields, building):
+    key = (descriptor.full_name, _freeze(fields))
+    if key in building:
+        # Mensaje recursivo: se usa el conversor que se está armando, ya completo al llamarlo
+        return lambda message: building[key](message)
+    building[key] = None
+
+    if fields is None:
+        fields = tuple(field.name for field in descriptor.fields)
+    names, converted = [], []
+    for spec in fields:
+        name, subfields = (spec, None) if isinstance(spec, str) else spec
+        field = descriptor.fields_by_name.get(name)
+        if field is None:
+            raise ValueError(f"{descriptor.full_name} no tiene el campo {name}")
+        names.append(name)
+        convert = _field_converter(field, subfields, building)
+        if convert is not None:
+            converted.append((name, convert))
+
+    names = tuple(names)
+    if len(names) == 1:
+        single = attrgetter(names[0])
+        values = lambda message: (single(message),)
+    else:
+        values = attrgetter(*names)
+
+    if converted:
+        def convert(message):
+            row = dict(zip(names, values(message)))
+            for name, convert_value in converted:
+                row[name] = convert_value(row[name])
+            return row
+    else:
+        def convert(message):
+            return dict(zip(names, values(message)))
+
+    building[key] = convert
+    return convert
+
+
+def _freeze(fields):
+    if fields is None:
+        return None
+    return tuple(
+        field if isinstance(field, str) else (field[0], _freeze(field[1]))
+        for field in fields
+    )
+
+
+def _is_repeated(field):
+    is_repeated = getattr(field, "is_repeated", None)
+    if is_repeated is not None:
+        return is_repeated
+    return field.label == FieldDescriptor.LABEL_REPEATED
+
+
+def _field_converter(field, subfields, building):
+    """Conversión del valor leído del campo; None si se usa tal cual"""
+    if field.message_type is not None and field.message_type.GetOptions().map_entry:
+        value = _value_converter(field.message_type.fields_by_name["value"], subfields, building)
+        if value is None:
+            return dict
+        return lambda entries: {key: value(item) for key, item in entries.items()}
+    value = _value_converter(field, subfields, building)
+    if _is_repeated(field):
+        if value is None:
+            return list
+        return lambda items: [value(item) for item in items]
+    return value
+
+
+def _value_converter(field, subfields, building):
+    if field.message_type is not None:
+        if field.message_type.full_name == TIMESTAMP and subfields is None:
+            return _timestamp
+        return _build(field.message_type, subfields, building)
+    if field.type == FieldDescriptor.TYPE_BYTES:
+        return _b64
+    return None
+
+
+def _timestamp(value):
+    return value.ToDatetime().isoformat()
+
+
+def _b64(value):
+    return base64.b64encode(value).decode()
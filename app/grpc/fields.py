@@ -0,0 +1,28 @@
+from fastapi import HTTPException
+
+
+def parse_fields(value, descriptor, exposed):
+    """
+    Validar ?fields=a,b,c contra el descriptor del mensaje gRPC y contra los campos
+    que la ruta expone (por ejemplo, nunca password). Devuelve la tupla de campos en
+    el orden de exposed (el orden pedido no cambia la respuesta ni crea otro conversor),
+    o None si no se envió el parámetro.
+    exposed admite nombres o pares (nombre, campos anidados), como el conversor.
+    """
+    if value is None:
+        return None
+    exposed = tuple(field if isinstance(field, str) else field[0] for field in exposed)
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    if not names:
+        raise HTTPException(status_code=400, detail="El parámetro fields no puede estar vacío")
+    for name in names:
+        if name not in descriptor.fields_by_name or name not in exposed:
+            raise HTTPException(status_code=400, detail=f"Campo desconocido en fields: {name}")
+    return tuple(name for name in exposed if name in names)
+
+
+def project(row, fields):
+    """Subconjunto de un dict ya convertido (por ejemplo, una fila en caché)"""
+    if fields is None:
+        return row
+    return {name: row[name] for name in fields}
@@ -1,35 +1,42 @@
 import grpc
 from app.grpc import orders_pb2, orders_pb2_grpc
+from app.grpc.coalescing import coalesced_call
 import os
 
-class OrdersGrpcClient:
-    def __init__(self):
-        host = os.getenv('ORDERS_GRPC_HOST', 'localhost')
-        port = os.getenv('ORDERS_GRPC_PORT', '50052')
-        self.channel = grpc.insecure_channel(f'{host}:{port}')
-        self.stub = orders_pb2_grpc.OrderServiceStub(self.channel)
-    
-    def create_order(self, data):
-        request = orders_pb2_grpc.CreateOrdersRequest(**data)
-        return self.stub.CreateOrder(request)
-    
-    def get_all_orders(self, filters=None):
-        if filters is None:
-            filters = {}
-        request = orders_pb2_grpc.GetAllOrdersRequest(**filters)
-        return self.stub.GetAllOrders(request)
-    
-    def get_order_by_id(self, order_id):
-        request = orders_pb2_grpc.GetOrderByIdRequest(id=order_id)
-        return self.stub.GetOrderById(request)
-    
-    def update_order_status(self, order_id, data):
-        request = orders_pb2_grpc.UpdateOrderStatusRequest(id=order_id, **data)
-        return self.stub.UpdateOrderStatus(request)
-    
-    def delete_order(self, order_id):
-        request = orders_pb2_grpc.DeleteOrderRequest(id=order_id)
-        return self.stub.DeleteOrder(request)
-    
-    def close(self):
-        self.channel.close()
\ No newline at end of file
+class AsyncOrdersGrpcClient:
+    """Cliente grpc.aio del microservicio: las llamadas no bloquean el event loop"""
+    # Las rutas construyen los mensajes gRPC a partir de este módulo
+    orders_pb2 = orders_pb2
+
+    def __init__(self, channel=None):
+        # Si se recibe un canal compartido (channel_pool), no es responsabilidad de este cliente cerrarlo
+        self._owns_channel = channel is None
+        if channel is None:
+            host = os.getenv('ORDERS_GRPC_HOST', 'localhost')
+            port = os.getenv('ORDERS_GRPC_PORT', '50053')
+            channel = grpc.aio.insecure_channel(f'{host}:{port}')
+        self.channel = channel
+        self.stub = orders_pb2_grpc.OrderManagerStub(self.channel)
+
+    async def create_order(self, request):
+        return await self.stub.CreateOrder(request)
+
+    async def get_orders(self, request):
+        return await coalesced_call("orders.GetOrders", self.stub.GetOrders, request)
+
+    def stream_orders(self, request):
+        # Server streaming: devuelve la llamada, los mensajes se leen a medida que llegan
+        return self.stub.StreamOrders(request)
+
+    async def get_order_by_id(self, request):
+        return await coalesced_call("orders.GetOrderById", self.stub.GetOrderById, request)
+
+    async def update_order_status(self, request):
+        return await self.stub.UpdateOrderStatus(request)
+
+    async def delete_order(self, request):
+        return await self.stub.DeleteOrder(request)
+
+    async def close(self):
+        if self._owns_channel:
+            await self.channel.close()
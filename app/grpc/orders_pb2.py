@@ -2,7 +2,7 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # NO CHECKED-IN PROTOBUF GENCODE
 # source: orders.proto
-# Protobuf Python Version: 5.28.1
+# Protobuf Python Version: 6.31.1
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -11,8 +11,8 @@ from google.protobuf import symbol_database as _symbol_database
 from google.protobuf.internal import builder as _builder
 _runtime_version.ValidateProtobufRuntimeVersion(
     _runtime_version.Domain.PUBLIC,
-    5,
-    28,
+    6,
+    31,
     1,
     '',
     'orders.proto'
@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0corders.proto\x12\x06orders\x1a\x1fgoogle/protobuf/timestamp.proto\"r\n\x12\x43reateOrderRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12\x18\n\x10\x64\x65livery_address\x18\x02 \x01(\t\x12\x31\n\x0fitems_to_create\x18\x03 \x03(\x0b\x32\x18.orders.OrderItemRequest\"8\n\x10OrderItemRequest\x12\x12\n\nproduct_id\x18\x01 \x01(\x05\x12\x10\n\x08quantity\x18\x02 \x01(\x05\"\xab\x01\n\x10GetOrdersRequest\x12\x10\n\x08order_id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\x05\x12.\n\nstart_date\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12,\n\x08\x65nd_date\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x16\n\x0e\x63urrent_status\x18\x05 \x01(\t\"!\n\x13GetOrderByIdRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"N\n\x13UpdateStatusRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x12\n\nnew_status\x18\x02 \x01(\t\x12\x17\n\x0ftracking_number\x18\x03 \x01(\t\"=\n\x12\x44\x65leteOrderRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x1b\n\x13\x63\x61ncellation_reason\x18\x02 \x01(\t\"w\n\x11OrderItemResponse\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x10\n\x08order_id\x18\x02 \x01(\x05\x12\x12\n\nproduct_id\x18\x03 \x01(\x05\x12\x10\n\x08quantity\x18\x04 \x01(\x05\x12\x19\n\x11price_at_purchase\x18\x05 \x01(\x01\"\xbd\x02\n\rOrderResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\x05\x12.\n\norder_date\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x18\n\x10\x64\x65livery_address\x18\x04 \x01(\t\x12\x14\n\x0ctotal_amount\x18\x05 \x01(\x01\x12\x16\n\x0e\x63urrent_status\x18\x06 \x01(\t\x12\x17\n\x0ftracking_number\x18\x07 \x01(\t\x12\x1b\n\x13\x63\x61ncellation_reason\x18\x08 \x01(\t\x12(\n\x05items\x18\t \x03(\x0b\x32\x19.orders.OrderItemResponse\x12\x0f\n\x07message\x18\n \x01(\t\x12\x12\n\ncreated_at\x18\x0b \x01(\t\x12\x12\n\nupdated_at\x18\x0c \x01(\t\"I\n\x11OrderListResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12%\n\x06orders\x18\x02 \x03(\x0b\x32\x15.orders.OrderResponse\"\"\n\x0fMessageResponse\x12\x0f\n\x07message\x18\x01 \x01(\t2\xe3\x02\n\x0cOrderManager\x12@\n\x0b\x43reateOrder\x12\x1a.orders.CreateOrderRequest\x1a\x15.orders.OrderResponse\x12@\n\tGetOrders\x12\x18.orders.GetOrdersRequest\x1a\x19.orders.OrderListResponse\x12\x42\n\x0cGetOrderById\x12\x1b.orders.GetOrderByIdRequest\x1a\x15.orders.OrderResponse\x12G\n\x11UpdateOrderStatus\x12\x1b.orders.UpdateStatusRequest\x1a\x15.orders.OrderResponse\x12\x42\n\x0b\x44\x65leteOrder\x12\x1a.orders.DeleteOrderRequest\x1a\x17.orders.MessageResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0corders.proto\x12\x06orders\x1a\x1fgoogle/protobuf/timestamp.proto\"r\n\x12\x43reateOrderRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12\x18\n\x10\x64\x65livery_address\x18\x02 \x01(\t\x12\x31\n\x0fitems_to_create\x18\x03 \x03(\x0b\x32\x18.orders.OrderItemRequest\"8\n\x10OrderItemRequest\x12\x12\n\nproduct_id\x18\x01 \x01(\x05\x12\x10\n\x08quantity\x18\x02 \x01(\x05\"\xab\x01\n\x10GetOrdersRequest\x12\x10\n\x08order_id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\x05\x12.\n\nstart_date\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12,\n\x08\x65nd_date\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x16\n\x0e\x63urrent_status\x18\x05 \x01(\t\"!\n\x13GetOrderByIdRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"N\n\x13UpdateStatusRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x12\n\nnew_status\x18\x02 \x01(\t\x12\x17\n\x0ftracking_number\x18\x03 \x01(\t\"=\n\x12\x44\x65leteOrderRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x1b\n\x13\x63\x61ncellation_reason\x18\x02 \x01(\t\"w\n\x11OrderItemResponse\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x10\n\x08order_id\x18\x02 \x01(\x05\x12\x12\n\nproduct_id\x18\x03 \x01(\x05\x12\x10\n\x08quantity\x18\x04 \x01(\x05\x12\x19\n\x11price_at_purchase\x18\x05 \x01(\x01\"\xbd\x02\n\rOrderResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\x05\x12.\n\norder_date\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x18\n\x10\x64\x65livery_address\x18\x04 \x01(\t\x12\x14\n\x0ctotal_amount\x18\x05 \x01(\x01\x12\x16\n\x0e\x63urrent_status\x18\x06 \x01(\t\x12\x17\n\x0ftracking_number\x18\x07 \x01(\t\x12\x1b\n\x13\x63\x61ncellation_reason\x18\x08 \x01(\t\x12(\n\x05items\x18\t \x03(\x0b\x32\x19.orders.OrderItemResponse\x12\x0f\n\x07message\x18\n \x01(\t\x12\x12\n\ncreated_at\x18\x0b \x01(\t\x12\x12\n\nupdated_at\x18\x0c \x01(\t\"I\n\x11OrderListResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12%\n\x06orders\x18\x02 \x03(\x0b\x32\x15.orders.OrderResponse\"\"\n\x0fMessageResponse\x12\x0f\n\x07message\x18\x01 \x01(\t2\xa6\x03\n\x0cOrderManager\x12@\n\x0b\x43reateOrder\x12\x1a.orders.CreateOrderRequest\x1a\x15.orders.OrderResponse\x12@\n\tGetOrders\x12\x18.orders.GetOrdersRequest\x1a\x19.orders.OrderListResponse\x12\x42\n\x0cGetOrderById\x12\x1b.orders.GetOrderByIdRequest\x1a\x15.orders.OrderResponse\x12G\n\x11UpdateOrderStatus\x12\x1b.orders.UpdateStatusRequest\x1a\x15.orders.OrderResponse\x12\x42\n\x0b\x44\x65leteOrder\x12\x1a.orders.DeleteOrderRequest\x1a\x17.orders.MessageResponse\x12\x41\n\x0cStreamOrders\x12\x18.orders.GetOrdersRequest\x1a\x15.orders.OrderResponse0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -53,5 +53,5 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_MESSAGERESPONSE']._serialized_start=1099
   _globals['_MESSAGERESPONSE']._serialized_end=1133
   _globals['_ORDERMANAGER']._serialized_start=1136
-  _globals['_ORDERMANAGER']._serialized_end=1491
+  _globals['_ORDERMANAGER']._serialized_end=1558
 # @@protoc_insertion_point(module_scope)
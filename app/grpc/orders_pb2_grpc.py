@@ -5,7 +5,7 @@ import warnings
 
 from . import orders_pb2 as orders__pb2
 
-GRPC_GENERATED_VERSION = '1.68.1'
+GRPC_GENERATED_VERSION = '1.76.0'
 GRPC_VERSION = grpc.__version__
 _version_not_supported = False
 
@@ -18,7 +18,7 @@ except ImportError:
 if _version_not_supported:
     raise RuntimeError(
         f'The grpc package installed is at version {GRPC_VERSION},'
-        + f' but the generated code in orders_pb2_grpc.py depends on'
+        + ' but the generated code in orders_pb2_grpc.py depends on'
         + f' grpcio>={GRPC_GENERATED_VERSION}.'
         + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
         + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
@@ -60,6 +60,11 @@ class OrderManagerStub(object):
                 request_serializer=orders__pb2.DeleteOrderRequest.SerializeToString,
                 response_deserializer=orders__pb2.MessageResponse.FromString,
                 _registered_method=True)
+        self.StreamOrders = channel.unary_stream(
+                '/orders.OrderManager/StreamOrders',
+                request_serializer=orders__pb2.GetOrdersRequest.SerializeToString,
+                response_deserializer=orders__pb2.OrderResponse.FromString,
+                _registered_method=True)
 
 
 class OrderManagerServicer(object):
@@ -101,6 +106,13 @@ class OrderManagerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamOrders(self, request, context):
+        """6. Consultar Historial en streaming (mismos filtros que GetOrders, un pedido por mensaje)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_OrderManagerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -129,6 +141,11 @@ def add_OrderManagerServicer_to_server(servicer, server):
                     request_deserializer=orders__pb2.DeleteOrderRequest.FromString,
                     response_serializer=orders__pb2.MessageResponse.SerializeToString,
             ),
+            'StreamOrders': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamOrders,
+                    request_deserializer=orders__pb2.GetOrdersRequest.FromString,
+                    response_serializer=orders__pb2.OrderResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'orders.OrderManager', rpc_method_handlers)
@@ -275,3 +292,30 @@ class OrderManager(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamOrders(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/orders.OrderManager/StreamOrders',
+            orders__pb2.GetOrdersRequest.SerializeToString,
+            orders__pb2.OrderResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,23 +1,38 @@
 import grpc
 from app.grpc import products_pb2, products_pb2_grpc
+from app.grpc.coalescing import coalesced_call
 import os
 
 class ProductsGrpcClient:
-    def __init__(self):
-        host = os.getenv('PRODUCTS_GRPC_HOST', 'localhost')
-        port = os.getenv('PRODUCTS_GRPC_PORT', '50052')
-        self.channel = grpc.insecure_channel(f'{host}:{port}')
+    def __init__(self, channel=None):
+        # Si se recibe un canal compartido (channel_pool), no es responsabilidad de este cliente cerrarlo
+        self._owns_channel = channel is None
+        if channel is None:
+            host = os.getenv('PRODUCTS_GRPC_HOST', 'localhost')
+            port = os.getenv('PRODUCTS_GRPC_PORT', '50052')
+            channel = grpc.insecure_channel(f'{host}:{port}')
+        self.channel = channel
         self.stub = products_pb2_grpc.ProductServiceStub(self.channel)
     
     def get_all_products(self):
         """Obtener todos los productos"""
         request = products_pb2.GetAllProductsRequest()
         return self.stub.GetAllProducts(request)
+
+    def stream_products(self):
+        """Obtener todos los productos uno a uno (server streaming)"""
+        request = products_pb2.GetAllProductsRequest()
+        return self.stub.StreamProducts(request)
     
     def get_product_by_id(self, product_id):
         """Obtener un producto por ID"""
         request = products_pb2.GetProductByIdRequest(id=product_id)
         return self.stub.GetProductById(request)
+
+    def get_products_by_ids(self, product_ids):
+        """Obtener varios productos por ID en una sola llamada (omite los inexistentes)"""
+        request = products_pb2.GetProductsByIdsRequest(ids=product_ids)
+        return self.stub.GetProductsByIds(request)
     
     def create_product(self, data):
         """Crear un nuevo producto"""
@@ -46,5 +61,71 @@ class ProductsGrpcClient:
         return self.stub.DeleteProduct(request)
     
     def close(self):
-        """Cerrar la conexión"""
-        self.channel.close()
\ No newline at end of file
+        """Cerrar la conexión (solo si el canal es propio)"""
+        if self._owns_channel:
+            self.channel.close()
+
+
+class AsyncProductsGrpcClient:
+    """Versión grpc.aio del cliente: las llamadas no bloquean el event loop"""
+
+    def __init__(self, channel=None):
+        # Si se recibe un canal compartido (channel_pool), no es responsabilidad de este cliente cerrarlo
+        self._owns_channel = channel is None
+        if channel is None:
+            host = os.getenv('PRODUCTS_GRPC_HOST', 'localhost')
+            port = os.getenv('PRODUCTS_GRPC_PORT', '50052')
+            channel = grpc.aio.insecure_channel(f'{host}:{port}')
+        self.channel = channel
+        self.stub = products_pb2_grpc.ProductServiceStub(self.channel)
+
+    async def get_all_products(self):
+        """Obtener todos los productos"""
+        request = products_pb2.GetAllProductsRequest()
+        return await coalesced_call("products.GetAllProducts", self.stub.GetAllProducts, request)
+
+    def stream_products(self):
+        """Obtener todos los productos uno a uno (server streaming): devuelve la llamada sin esperar"""
+        request = products_pb2.GetAllProductsRequest()
+        return self.stub.StreamProducts(request)
+
+    async def get_product_by_id(self, product_id):
+        """Obtener un producto por ID"""
+        request = products_pb2.GetProductByIdRequest(id=product_id)
+        return await coalesced_call("products.GetProductById", self.stub.GetProductById, request)
+
+    async def get_products_by_ids(self, product_ids):
+        """Obtener varios productos por ID en una sola llamada (omite los inexistentes)"""
+        request = products_pb2.GetProductsByIdsRequest(ids=product_ids)
+        return await coalesced_call("products.GetProductsByIds", self.stub.GetProductsByIds, request)
+
+    async def create_product(self, data):
+        """Crear un nuevo producto"""
+        request = products_pb2.CreateProductRequest(
+            name=data.get('name'),
+            category=data.get('category'),
+            price=data.get('price'),
+            imageUrl=data.get('imageUrl', '')
+        )
+        return await self.stub.CreateProduct(request)
+
+    async def update_product(self, product_id, data):
+        """Actualizar un producto existente"""
+        request = products_pb2.UpdateProductRequest(
+            id=product_id,
+            name=data.get('name'),
+            category=data.get('category'),
+            price=data.get('price'),
+            imageUrl=data.get('imageUrl', '')
+        )
+        return await self.stub.UpdateProduct(request)
+
+    async def delete_product(self, product_id):
+        """Eliminar un producto (soft delete)"""
+        request = products_pb2.DeleteProductRequest(id=product_id)
+        return await self.stub.DeleteProduct(request)
+
+    async def close(self):
+        """Cerrar la conexión (solo si el canal es propio)"""
+        if self._owns_channel:
+            await self.channel.close()
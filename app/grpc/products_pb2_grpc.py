@@ -60,6 +60,16 @@ class ProductServiceStub(object):
                 request_serializer=products__pb2.DeleteProductRequest.SerializeToString,
                 response_deserializer=products__pb2.DeleteProductResponse.FromString,
                 _registered_method=True)
+        self.StreamProducts = channel.unary_stream(
+                '/products.ProductService/StreamProducts',
+                request_serializer=products__pb2.GetAllProductsRequest.SerializeToString,
+                response_deserializer=products__pb2.Product.FromString,
+                _registered_method=True)
+        self.GetProductsByIds = channel.unary_unary(
+                '/products.ProductService/GetProductsByIds',
+                request_serializer=products__pb2.GetProductsByIdsRequest.SerializeToString,
+                response_deserializer=products__pb2.ProductListResponse.FromString,
+                _registered_method=True)
 
 
 class ProductServiceServicer(object):
@@ -96,6 +106,20 @@ class ProductServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamProducts(self, request, context):
+        """Igual que GetAllProducts, pero envía los productos uno a uno (server streaming)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetProductsByIds(self, request, context):
+        """Varios productos por ID en una sola llamada; los IDs inexistentes se omiten
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ProductServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -124,6 +148,16 @@ def add_ProductServiceServicer_to_server(servicer, server):
                     request_deserializer=products__pb2.DeleteProductRequest.FromString,
                     response_serializer=products__pb2.DeleteProductResponse.SerializeToString,
             ),
+            'StreamProducts': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamProducts,
+                    request_deserializer=products__pb2.GetAllProductsRequest.FromString,
+                    response_serializer=products__pb2.Product.SerializeToString,
+            ),
+            'GetProductsByIds': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetProductsByIds,
+                    request_deserializer=products__pb2.GetProductsByIdsRequest.FromString,
+                    response_serializer=products__pb2.ProductListResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'products.ProductService', rpc_method_handlers)
@@ -270,3 +304,57 @@ class ProductService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamProducts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/products.ProductService/StreamProducts',
+            products__pb2.GetAllProductsRequest.SerializeToString,
+            products__pb2.Product.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetProductsByIds(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/products.ProductService/GetProductsByIds',
+            products__pb2.GetProductsByIdsRequest.SerializeToString,
+            products__pb2.ProductListResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
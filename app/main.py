@@ -1,20 +1,62 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
 
+# Carga variables de entorno desde .env antes de importar los módulos que leen su
+# configuración al importarse (CACHE_BACKEND, CACHE_BUS_*, TOKEN_CACHE_TTL, ...)
+load_dotenv()
+
 # Importa las rutas de cada microservicio expuestas por el gateway
 from app.routes import auth_routes, clients_routes, products_routes, orders_routes
+from app.grpc.channel_pool import channel_registry
+from app.grpc.coalescing import coalescing_stats
+from app.services import auth_service
+from app.services.token_cache import token_cache
+from app.services.revocation import revocation_list
+from app.services.jwt_verifier import jwt_verifier
+from app.middleware.compression_middleware import CompressionMiddleware, compression_stats
+from app.services.fast_json import FastJSONResponse, FastJSONRoute
+from app.services.response_cache import cache_stats, response_store
+from app.services.product_loader import product_loader
+from app.services.invalidation_bus import invalidation_bus
 
-# Carga variables de entorno desde .env
-load_dotenv()
+# Ciclo de vida de la aplicación: recursos compartidos entre peticiones
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Abre los canales gRPC y el cliente HTTP del Auth Service una sola vez
+    channel_registry.open()
+    auth_service.start_client()
+    # Claves para validar JWT localmente (si AUTH_LOCAL_VERIFY está activo)
+    await jwt_verifier.start()
+    # Lista de tokens revocados compartida con las demás instancias
+    await revocation_list.start()
+    # Almacén de la caché de respuestas (en memoria o compartido, según CACHE_BACKEND)
+    await response_store.open()
+    # Bus de invalidación de caché con las demás instancias
+    await invalidation_bus.start()
+    try:
+        yield
+    finally:
+        await invalidation_bus.stop()
+        await response_store.close()
+        await revocation_list.stop()
+        await jwt_verifier.stop()
+        await auth_service.close_client()
+        await channel_registry.close()
 
 # Inicializa la aplicación FastAPI con metadatos
 app = FastAPI(
     title="Censudex API Gateway",
     description="API Gateway para microservicios de Censudex",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # Respuestas JSON serializadas directamente a bytes (orjson si está instalado)
+    default_response_class=FastJSONResponse
 )
+# Las rutas definidas en este archivo tampoco pasan por jsonable_encoder
+app.router.route_class = FastJSONRoute
 
 # Configuración de CORS para permitir llamadas desde cualquier origen
 app.add_middleware(
@@ -25,6 +67,9 @@ app.add_middleware(
     allow_headers=["*"],           # Permite todos los headers
 )
 
+# Compresión gzip/br/zstd según Accept-Encoding (las variantes de respuestas en caché se reutilizan)
+app.add_middleware(CompressionMiddleware)
+
 # Registrar routers que redirigen solicitudes a los microservicios
 app.include_router(auth_routes.router)
 app.include_router(clients_routes.router)
@@ -36,6 +81,25 @@ app.include_router(orders_routes.router)
 async def health_check():
     return {"status": "OK", "service": "API Gateway"}
 
+# Estado de conectividad de los canales gRPC hacia cada microservicio
+@app.get("/health/upstreams")
+async def upstreams_health():
+    return {"status": "OK", "upstreams": channel_registry.connectivity()}
+
+# Contadores internos del gateway (cachés, coalescencia, etc.)
+@app.get("/metrics")
+async def metrics():
+    return {
+        "token_cache": token_cache.stats(),
+        "auth_validations": auth_service.validation_stats(),
+        "grpc_coalescing": coalescing_stats(),
+        "product_loader": product_loader.stats(),
+        "jwt_verifier": jwt_verifier.stats(),
+        "revocation": revocation_list.stats(),
+        "response_cache": await cache_stats(),
+        "compression": compression_stats()
+    }
+
 # Ruta raíz de presentación
 @app.get("/")
 async def root():
@@ -1,5 +1,8 @@
 from fastapi import Header, HTTPException
 from app.services import auth_service
+from app.services.token_cache import token_cache
+from app.services.revocation import revocation_list
+from app.services.jwt_verifier import jwt_verifier, TokenRejected
 
 # Middleware encargado de validar el token enviado en las rutas protegidas
 async def verify_token(authorization: str = Header(None)):
@@ -14,11 +17,30 @@ async def verify_token(authorization: str = Header(None)):
     # Extraer el token quitando "Bearer "
     token = authorization.split(" ")[1]
     
+    # Token cerrado con logout → rechazado sin consultar a nadie
+    if await revocation_list.is_revoked(token):
+        raise HTTPException(status_code=401, detail="Token invalido o expirado")
+
+    # Validación reciente en caché → se evita el viaje al Auth Service
+    user_data = token_cache.get(token)
+    if user_data is not None:
+        return user_data
+
+    # Validación local de firma, exp y nbf (si está habilitada y hay clave para el token)
+    if jwt_verifier.enabled:
+        try:
+            claims = jwt_verifier.verify(token)
+        except TokenRejected:
+            raise HTTPException(status_code=401, detail="Token invalido o expirado")
+        if claims is not None:
+            return claims
+
     try:
         # Llamar al servicio que valida el token contra el microservicio de autenticación
         user_data = await auth_service.validate_token(token)
 
-        # Si es válido, se devuelve la información del usuario
+        # Si es válido, se guarda en caché y se devuelve la información del usuario
+        token_cache.set(token, user_data)
         return user_data
 
     except HTTPException:
@@ -0,0 +1,220 @@
+import asyncio
+import gzip
+import os
+from collections import OrderedDict
+from starlette.datastructures import Headers, MutableHeaders
+
+# Algoritmos opcionales: se ofrecen solo si está instalado su paquete
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compresión de respuestas según Accept-Encoding (activada por defecto)
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+# Respuestas más chicas que esto (bytes) se envían sin comprimir
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+# Niveles de cada algoritmo
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv('COMPRESSION_ZSTD_LEVEL', 3))
+# Bytes máximos de variantes comprimidas guardadas (por ETag y algoritmo)
+COMPRESSION_CACHE_MAX_BYTES = int(os.getenv('COMPRESSION_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+# Cuerpos a partir de este tamaño se comprimen en un hilo para no bloquear el event loop
+COMPRESSION_THREAD_MIN_SIZE = 256 * 1024
+
+# Tipos de contenido que vale la pena comprimir
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-protobuf", "text/", "application/javascript", "application/xml"
+)
+
+
+def _gzip(body):
+    # mtime=0: mismo resultado para el mismo cuerpo
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _brotli(body):
+    return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+
+
+def _zstd(body):
+    return zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compress(body)
+
+
+# Algoritmos disponibles en orden de preferencia del gateway (a igual q del cliente)
+ENCODERS = {}
+if brotli is not None:
+    ENCODERS["br"] = _brotli
+if zstandard is not None:
+    ENCODERS["zstd"] = _zstd
+ENCODERS["gzip"] = _gzip
+
+
+def select_encoding(accept_encoding):
+    """
+    Algoritmo a usar según Accept-Encoding (con q-values), o None para enviar sin comprimir.
+    Entre los de mayor q gana el preferido por el gateway; * cubre los no mencionados.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.lower()] = q
+    best, best_q = None, 0.0
+    for coding in ENCODERS:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressedVariants:
+    """LRU de cuerpos ya comprimidos por (ETag, algoritmo), acotado en bytes"""
+
+    def __init__(self, max_bytes=COMPRESSION_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def set(self, key, body):
+        if len(body) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = body
+        self._bytes += len(body)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Variantes comprimidas compartidas por todas las peticiones de esta instancia
+compressed_variants = CompressedVariants()
+
+_counters = {"compressed": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+def compression_stats():
+    """Contadores para /metrics"""
+    return {
+        "enabled": COMPRESSION_ENABLED,
+        "encodings": list(ENCODERS),
+        **_counters,
+        "variants": compressed_variants.stats(),
+    }
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime las respuestas completas (gzip, y br/zstd si están
+    instalados) según Accept-Encoding.
+    No toca respuestas en streaming (NDJSON), ya codificadas, sin cuerpo o menores que
+    COMPRESSION_MIN_SIZE. Si la respuesta trae ETag (respuestas de la caché), la variante
+    comprimida se guarda para no volver a comprimir el mismo contenido.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding"))
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Se retiene hasta saber si el cuerpo llega completo
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            first, start = start, None
+            if message.get("more_body", False):
+                # Streaming: se reenvía tal cual
+                await send(first)
+                await send(message)
+                return
+            first, message = await _compress(first, message, encoding)
+            await send(first)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+
+async def _compress(start, message, encoding):
+    headers = MutableHeaders(raw=start["headers"])
+    body = message.get("body", b"")
+    content_type = headers.get("content-type", "")
+    if (
+        start["status"] != 200
+        or "content-encoding" in headers
+        or len(body) < COMPRESSION_MIN_SIZE
+        or not content_type.startswith(COMPRESSIBLE_TYPES)
+    ):
+        return start, message
+    # La respuesta depende de Accept-Encoding aunque esta vez no se comprima
+    headers.add_vary_header("Accept-Encoding")
+    if encoding is None:
+        return start, message
+
+    etag = headers.get("etag")
+    key = (etag.removeprefix("W/"), encoding) if etag else None
+    compressed = compressed_variants.get(key) if key else None
+    if compressed is None:
+        if len(body) >= COMPRESSION_THREAD_MIN_SIZE:
+            compressed = await asyncio.to_thread(ENCODERS[encoding], body)
+        else:
+            compressed = ENCODERS[encoding](body)
+        if key:
+            compressed_variants.set(key, compressed)
+    if len(compressed) >= len(body):
+        return start, message
+
+    _counters["compressed"] += 1
+    _counters["bytes_in"] += len(body)
+    _counters["bytes_out"] += len(compressed)
+    headers["Content-Encoding"] = encoding
+    headers["Content-Length"] = str(len(compressed))
+    if etag and not etag.startswith("W/"):
+        # Otra representación del mismo contenido: el ETag pasa a ser débil (como NGINX);
+        # If-None-Match usa comparación débil, así que los 304 siguen funcionando
+        headers["ETag"] = "W/" + etag
+    return start, {**message, "body": compressed}
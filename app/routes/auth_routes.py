@@ -1,16 +1,36 @@
-from fastapi import APIRouter, Header, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException
 from pydantic import BaseModel
 from app.services import auth_service
+from app.services.token_cache import token_cache
+from app.services.revocation import revocation_list
+from app.services.response_cache import CLIENT_CACHE_WARM_ON_LOGIN
+from app.services.fast_json import FastJSONRoute
+from app.routes.clients_routes import warm_client_cache
 
-router = APIRouter(prefix="/api/auth", tags=["auth"])
+router = APIRouter(prefix="/api/auth", tags=["auth"], route_class=FastJSONRoute)
 
 class LoginRequest(BaseModel):
     identifier: str
     password: str
 
 @router.post("/login")
-async def login(credentials: LoginRequest):
-    return await auth_service.login(credentials.dict())
+async def login(credentials: LoginRequest, background_tasks: BackgroundTasks):
+    result = await auth_service.login(credentials.dict())
+    if CLIENT_CACHE_WARM_ON_LOGIN:
+        # El perfil se carga después de enviar la respuesta del login
+        user_id = _login_user_id(result)
+        if user_id:
+            background_tasks.add_task(warm_client_cache, user_id)
+    return result
+
+def _login_user_id(result):
+    """ID del usuario en la respuesta del Auth Service ({"user": {"id"}} o {"id"})"""
+    if not isinstance(result, dict):
+        return None
+    user = result.get("user")
+    if isinstance(user, dict) and user.get("id"):
+        return user["id"]
+    return result.get("id") or result.get("userId")
 
 @router.get("/validate-token")
 async def validate_token(authorization: str = Header(None)):
@@ -24,4 +44,7 @@ async def logout(authorization: str = Header(None)):
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Token no proporcionado")
     token = authorization.split(" ")[1]
+    # El token deja de ser válido en este gateway de inmediato
+    token_cache.evict(token)
+    await revocation_list.revoke(token)
     return await auth_service.logout(token)
\ No newline at end of file
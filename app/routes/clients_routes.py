@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from app.grpc.clients_grpc_client import ClientsGrpcClient
+from operator import attrgetter
+from app.grpc import clients_pb2
+from app.grpc.channel_pool import channel_registry
+from app.grpc.converter import converter
+from app.grpc.fields import parse_fields, project
 from app.middleware.auth_middleware import verify_token
+from app.services.response_cache import clients_cache, notfound_cache, NotFoundError, json_response
+from app.services.pagination import PAGINATION_MAX_LIMIT, is_paginated, paginate
+from app.services.streaming import ndjson_response, open_stream, wants_ndjson
+from app.services.protobuf_content import ProtobufBodyRoute, protobuf_body, protobuf_response, reject_json_options, wants_protobuf
 import grpc
 
 # Router base para las rutas del microservicio de clientes
-router = APIRouter(prefix="/api/clients", tags=["clients"])
+router = APIRouter(prefix="/api/clients", tags=["clients"], route_class=ProtobufBodyRoute)
 
 # ----------- MODELOS DE REQUEST -----------
 
@@ -35,49 +43,70 @@ class UpdateClientRequest(BaseModel):
 class UpdatePasswordRequest(BaseModel):
     password: str
 
+# ----------- CAMPOS EXPUESTOS -----------
+
+# Campos de ClientResponse en el listado y al crear (seleccionables con ?fields=); nunca password
+CLIENT_SUMMARY_FIELDS = (
+    "id", "firstName", "lastName", "email", "username", "role",
+    "isActive", "birthDate", "address", "phone", "createdAt"
+)
+
+# El detalle por ID además incluye updatedAt
+CLIENT_DETAIL_FIELDS = CLIENT_SUMMARY_FIELDS + ("updatedAt",)
+
+# Al actualizar se informa updatedAt en vez de createdAt
+CLIENT_UPDATE_FIELDS = CLIENT_SUMMARY_FIELDS[:-1] + ("updatedAt",)
+
+# ClientResponse gRPC → dict (listas explícitas de campos: el password nunca se expone)
+_client_summary = converter(clients_pb2.ClientResponse, CLIENT_SUMMARY_FIELDS)
+_client_detail = converter(clients_pb2.ClientResponse, CLIENT_DETAIL_FIELDS)
+_client_update = converter(clients_pb2.ClientResponse, CLIENT_UPDATE_FIELDS)
+
+# ClientResponse que se reenvía en protobuf: tampoco expone el password
+def _without_password(message):
+    message.ClearField("password")
+    return message
+
 # ----------- ENDPOINTS -----------
 
 # Crear un cliente (NO requiere autenticación)
 @router.post("/")
-async def create_client(client_data: CreateClientRequest):
-    grpc_client = ClientsGrpcClient()
+@protobuf_body(clients_pb2.CreateClientRequest)
+async def create_client(client_data: CreateClientRequest, request: Request):
+    grpc_client = channel_registry.clients()
     try:
         # Llamada gRPC al microservicio de clientes
-        response = grpc_client.create_client(client_data.dict())
+        response = await grpc_client.create_client(client_data.dict())
+
+        # El nuevo cliente no debe seguir respondiendo 404 desde la caché negativa
+        await notfound_cache.clear("clients")
+
+        if wants_protobuf(request):
+            return protobuf_response(_without_password(response))
 
         # Construcción de respuesta limpia hacia el cliente HTTP
-        return {
-            "message": response.message,
-            "client": {
-                "id": response.id,
-                "firstName": response.firstName,
-                "lastName": response.lastName,
-                "email": response.email,
-                "username": response.username,
-                "role": response.role,
-                "isActive": response.isActive,
-                "birthDate": response.birthDate,
-                "address": response.address,
-                "phone": response.phone,
-                "createdAt": response.createdAt
-            }
-        }
+        return {"message": response.message, "client": _client_summary(response)}
     except grpc.RpcError as e:
         # Captura errores gRPC y los traduce a HTTP
         raise HTTPException(status_code=400, detail=str(e.details()))
-    finally:
-        grpc_client.close()
 
 # Obtener todos los clientes (requiere token válido)
 @router.get("/")
 async def get_all_clients(
+    request: Request,
     user_data: dict = Depends(verify_token),        # Validación JWT desde el middleware
     name: Optional[str] = Query(None),
     email: Optional[str] = Query(None),
     username: Optional[str] = Query(None),
-    isActive: Optional[str] = Query(None)
+    isActive: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=PAGINATION_MAX_LIMIT),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None)
 ):
-    grpc_client = ClientsGrpcClient()
+    # Solo se leen del protobuf los campos pedidos
+    selected = parse_fields(fields, clients_pb2.ClientResponse.DESCRIPTOR, CLIENT_SUMMARY_FIELDS)
+    convert = converter(clients_pb2.ClientResponse, selected) if selected else _client_summary
+    grpc_client = channel_registry.clients()
     try:
         # Construcción dinámica de filtros
         filters = {}
@@ -85,112 +114,134 @@ async def get_all_clients(
         if email: filters['email'] = email
         if username: filters['username'] = username
         if isActive: filters['isActive'] = isActive
+
+        # Accept: application/x-protobuf → ClientListResponse del microservicio, sin conversión
+        if wants_protobuf(request):
+            reject_json_options(limit=limit, cursor=cursor, fields=fields)
+            response = await grpc_client.get_all_clients(filters)
+            for client in response.clients:
+                _without_password(client)
+            return protobuf_response(response)
         
+        # Accept: application/x-ndjson sin paginar → cada cliente se reenvía apenas llega (StreamClients)
+        if wants_ndjson(request) and not is_paginated(limit, cursor):
+            stream = await open_stream("StreamClients", lambda: grpc_client.stream_clients(filters))
+            if stream is not None:
+                return ndjson_response(stream, convert)
+
         # Petición al microservicio vía gRPC
-        response = grpc_client.get_all_clients(filters)
+        response = await grpc_client.get_all_clients(filters)
+
+        # Paginación: solo se convierte la página pedida
+        rows, next_cursor = response.clients, None
+        if is_paginated(limit, cursor):
+            rows, next_cursor = paginate(rows, limit, cursor, key=attrgetter("id"))
+
+        # Accept: application/x-ndjson → cada cliente se convierte al enviarse
+        if wants_ndjson(request):
+            return ndjson_response(rows, convert, next_cursor=next_cursor)
 
         # Conversión de la lista de clientes gRPC → dict
-        clients = []
-        for client in response.clients:
-            clients.append({
-                "id": client.id,
-                "firstName": client.firstName,
-                "lastName": client.lastName,
-                "email": client.email,
-                "username": client.username,
-                "role": client.role,
-                "isActive": client.isActive,
-                "birthDate": client.birthDate,
-                "address": client.address,
-                "phone": client.phone,
-                "createdAt": client.createdAt
-            })
+        clients = [convert(client) for client in rows]
 
+        if is_paginated(limit, cursor):
+            return {"count": response.count, "clients": clients, "next_cursor": next_cursor}
         return {"count": response.count, "clients": clients}
     except grpc.RpcError as e:
         raise HTTPException(status_code=500, detail=str(e.details()))
-    finally:
-        grpc_client.close()
 
 # Obtener cliente por ID (requiere token)
 @router.get("/{client_id}")
-async def get_client_by_id(client_id: str, user_data: dict = Depends(verify_token)):
-    grpc_client = ClientsGrpcClient()
+async def get_client_by_id(
+    client_id: str,
+    request: Request,
+    user_data: dict = Depends(verify_token),
+    fields: Optional[str] = Query(None)
+):
+    # Accept: application/x-protobuf → ClientResponse del microservicio, sin caché
+    if wants_protobuf(request):
+        reject_json_options(fields=fields)
+        try:
+            response = await channel_registry.clients().get_client_by_id(client_id)
+        except grpc.RpcError:
+            raise HTTPException(status_code=404, detail="Cliente no encontrado")
+        return protobuf_response(_without_password(response))
+
+    selected = parse_fields(fields, clients_pb2.ClientResponse.DESCRIPTOR, CLIENT_DETAIL_FIELDS)
+    # Con ETag: si el cliente HTTP ya tiene esta versión se responde 304 sin cuerpo.
+    # Los IDs inexistentes se recuerdan como 404 por NEGATIVE_CACHE_TTL segundos
+    cached = await notfound_cache.get_or_load(clients_cache, f"item:{client_id}", lambda: _fetch_client(client_id))
+    if selected is None or cached.status_code != 200:
+        return cached.to_response(request)
+    return json_response({"client": project(cached.payload()["client"], selected)}, request)
+
+# Perfil desde la caché (hasta CLIENTS_CACHE_TTL o hasta la próxima escritura)
+async def _load_client(client_id):
+    return await clients_cache.get_or_load(f"item:{client_id}", lambda: _fetch_client(client_id))
+
+# Consulta de un cliente al microservicio de clientes
+async def _fetch_client(client_id):
+    grpc_client = channel_registry.clients()
     try:
-        response = grpc_client.get_client_by_id(client_id)
-
-        return {
-            "client": {
-                "id": response.id,
-                "firstName": response.firstName,
-                "lastName": response.lastName,
-                "email": response.email,
-                "username": response.username,
-                "role": response.role,
-                "isActive": response.isActive,
-                "birthDate": response.birthDate,
-                "address": response.address,
-                "phone": response.phone,
-                "createdAt": response.createdAt,
-                "updatedAt": response.updatedAt
-            }
-        }
-    except grpc.RpcError:
+        response = await grpc_client.get_client_by_id(client_id)
+
+        # Lista explícita de campos: el password de ClientResponse nunca llega a la caché
+        return {"client": _client_detail(response)}
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.NOT_FOUND:
+            raise NotFoundError("Cliente no encontrado")
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
-    finally:
-        grpc_client.close()
 
 # Actualizar cliente (requiere token)
 @router.patch("/{client_id}")
-async def update_client(client_id: str, client_data: UpdateClientRequest, user_data: dict = Depends(verify_token)):
-    grpc_client = ClientsGrpcClient()
+@protobuf_body(clients_pb2.UpdateClientRequest)
+async def update_client(client_id: str, client_data: UpdateClientRequest, request: Request, user_data: dict = Depends(verify_token)):
+    grpc_client = channel_registry.clients()
     try:
         # Remover campos None (solo actualizar lo enviado)
         data = {k: v for k, v in client_data.dict().items() if v is not None}
 
-        response = grpc_client.update_client(client_id, data)
-
-        return {
-            "message": response.message,
-            "client": {
-                "id": response.id,
-                "firstName": response.firstName,
-                "lastName": response.lastName,
-                "email": response.email,
-                "username": response.username,
-                "role": response.role,
-                "isActive": response.isActive,
-                "birthDate": response.birthDate,
-                "address": response.address,
-                "phone": response.phone,
-                "updatedAt": response.updatedAt
-            }
-        }
+        response = await grpc_client.update_client(client_id, data)
+        await clients_cache.invalidate(f"item:{client_id}")
+
+        if wants_protobuf(request):
+            return protobuf_response(_without_password(response))
+        return {"message": response.message, "client": _client_update(response)}
     except grpc.RpcError as e:
         raise HTTPException(status_code=400, detail=str(e.details()))
-    finally:
-        grpc_client.close()
 
 # Actualizar contraseña (requiere token)
 @router.patch("/{client_id}/password")
-async def update_password(client_id: str, password_data: UpdatePasswordRequest, user_data: dict = Depends(verify_token)):
-    grpc_client = ClientsGrpcClient()
+@protobuf_body(clients_pb2.UpdatePasswordRequest)
+async def update_password(client_id: str, password_data: UpdatePasswordRequest, request: Request, user_data: dict = Depends(verify_token)):
+    grpc_client = channel_registry.clients()
     try:
-        response = grpc_client.update_password(client_id, password_data.password)
+        response = await grpc_client.update_password(client_id, password_data.password)
+        # Cambia updatedAt del perfil
+        await clients_cache.invalidate(f"item:{client_id}")
+        if wants_protobuf(request):
+            return protobuf_response(response)
         return {"message": response.message}
     except grpc.RpcError as e:
         raise HTTPException(status_code=400, detail=str(e.details()))
-    finally:
-        grpc_client.close()
 
 # Eliminar cliente (requiere token)
 @router.delete("/{client_id}")
-async def delete_client(client_id: str, user_data: dict = Depends(verify_token)):
-    grpc_client = ClientsGrpcClient()
+async def delete_client(client_id: str, request: Request, user_data: dict = Depends(verify_token)):
+    grpc_client = channel_registry.clients()
     try:
-        response = grpc_client.delete_client(client_id)
+        response = await grpc_client.delete_client(client_id)
+        await clients_cache.invalidate(f"item:{client_id}")
+        if wants_protobuf(request):
+            return protobuf_response(response)
         return {"message": response.message}
     except grpc.RpcError:
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
-    finally:
-        grpc_client.close()
+
+# Precargar el perfil en la caché (tarea en segundo plano tras el login)
+async def warm_client_cache(client_id):
+    try:
+        await _load_client(str(client_id))
+    except HTTPException:
+        # Precarga opcional: si falla, la primera consulta irá al microservicio
+        pass
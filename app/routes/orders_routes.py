@@ -1,15 +1,23 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
+from operator import attrgetter
 
-# Asume que este módulo existe y contiene el OrdersGrpcClient
-from app.grpc.orders_grpc_client import OrdersGrpcClient
+# Canales gRPC compartidos (abiertos por el lifespan de app/main.py)
+from app.grpc import orders_pb2
+from app.grpc.channel_pool import channel_registry
+from app.grpc.converter import converter
+from app.grpc.fields import parse_fields, project
 from app.middleware.auth_middleware import verify_token
+from app.services.response_cache import orders_cache, notfound_cache, NotFoundError, json_response
+from app.services.pagination import PAGINATION_MAX_LIMIT, is_paginated, paginate
+from app.services.streaming import ndjson_response, open_stream, wants_ndjson
+from app.services.protobuf_content import ProtobufBodyRoute, protobuf_body, protobuf_response, reject_json_options, wants_protobuf
 import grpc
 
 # Inicializa el router para las rutas de pedidos
-router = APIRouter(prefix="/api/orders", tags=["orders"])
+router = APIRouter(prefix="/api/orders", tags=["orders"], route_class=ProtobufBodyRoute)
 
 # --- Modelos Pydantic para la entrada HTTP (REQUESTS) ---
 
@@ -34,14 +42,47 @@ class DeleteOrderRequest(BaseModel):
     cancellation_reason: Optional[str] = None
 
 
+# --- Campos expuestos (seleccionables con ?fields=) ---
+
+# Resumen de un pedido del listado (sin ítems)
+# NOTA: Opcionalmente, aquí puedes incluir los ítems si es necesario
+ORDER_SUMMARY_FIELDS = (
+    "id", "user_id", "total_amount", "current_status", "order_date", "tracking_number"
+)
+
+# Ítems de un pedido (sin order_id, que ya es el id del pedido)
+ORDER_ITEM_FIELDS = ("item_id", "product_id", "quantity", "price_at_purchase")
+
+# Campos del detalle de un pedido (GET /api/orders/{id})
+ORDER_DETAIL_FIELDS = (
+    "id", "user_id", "total_amount", "current_status", "order_date",
+    "delivery_address", "tracking_number", ("items", ORDER_ITEM_FIELDS)
+)
+
+# Campos informados al crear un pedido (además de items_count)
+ORDER_CREATE_FIELDS = (
+    "id", "user_id", "total_amount", "current_status", "delivery_address", "order_date"
+)
+
+# Campos informados al actualizar el estado
+ORDER_STATUS_FIELDS = ("id", "current_status", "updated_at")
+
+# OrderResponse gRPC → dict (order_date como ISO 8601)
+_order_summary = converter(orders_pb2.OrderResponse, ORDER_SUMMARY_FIELDS)
+_order_detail = converter(orders_pb2.OrderResponse, ORDER_DETAIL_FIELDS)
+_order_created = converter(orders_pb2.OrderResponse, ORDER_CREATE_FIELDS)
+_order_status = converter(orders_pb2.OrderResponse, ORDER_STATUS_FIELDS)
+
+
 # --- Rutas HTTP (API REST) ---
 
 @router.post("/")
-async def create_order(order_data: CreateOrderRequest, user_data: dict = Depends(verify_token)):
+@protobuf_body(orders_pb2.CreateOrderRequest)
+async def create_order(order_data: CreateOrderRequest, request: Request, user_data: dict = Depends(verify_token)):
     """
     Crea un nuevo pedido utilizando la llamada gRPC al OrderManager.
     """
-    grpc_client = OrdersGrpcClient()
+    grpc_client = channel_registry.orders()
     try:
         # 1. Preparar la estructura de datos para gRPC
         items_grpc = [
@@ -60,41 +101,45 @@ async def create_order(order_data: CreateOrderRequest, user_data: dict = Depends
         )
 
         # 3. Llamar al servicio gRPC
-        response = grpc_client.create_order(grpc_request)
+        response = await grpc_client.create_order(grpc_request)
+
+        # El nuevo pedido no debe seguir respondiendo 404 desde la caché negativa
+        await notfound_cache.clear("orders")
+
+        if wants_protobuf(request):
+            return protobuf_response(response)
         
         # 4. Devolver la respuesta formateada
         return {
             "message": response.message,
-            "order": {
-                "id": response.id,
-                "user_id": response.user_id,
-                "total_amount": response.total_amount,
-                "current_status": response.current_status,
-                "delivery_address": response.delivery_address,
-                "order_date": response.order_date.ToDatetime().isoformat() if response.order_date else None,
-                "items_count": len(response.items)
-            }
+            "order": {**_order_created(response), "items_count": len(response.items)}
         }
     except grpc.RpcError as e:
         # Manejo de errores gRPC (ej: validación, falta de stock)
         raise HTTPException(status_code=400, detail=str(e.details()))
-    finally:
-        grpc_client.close()
 
 
 @router.get("/")
 async def get_all_orders(
+    request: Request,
     user_data: dict = Depends(verify_token),
     order_id: Optional[int] = Query(None, description="ID del pedido"),
     user_id: Optional[int] = Query(None, description="ID del cliente"),
     status: Optional[str] = Query(None, description="Estado actual del pedido (PENDIENTE, ENVIADO, etc.)"),
     start_date: Optional[datetime] = Query(None, description="Fecha de inicio (ISO 8601)"),
-    end_date: Optional[datetime] = Query(None, description="Fecha de fin (ISO 8601)")
+    end_date: Optional[datetime] = Query(None, description="Fecha de fin (ISO 8601)"),
+    limit: Optional[int] = Query(None, ge=1, le=PAGINATION_MAX_LIMIT, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    fields: Optional[str] = Query(None, description="Campos a incluir, separados por coma")
 ):
     """
     Consulta todos los pedidos aplicando filtros opcionales.
+    Con limit y/o cursor se devuelve una página y el next_cursor de la siguiente.
+    Con fields solo se leen del protobuf los campos pedidos.
     """
-    grpc_client = OrdersGrpcClient()
+    selected = parse_fields(fields, orders_pb2.OrderResponse.DESCRIPTOR, ORDER_SUMMARY_FIELDS)
+    convert = converter(orders_pb2.OrderResponse, selected) if selected else _order_summary
+    grpc_client = channel_registry.orders()
     try:
         # 1. Convertir filtros de Python a Timestamp de gRPC si existen
         from google.protobuf.timestamp_pb2 import Timestamp
@@ -116,75 +161,98 @@ async def get_all_orders(
             end_date=end_ts
         )
 
-        # 3. Llamar al servicio gRPC
-        response = grpc_client.get_orders(grpc_request)
+        # Accept: application/x-protobuf → OrderListResponse del microservicio, sin conversión
+        if wants_protobuf(request):
+            reject_json_options(limit=limit, cursor=cursor, fields=fields)
+            return protobuf_response(await grpc_client.get_orders(grpc_request))
+
+        # 3. Accept: application/x-ndjson sin paginar → cada pedido se reenvía apenas llega (StreamOrders)
+        if wants_ndjson(request) and not is_paginated(limit, cursor):
+            stream = await open_stream("StreamOrders", lambda: grpc_client.stream_orders(grpc_request))
+            if stream is not None:
+                return ndjson_response(stream, convert)
+
+        # Llamar al servicio gRPC
+        response = await grpc_client.get_orders(grpc_request)
         
-        # 4. Devolver la respuesta formateada
-        orders_list = []
-        for order in response.orders:
-            orders_list.append({
-                "id": order.id,
-                "user_id": order.user_id,
-                "total_amount": order.total_amount,
-                "current_status": order.current_status,
-                "order_date": order.order_date.ToDatetime().isoformat() if order.order_date else None,
-                "tracking_number": order.tracking_number
-                # NOTA: Opcionalmente, aquí puedes incluir los ítems si es necesario
-            })
+        # 4. Paginar (solo se formatea la página pedida)
+        rows, next_cursor = response.orders, None
+        if is_paginated(limit, cursor):
+            rows, next_cursor = paginate(rows, limit, cursor, key=attrgetter("id"))
+
+        # 5. Accept: application/x-ndjson → cada pedido se convierte al enviarse
+        if wants_ndjson(request):
+            return ndjson_response(rows, convert, next_cursor=next_cursor)
+
+        # 6. Devolver la respuesta formateada
+        orders_list = [convert(order) for order in rows]
             
+        if is_paginated(limit, cursor):
+            return {"count": response.count, "orders": orders_list, "next_cursor": next_cursor}
         return {"count": response.count, "orders": orders_list}
     except grpc.RpcError as e:
         raise HTTPException(status_code=500, detail=str(e.details()))
-    finally:
-        grpc_client.close()
 
 
 @router.get("/{order_id}")
-async def get_order_by_id(order_id: int, user_data: dict = Depends(verify_token)):
+async def get_order_by_id(
+    order_id: int,
+    request: Request,
+    user_data: dict = Depends(verify_token),
+    fields: Optional[str] = Query(None, description="Campos a incluir, separados por coma")
+):
     """
     Obtiene los detalles completos de un pedido por su ID.
+    El detalle se guarda en caché con un TTL según su estado (largo para pedidos
+    entregados o cancelados) y los IDs inexistentes se recuerdan como 404
+    por NEGATIVE_CACHE_TTL segundos.
+    """
+    # Accept: application/x-protobuf → OrderResponse del microservicio, sin caché
+    if wants_protobuf(request):
+        reject_json_options(fields=fields)
+        grpc_client = channel_registry.orders()
+        try:
+            response = await grpc_client.get_order_by_id(grpc_client.orders_pb2.GetOrderByIdRequest(id=order_id))
+        except grpc.RpcError:
+            raise HTTPException(status_code=404, detail="Pedido no encontrado")
+        return protobuf_response(response)
+
+    selected = parse_fields(fields, orders_pb2.OrderResponse.DESCRIPTOR, ORDER_DETAIL_FIELDS)
+    cached = await notfound_cache.get_or_load(orders_cache, f"item:{order_id}", lambda: _fetch_order(order_id))
+    # Con ETag: 304 si el cliente ya tiene esta versión
+    if selected is None or cached.status_code != 200:
+        return cached.to_response(request)
+    return json_response({"order": project(cached.payload()["order"], selected)}, request)
+
+
+async def _fetch_order(order_id):
     """
-    grpc_client = OrdersGrpcClient()
+    Consulta un pedido al OrderManager (incluyendo ítems).
+    """
+    grpc_client = channel_registry.orders()
     try:
         # 1. Construir el request gRPC
         grpc_request = grpc_client.orders_pb2.GetOrderByIdRequest(id=order_id)
 
         # 2. Llamar al servicio gRPC
-        response = grpc_client.get_order_by_id(grpc_request)
-        
-        # 3. Formatear la respuesta (incluyendo ítems)
-        items_list = [{
-            "item_id": item.item_id, 
-            "product_id": item.product_id, 
-            "quantity": item.quantity, 
-            "price_at_purchase": item.price_at_purchase
-        } for item in response.items]
+        response = await grpc_client.get_order_by_id(grpc_request)
         
-        return {
-            "order": {
-                "id": response.id,
-                "user_id": response.user_id,
-                "total_amount": response.total_amount,
-                "current_status": response.current_status,
-                "order_date": response.order_date.ToDatetime().isoformat() if response.order_date else None,
-                "delivery_address": response.delivery_address,
-                "tracking_number": response.tracking_number,
-                "items": items_list
-            }
-        }
+        # 3. Devolver la respuesta formateada (incluyendo ítems)
+        return {"order": _order_detail(response)}
     except grpc.RpcError as e:
-        # gRPC lanza un error 404 para "No encontrado"
+        # Solo el NOT_FOUND de gRPC se guarda en la caché negativa
+        if e.code() == grpc.StatusCode.NOT_FOUND:
+            raise NotFoundError("Pedido no encontrado")
         raise HTTPException(status_code=404, detail="Pedido no encontrado")
-    finally:
-        grpc_client.close()
 
 
 @router.patch("/{order_id}/status")
-async def update_order_status(order_id: int, status_data: UpdateStatusRequest, user_data: dict = Depends(verify_token)):
+@protobuf_body(orders_pb2.UpdateStatusRequest)
+async def update_order_status(order_id: int, status_data: UpdateStatusRequest, request: Request, user_data: dict = Depends(verify_token)):
     """
     Actualiza el estado de un pedido (ej: de PENDIENTE a ENVIADO).
     """
-    grpc_client = OrdersGrpcClient()
+    grpc_client = channel_registry.orders()
     try:
         # 1. Construir el request gRPC
         grpc_request = grpc_client.orders_pb2.UpdateStatusRequest(
@@ -194,29 +262,25 @@ async def update_order_status(order_id: int, status_data: UpdateStatusRequest, u
         )
 
         # 2. Llamar al servicio gRPC
-        response = grpc_client.update_order_status(grpc_request)
+        response = await grpc_client.update_order_status(grpc_request)
+        await orders_cache.invalidate(f"item:{order_id}")
+
+        if wants_protobuf(request):
+            return protobuf_response(response)
         
         # 3. Devolver la respuesta formateada
-        return {
-            "message": response.message,
-            "order": {
-                "id": response.id,
-                "current_status": response.current_status,
-                "updated_at": response.updated_at
-            }
-        }
+        return {"message": response.message, "order": _order_status(response)}
     except grpc.RpcError as e:
         raise HTTPException(status_code=400, detail=str(e.details()))
-    finally:
-        grpc_client.close()
 
 
 @router.delete("/{order_id}")
-async def delete_order(order_id: int, delete_data: DeleteOrderRequest, user_data: dict = Depends(verify_token)):
+@protobuf_body(orders_pb2.DeleteOrderRequest)
+async def delete_order(order_id: int, delete_data: DeleteOrderRequest, request: Request, user_data: dict = Depends(verify_token)):
     """
     Cancela/elimina un pedido.
     """
-    grpc_client = OrdersGrpcClient()
+    grpc_client = channel_registry.orders()
     try:
         # 1. Construir el request gRPC
         grpc_request = grpc_client.orders_pb2.DeleteOrderRequest(
@@ -225,11 +289,13 @@ async def delete_order(order_id: int, delete_data: DeleteOrderRequest, user_data
         )
 
         # 2. Llamar al servicio gRPC
-        response = grpc_client.delete_order(grpc_request)
+        response = await grpc_client.delete_order(grpc_request)
+        await orders_cache.invalidate(f"item:{order_id}")
+
+        if wants_protobuf(request):
+            return protobuf_response(response)
         
         # 3. Devolver la respuesta simple
         return {"message": response.message}
     except grpc.RpcError as e:
-        raise HTTPException(status_code=404, detail="Pedido no encontrado o no puede ser cancelado")
-    finally:
-        grpc_client.close()
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="Pedido no encontrado o no puede ser cancelado")
\ No newline at end of file
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from pydantic import BaseModel
 from typing import Optional
-from app.grpc.products_grpc_client import ProductsGrpcClient
+from app.grpc import products_pb2
+from app.grpc.channel_pool import channel_registry
+from app.grpc.converter import converter
+from app.grpc.fields import parse_fields, project
 from app.middleware.auth_middleware import verify_token
+from app.services.response_cache import products_cache, notfound_cache, NotFoundError, json_response
+from app.services.pagination import PAGINATION_MAX_LIMIT, is_paginated, paginate
+from app.services.streaming import ndjson_response, open_stream, wants_ndjson
+from app.services.protobuf_content import ProtobufBodyRoute, protobuf_body, protobuf_response, reject_json_options, wants_protobuf
+from app.services.product_loader import product_loader
 import grpc
 
 # Router para manejar todas las rutas relacionadas con productos
-router = APIRouter(prefix="/api/products", tags=["products"])
+router = APIRouter(prefix="/api/products", tags=["products"], route_class=ProtobufBodyRoute)
 
 # Modelo para crear un producto (datos obligatorios)
 class CreateProductRequest(BaseModel):
@@ -22,145 +30,213 @@ class UpdateProductRequest(BaseModel):
     price: Optional[float] = None
     imageUrl: Optional[str] = None
 
+# Campos de Product que expone la API (seleccionables con ?fields=)
+PRODUCT_FIELDS = (
+    "id", "name", "category", "price", "imageUrl", "imagePublicId", "isActive", "dateCreated"
+)
+
+# Producto gRPC → dict
+_product_summary = converter(products_pb2.Product, PRODUCT_FIELDS)
+
 # Obtener todos los productos
 @router.get("/")
-async def get_all_products(user_data: dict = Depends(verify_token)):
-    grpc_client = ProductsGrpcClient()
+async def get_all_products(
+    request: Request,
+    user_data: dict = Depends(verify_token),
+    limit: Optional[int] = Query(None, ge=1, le=PAGINATION_MAX_LIMIT),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Campos a incluir, separados por coma")
+):
+    # Accept: application/x-protobuf → ProductListResponse del microservicio, sin caché
+    if wants_protobuf(request):
+        reject_json_options(limit=limit, cursor=cursor, fields=fields)
+        return protobuf_response(await _get_all_products())
+
+    selected = parse_fields(fields, products_pb2.Product.DESCRIPTOR, PRODUCT_FIELDS)
+    ndjson = wants_ndjson(request)
+    if ndjson and not is_paginated(limit, cursor) and await products_cache.peek("list", stale=True) is None:
+        # Sin catálogo en caché (ni vencido dentro de max_stale): cada producto se reenvía apenas llega (StreamProducts)
+        stream = await _open_product_stream()
+        if stream is not None:
+            return ndjson_response(stream, converter(products_pb2.Product, selected or PRODUCT_FIELDS))
+
+    # Se sirve desde caché hasta que expire o se modifique el catálogo
+    cached = await products_cache.get_or_load("list", _fetch_all_products)
+    if not ndjson and not is_paginated(limit, cursor) and selected is None:
+        return cached.to_response(request)
+
+    # Paginación: se recorta el catálogo en caché
+    catalog = cached.payload()
+    products, next_cursor = catalog["products"], None
+    if is_paginated(limit, cursor):
+        products, next_cursor = paginate(products, limit, cursor)
+
+    # Accept: application/x-ndjson → un producto por línea
+    if ndjson:
+        return ndjson_response(products, lambda row: project(row, selected), next_cursor=next_cursor)
+    products = [project(product, selected) for product in products]
+    if is_paginated(limit, cursor):
+        return json_response({**catalog, "products": products, "next_cursor": next_cursor}, request)
+    return json_response({**catalog, "products": products}, request)
+
+# Consulta del catálogo completo al microservicio de productos
+async def _fetch_all_products():
+    response = await _get_all_products()
+
+    # Formatear productos para la API Gateway
+    products = [_product_summary(product) for product in response.products]
+
+    return {"success": True, "count": response.count, "products": products}
+
+# ProductListResponse del microservicio de productos
+async def _get_all_products():
+    grpc_client = channel_registry.products()
     try:
-        response = grpc_client.get_all_products()
-
-        # Si gRPC indica que falló, se retorna error HTTP
-        if not response.success:
-            raise HTTPException(status_code=400, detail=response.message)
-        
-        # Formatear productos para la API Gateway
-        products = []
-        for product in response.products:
-            products.append({
-                "id": product.id,
-                "name": product.name,
-                "category": product.category,
-                "price": product.price,
-                "imageUrl": product.imageUrl,
-                "imagePublicId": product.imagePublicId,
-                "isActive": product.isActive,
-                "dateCreated": product.dateCreated
-            })
-
-        return {"success": True, "count": response.count, "products": products}
+        response = await grpc_client.get_all_products()
     except grpc.RpcError as e:
         # Error al comunicarse mediante gRPC
         raise HTTPException(status_code=500, detail=str(e.details()))
-    finally:
-        grpc_client.close()
+
+    # Si gRPC indica que falló, se retorna error HTTP
+    if not response.success:
+        raise HTTPException(status_code=400, detail=response.message)
+    return response
+
+# Catálogo en streaming; None si el microservicio aún no implementa StreamProducts
+async def _open_product_stream():
+    try:
+        return await open_stream("StreamProducts", channel_registry.products().stream_products)
+    except grpc.RpcError as e:
+        raise HTTPException(status_code=500, detail=str(e.details()))
 
 # Obtener un producto por ID
 @router.get("/{product_id}")
-async def get_product_by_id(product_id: str, user_data: dict = Depends(verify_token)):
-    grpc_client = ProductsGrpcClient()
+async def get_product_by_id(
+    product_id: str,
+    request: Request,
+    user_data: dict = Depends(verify_token),
+    fields: Optional[str] = Query(None, description="Campos a incluir, separados por coma")
+):
+    # Accept: application/x-protobuf → ProductResponse del microservicio, sin caché
+    if wants_protobuf(request):
+        reject_json_options(fields=fields)
+        return protobuf_response(await _get_product(product_id))
+
+    selected = parse_fields(fields, products_pb2.Product.DESCRIPTOR, PRODUCT_FIELDS)
+    # Los IDs inexistentes se recuerdan como 404 por NEGATIVE_CACHE_TTL segundos
+    cached = await notfound_cache.get_or_load(products_cache, f"item:{product_id}", lambda: _fetch_product(product_id))
+    if selected is None or cached.status_code != 200:
+        return cached.to_response(request)
+    payload = cached.payload()
+    return json_response({**payload, "product": project(payload["product"], selected)}, request)
+
+# Consulta de un producto al microservicio de productos
+async def _fetch_product(product_id):
     try:
-        response = grpc_client.get_product_by_id(product_id)
+        # Las consultas por ID que llegan juntas se resuelven en una sola llamada gRPC
+        response = await product_loader.load(product_id)
 
         if not response.success:
+            # Solo un "no encontrado" se recuerda en la caché negativa; otro fallo no se guarda
+            if _is_not_found(response.message):
+                raise NotFoundError(response.message)
             raise HTTPException(status_code=404, detail=response.message)
         
-        product = response.product
+        return {"success": True, "product": _product_summary(response.product)}
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.NOT_FOUND:
+            raise NotFoundError("Producto no encontrado")
+        # Microservicio caído o con error: no es un producto inexistente
+        raise HTTPException(status_code=500, detail=str(e.details()))
 
-        return {
-            "success": True,
-            "product": {
-                "id": product.id,
-                "name": product.name,
-                "category": product.category,
-                "price": product.price,
-                "imageUrl": product.imageUrl,
-                "imagePublicId": product.imagePublicId,
-                "isActive": product.isActive,
-                "dateCreated": product.dateCreated
-            }
-        }
-    except grpc.RpcError:
-        raise HTTPException(status_code=404, detail="Producto no encontrado")
-    finally:
-        grpc_client.close()
+# El microservicio informa "no encontrado" con success=false y un mensaje
+def _is_not_found(message):
+    message = message.lower()
+    return "no encontrado" in message or "not found" in message
+
+# ProductResponse del microservicio (sin pasar por el agrupador de consultas por ID)
+async def _get_product(product_id):
+    grpc_client = channel_registry.products()
+    try:
+        response = await grpc_client.get_product_by_id(product_id)
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.NOT_FOUND:
+            raise HTTPException(status_code=404, detail="Producto no encontrado")
+        raise HTTPException(status_code=500, detail=str(e.details()))
+
+    if not response.success:
+        raise HTTPException(status_code=404, detail=response.message)
+    return response
 
 # Crear un nuevo producto
 @router.post("/")
-async def create_product(product_data: CreateProductRequest, user_data: dict = Depends(verify_token)):
-    grpc_client = ProductsGrpcClient()
+@protobuf_body(products_pb2.CreateProductRequest)
+async def create_product(product_data: CreateProductRequest, request: Request, user_data: dict = Depends(verify_token)):
+    grpc_client = channel_registry.products()
     try:
-        response = grpc_client.create_product(product_data.dict())
+        response = await grpc_client.create_product(product_data.dict())
 
         if not response.success:
             raise HTTPException(status_code=400, detail=response.message)
 
         product = response.product
 
-        return {
-            "success": True,
-            "message": response.message,
-            "product": {
-                "id": product.id,
-                "name": product.name,
-                "category": product.category,
-                "price": product.price,
-                "imageUrl": product.imageUrl,
-                "imagePublicId": product.imagePublicId,
-                "isActive": product.isActive,
-                "dateCreated": product.dateCreated
-            }
-        }
+        result = {"success": True, "message": response.message, "product": _product_summary(product)}
     except grpc.RpcError as e:
         raise HTTPException(status_code=400, detail=str(e.details()))
-    finally:
-        grpc_client.close()
+
+    # Write-through: el producto queda en caché tal como lo devuelve el microservicio
+    # y el listado se invalida para reflejar el cambio
+    await products_cache.invalidate("list")
+    await products_cache.set(f"item:{product.id}", {"success": True, "product": result["product"]})
+    # El nuevo producto no debe seguir respondiendo 404 desde la caché negativa
+    await notfound_cache.clear("products")
+    if wants_protobuf(request):
+        return protobuf_response(response)
+    return result
 
 # Actualizar parcialmente un producto
 @router.patch("/{product_id}")
-async def update_product(product_id: str, product_data: UpdateProductRequest, user_data: dict = Depends(verify_token)):
-    grpc_client = ProductsGrpcClient()
+@protobuf_body(products_pb2.UpdateProductRequest)
+async def update_product(product_id: str, product_data: UpdateProductRequest, request: Request, user_data: dict = Depends(verify_token)):
+    grpc_client = channel_registry.products()
     try:
         # Eliminamos campos None para no enviar datos no modificados
         data = {k: v for k, v in product_data.dict().items() if v is not None}
 
-        response = grpc_client.update_product(product_id, data)
+        response = await grpc_client.update_product(product_id, data)
 
         if not response.success:
             raise HTTPException(status_code=400, detail=response.message)
 
         product = response.product
 
-        return {
-            "success": True,
-            "message": response.message,
-            "product": {
-                "id": product.id,
-                "name": product.name,
-                "category": product.category,
-                "price": product.price,
-                "imageUrl": product.imageUrl,
-                "imagePublicId": product.imagePublicId,
-                "isActive": product.isActive,
-                "dateCreated": product.dateCreated
-            }
-        }
+        result = {"success": True, "message": response.message, "product": _product_summary(product)}
     except grpc.RpcError as e:
         raise HTTPException(status_code=400, detail=str(e.details()))
-    finally:
-        grpc_client.close()
+
+    # Write-through: el producto queda en caché tal como lo devuelve el microservicio.
+    # Antes se invalidan el listado y la versión anterior en todas las instancias (bus):
+    # el set solo escribe en el almacén de esta instancia
+    await products_cache.invalidate("list", f"item:{product_id}")
+    await products_cache.set(f"item:{product.id}", {"success": True, "product": result["product"]})
+    if wants_protobuf(request):
+        return protobuf_response(response)
+    return result
 
 # Eliminar un producto (lógica soft delete en el microservicio)
 @router.delete("/{product_id}")
-async def delete_product(product_id: str, user_data: dict = Depends(verify_token)):
-    grpc_client = ProductsGrpcClient()
+async def delete_product(product_id: str, request: Request, user_data: dict = Depends(verify_token)):
+    grpc_client = channel_registry.products()
     try:
-        response = grpc_client.delete_product(product_id)
+        response = await grpc_client.delete_product(product_id)
 
         if not response.success:
             raise HTTPException(status_code=400, detail=response.message)
-        
-        return {"success": True, "message": response.message}
     except grpc.RpcError:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
-    finally:
-        grpc_client.close()
+
+    await products_cache.invalidate("list", f"item:{product_id}")
+    if wants_protobuf(request):
+        return protobuf_response(response)
+    return {"success": True, "message": response.message}
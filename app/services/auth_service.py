@@ -1,40 +1,109 @@
 import httpx
+import importlib.util
 import os
 from fastapi import HTTPException
+from app.services.single_flight import SingleFlight
+from app.services.token_cache import hash_token
 
 AUTH_SERVICE_URL = os.getenv('AUTH_SERVICE_URL', 'http://localhost:3002/api/auth')
+# Claves públicas (JWKS) para validar tokens localmente; vacío = sin JWKS
+AUTH_JWKS_URL = os.getenv('AUTH_JWKS_URL', '')
+
+# Pool de conexiones hacia el Auth Service
+AUTH_HTTP_MAX_CONNECTIONS = int(os.getenv('AUTH_HTTP_MAX_CONNECTIONS', 100))
+AUTH_HTTP_MAX_KEEPALIVE = int(os.getenv('AUTH_HTTP_MAX_KEEPALIVE', 20))
+AUTH_HTTP_KEEPALIVE_EXPIRY = float(os.getenv('AUTH_HTTP_KEEPALIVE_EXPIRY', 30))
+# HTTP/2 requiere el paquete opcional h2 (pip install httpx[http2])
+AUTH_HTTP2 = os.getenv('AUTH_HTTP2', 'false').lower() == 'true'
+
+# Timeouts por operación, en segundos
+AUTH_CONNECT_TIMEOUT = float(os.getenv('AUTH_CONNECT_TIMEOUT', 2))
+AUTH_LOGIN_TIMEOUT = float(os.getenv('AUTH_LOGIN_TIMEOUT', 10))
+AUTH_VALIDATE_TIMEOUT = float(os.getenv('AUTH_VALIDATE_TIMEOUT', 3))
+AUTH_LOGOUT_TIMEOUT = float(os.getenv('AUTH_LOGOUT_TIMEOUT', 5))
+
+# Cliente HTTP compartido por toda la aplicación (lo abre y cierra el lifespan de app/main.py)
+_client = None
+
+# Validaciones concurrentes del mismo token comparten una sola llamada al Auth Service
+_validations = SingleFlight()
+
+def _timeout(seconds):
+    return httpx.Timeout(seconds, connect=min(seconds, AUTH_CONNECT_TIMEOUT))
+
+def start_client():
+    """Crear el cliente HTTP compartido con keep-alive hacia el Auth Service"""
+    global _client
+    if _client is None:
+        limits = httpx.Limits(
+            max_connections=AUTH_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=AUTH_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=AUTH_HTTP_KEEPALIVE_EXPIRY
+        )
+        http2 = AUTH_HTTP2 and importlib.util.find_spec('h2') is not None
+        _client = httpx.AsyncClient(limits=limits, http2=http2, timeout=_timeout(AUTH_VALIDATE_TIMEOUT))
+    return _client
+
+async def close_client():
+    """Cerrar el cliente HTTP compartido y sus conexiones"""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+def _get_client():
+    # Uso fuera del lifespan (scripts, pruebas manuales): crear bajo demanda
+    return _client if _client is not None else start_client()
 
 async def login(credentials):
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(f"{AUTH_SERVICE_URL}/login", json=credentials)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(status_code=response.status_code, detail=response.json())
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=503, detail=f"Error conectando con Auth Service: {str(e)}")
+    client = _get_client()
+    try:
+        response = await client.post(f"{AUTH_SERVICE_URL}/login", json=credentials, timeout=_timeout(AUTH_LOGIN_TIMEOUT))
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise HTTPException(status_code=response.status_code, detail=response.json())
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=503, detail=f"Error conectando con Auth Service: {str(e)}")
 
 async def validate_token(token):
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": f"Bearer {token}"}
-            response = await client.get(f"{AUTH_SERVICE_URL}/validate-token", headers=headers)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(status_code=response.status_code, detail=response.json())
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=503, detail=f"Error conectando con Auth Service: {str(e)}")
+    return await _validations.do(hash_token(token), lambda: _validate_token(token))
+
+async def _validate_token(token):
+    client = _get_client()
+    try:
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await client.get(f"{AUTH_SERVICE_URL}/validate-token", headers=headers, timeout=_timeout(AUTH_VALIDATE_TIMEOUT))
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise HTTPException(status_code=response.status_code, detail=response.json())
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=503, detail=f"Error conectando con Auth Service: {str(e)}")
 
 async def logout(token):
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": f"Bearer {token}"}
-            response = await client.post(f"{AUTH_SERVICE_URL}/logout", headers=headers)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(status_code=response.status_code, detail=response.json())
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=503, detail=f"Error conectando con Auth Service: {str(e)}")
\ No newline at end of file
+    client = _get_client()
+    try:
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await client.post(f"{AUTH_SERVICE_URL}/logout", headers=headers, timeout=_timeout(AUTH_LOGOUT_TIMEOUT))
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise HTTPException(status_code=response.status_code, detail=response.json())
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=503, detail=f"Error conectando con Auth Service: {str(e)}")
+
+async def get_jwks(url=None):
+    client = _get_client()
+    try:
+        response = await client.get(url or AUTH_JWKS_URL, timeout=_timeout(AUTH_VALIDATE_TIMEOUT))
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise HTTPException(status_code=response.status_code, detail="No se pudo obtener el JWKS")
+    except (httpx.RequestError, ValueError) as e:
+        raise HTTPException(status_code=503, detail=f"Error conectando con Auth Service: {str(e)}")
+
+def validation_stats():
+    """Contadores de validaciones ejecutadas y agrupadas (single-flight)"""
+    return _validations.stats()
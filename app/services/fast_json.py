@@ -0,0 +1,125 @@
+import functools
+import inspect
+import json
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+
+# Serialización con orjson solo si está instalado el paquete opcional; si no, json de la stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Tipos que json.dumps no acepta (datetime, dataclass, subclases de str/int/dict...) hacen
+    # fallar a orjson para que pasen por el mismo camino que antes (jsonable_encoder + json.dumps)
+    _ORJSON_OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+
+def _has_exponent_float(payload):
+    """
+    True si el payload tiene un float que json escribe con exponente (1e+16, 1e-05):
+    son los únicos que orjson formatea distinto (1e16, 0.00001).
+    Se recorren los valores y no los bytes, porque "e1" o ".0000" aparecen a menudo
+    dentro de strings (ObjectId, UUID, fechas de .NET) y forzarían la serialización lenta.
+    NaN e infinito no cuentan: orjson los escribe como null.
+    """
+    stack = [payload]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            value = value.values()
+        elif kind is not list and kind is not tuple:
+            value = (value,)
+        for item in value:
+            kind = type(item)
+            if kind is float:
+                if not (1e-4 <= item < 1e16 or -1e16 < item <= -1e-4 or item == 0 or item - item != 0):
+                    return True
+            elif kind is dict or kind is list or kind is tuple:
+                stack.append(item)
+    return False
+
+
+def _stdlib_encode(payload):
+    # Mismos parámetros que JSONResponse de Starlette
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def encode_json(payload):
+    """
+    Serializar igual que JSONResponse de Starlette (mismos bytes que una respuesta sin caché),
+    con orjson cuando está disponible.
+    Diferencia: orjson escribe NaN/Infinity como null, en vez de fallar la respuesta.
+    """
+    if orjson is not None:
+        try:
+            body = orjson.dumps(payload, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Claves no string, enteros de más de 64 bits, tipos no nativos, surrogates...
+            body = None
+        if body is not None and not _has_exponent_float(payload):
+            return body
+    try:
+        return _stdlib_encode(payload)
+    except TypeError:
+        # Tipos que antes convertía jsonable_encoder (datetime, modelos pydantic, etc.)
+        return _stdlib_encode(jsonable_encoder(payload))
+
+
+def decode_json(body):
+    """json.loads (con orjson cuando está disponible)"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que serializa con encode_json"""
+
+    def render(self, content):
+        return encode_json(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Ruta cuyo resultado (dict/list sin response_model) se serializa directamente a bytes con
+    FastJSONResponse, sin pasar antes por jsonable_encoder como hace FastAPI por defecto.
+    Las rutas que necesiten validar o filtrar la salida siguen usando response_model.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        response_model = kwargs.get("response_model")
+        if (
+            (response_model is None or isinstance(response_model, DefaultPlaceholder))
+            and inspect.iscoroutinefunction(endpoint)
+            and inspect.signature(endpoint).return_annotation is inspect.Signature.empty
+            and not getattr(endpoint, "_fast_json", False)
+        ):
+            endpoint = _direct_response(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _direct_response(endpoint, status_code):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        content = await endpoint(*args, **kwargs)
+        if isinstance(content, Response):
+            return content
+        return FastJSONResponse(content, status_code=status_code or 200)
+
+    wrapper._fast_json = True
+    return wrapper
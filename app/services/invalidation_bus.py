@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import uuid
+
+# Bus de invalidación de caché entre instancias del mismo host (datagramas UDP por loopback)
+CACHE_BUS_ENABLED = os.getenv('CACHE_BUS_ENABLED', 'false').lower() == 'true'
+# Dirección donde escucha esta instancia y direcciones de las demás instancias
+CACHE_BUS_BIND = os.getenv('CACHE_BUS_BIND', '127.0.0.1:4000')
+CACHE_BUS_PEERS = os.getenv('CACHE_BUS_PEERS', '')
+
+# Máximo de claves por datagrama (mantiene cada mensaje muy por debajo de 64 KB)
+MAX_KEYS_PER_MESSAGE = 200
+
+
+def _parse_address(address):
+    host, _, port = address.strip().rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class _BusProtocol(asyncio.DatagramProtocol):
+    def __init__(self, bus):
+        self.bus = bus
+
+    def datagram_received(self, data, addr):
+        self.bus._on_message(data)
+
+    def error_received(self, exc):
+        # Instancia vecina detenida (puerto inalcanzable): se ignora
+        self.bus.errors += 1
+
+
+class InvalidationBus:
+    """
+    Publica y recibe claves de caché invalidadas.
+    Las rutas de escritura publican; cada instancia elimina las claves al recibirlas.
+    """
+
+    def __init__(self, enabled=CACHE_BUS_ENABLED, bind=CACHE_BUS_BIND, peers=CACHE_BUS_PEERS):
+        self.enabled = enabled
+        self.bind = bind
+        self.peers = [_parse_address(peer) for peer in peers.split(",") if peer.strip()]
+        self.instance_id = uuid.uuid4().hex
+        self._handlers = []
+        self._transport = None
+        self._tasks = set()
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+    def subscribe(self, handler):
+        """Registrar una corrutina handler(keys, prefixes) que se ejecuta con cada invalidación remota"""
+        self._handlers.append(handler)
+
+    async def start(self):
+        if not self.enabled or self._transport is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _BusProtocol(self), local_addr=_parse_address(self.bind)
+        )
+
+    async def stop(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def publish(self, keys=(), prefixes=()):
+        """Enviar las claves (o prefijos) invalidados a las demás instancias (sin esperar respuesta)"""
+        if self._transport is None or not (keys or prefixes):
+            return
+        keys = list(keys)
+        for start in range(0, max(len(keys), 1), MAX_KEYS_PER_MESSAGE):
+            message = json.dumps({
+                "origin": self.instance_id,
+                "keys": keys[start:start + MAX_KEYS_PER_MESSAGE],
+                "prefixes": list(prefixes) if start == 0 else [],
+            }).encode()
+            for peer in self.peers:
+                self._transport.sendto(message, peer)
+                self.published += 1
+
+    def _on_message(self, data):
+        try:
+            message = json.loads(data)
+            origin, keys = message["origin"], message["keys"]
+            prefixes = message.get("prefixes", [])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self.errors += 1
+            return
+        if origin == self.instance_id or not isinstance(keys, list) or not isinstance(prefixes, list):
+            return
+        self.received += 1
+        for handler in self._handlers:
+            task = asyncio.ensure_future(handler(keys, prefixes))
+            # Referencia fuerte hasta que termine la tarea
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "peers": len(self.peers),
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
+
+
+# Instancia única usada por las cachés de respuestas
+invalidation_bus = InvalidationBus()
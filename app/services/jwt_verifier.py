@@ -0,0 +1,242 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from fastapi import HTTPException
+from app.services import auth_service
+
+# Firmas asimétricas (RS*/ES*) solo si está instalado el paquete opcional cryptography
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+    from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+except ImportError:
+    hashes = None
+
+# Validación local de JWT (desactivada por defecto: todo va al Auth Service)
+AUTH_LOCAL_VERIFY = os.getenv('AUTH_LOCAL_VERIFY', 'false').lower() == 'true'
+# Secreto compartido para tokens HS256/HS384/HS512
+AUTH_JWT_SECRET = os.getenv('AUTH_JWT_SECRET', '')
+# Cada cuánto se refrescan las claves públicas (JWKS) del Auth Service, en segundos
+AUTH_JWKS_REFRESH_INTERVAL = float(os.getenv('AUTH_JWKS_REFRESH_INTERVAL', 300))
+# Tolerancia de reloj (segundos) para exp y nbf
+AUTH_JWT_LEEWAY = float(os.getenv('AUTH_JWT_LEEWAY', 0))
+# Emisor y audiencia esperados (opcionales)
+AUTH_JWT_ISSUER = os.getenv('AUTH_JWT_ISSUER', '')
+AUTH_JWT_AUDIENCE = os.getenv('AUTH_JWT_AUDIENCE', '')
+
+# Intervalo mínimo entre recargas del JWKS provocadas por un kid desconocido
+JWKS_MIN_RELOAD_INTERVAL = 30
+
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+
+
+class TokenRejected(Exception):
+    """Token con firma válida pero que no se puede aceptar (expirado, nbf futuro, iss/aud distintos)"""
+
+
+def _b64decode(segment):
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _b64int(segment):
+    return int.from_bytes(_b64decode(segment), "big")
+
+
+def _hash_for(alg):
+    return {"256": hashes.SHA256, "384": hashes.SHA384, "512": hashes.SHA512}[alg[2:]]()
+
+
+def _load_jwk(jwk):
+    """Convertir una clave JWK en (familia de algoritmo, clave) o None si no se soporta"""
+    kty = jwk.get("kty")
+    if kty == "oct":
+        return "HS", _b64decode(jwk["k"])
+    if hashes is None:
+        return None
+    if kty == "RSA":
+        return "RS", rsa.RSAPublicNumbers(_b64int(jwk["e"]), _b64int(jwk["n"])).public_key()
+    if kty == "EC":
+        curves = {"P-256": ec.SECP256R1, "P-384": ec.SECP384R1, "P-521": ec.SECP521R1}
+        curve = curves.get(jwk.get("crv"))
+        if curve is None:
+            return None
+        numbers = ec.EllipticCurvePublicNumbers(_b64int(jwk["x"]), _b64int(jwk["y"]), curve())
+        return "ES", numbers.public_key()
+    return None
+
+
+class JwtVerifier:
+    """
+    Verificación local de JWT (firma, exp y nbf) con claves en caché.
+    Lo que no se puede verificar aquí se deriva al Auth Service.
+    """
+
+    def __init__(self, enabled=AUTH_LOCAL_VERIFY, secret=AUTH_JWT_SECRET, jwks_url=auth_service.AUTH_JWKS_URL):
+        self.enabled = enabled
+        self.secret = secret.encode() if secret else None
+        self.jwks_url = jwks_url
+        self._keys = {}
+        self._keys_loaded_at = 0
+        self._refresh_task = None
+        self._reload_task = None
+        self.verified = 0
+        self.rejected = 0
+        self.fallbacks = 0
+
+    # ----------- Claves -----------
+
+    async def start(self):
+        """Cargar el JWKS y programar su refresco periódico"""
+        if not self.enabled or not self.jwks_url:
+            return
+        await self.refresh_keys()
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        for task in (self._refresh_task, self._reload_task):
+            if task is not None:
+                task.cancel()
+        self._refresh_task = self._reload_task = None
+
+    async def refresh_keys(self):
+        self._keys_loaded_at = time.time()
+        try:
+            jwks = await auth_service.get_jwks(self.jwks_url)
+        except HTTPException:
+            # Se mantienen las claves anteriores; los tokens no verificables van al Auth Service
+            return
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            try:
+                loaded = _load_jwk(jwk)
+            except (KeyError, ValueError, TypeError):
+                continue
+            if loaded is not None:
+                keys[jwk.get("kid")] = loaded
+        self._keys = keys
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(AUTH_JWKS_REFRESH_INTERVAL)
+            await self.refresh_keys()
+
+    def _schedule_reload(self):
+        # kid desconocido: posible rotación de claves, se recarga sin bloquear la petición
+        if not self.jwks_url or time.time() - self._keys_loaded_at < JWKS_MIN_RELOAD_INTERVAL:
+            return
+        if self._reload_task is None or self._reload_task.done():
+            self._keys_loaded_at = time.time()
+            self._reload_task = asyncio.create_task(self.refresh_keys())
+
+    def _find_key(self, alg, kid):
+        family = alg[:2]
+        if kid is not None and kid in self._keys:
+            loaded = self._keys[kid]
+        elif family == "HS" and self.secret:
+            return self.secret
+        elif kid is not None:
+            self._schedule_reload()
+            return None
+        else:
+            candidates = [loaded for loaded in self._keys.values() if loaded[0] == family]
+            loaded = candidates[0] if len(candidates) == 1 else None
+        if loaded is None or loaded[0] != family:
+            return None
+        return loaded[1]
+
+    # ----------- Verificación -----------
+
+    def _signature_ok(self, alg, key, signing_input, signature):
+        if alg in _HMAC_DIGESTS:
+            expected = hmac.new(key, signing_input, _HMAC_DIGESTS[alg]).digest()
+            return hmac.compare_digest(expected, signature)
+        try:
+            if alg.startswith("RS"):
+                key.verify(signature, signing_input, padding.PKCS1v15(), _hash_for(alg))
+            else:
+                half = len(signature) // 2
+                der = encode_dss_signature(int.from_bytes(signature[:half], "big"), int.from_bytes(signature[half:], "big"))
+                key.verify(der, signing_input, ec.ECDSA(_hash_for(alg)))
+            return True
+        except (InvalidSignature, ValueError):
+            return False
+
+    def verify(self, token):
+        """
+        Devuelve los claims si el token se pudo verificar localmente,
+        None si hay que consultarlo al Auth Service y lanza TokenRejected si es inválido.
+        """
+        try:
+            claims = self._verify(token)
+        except TokenRejected:
+            self.rejected += 1
+            raise
+        if claims is None:
+            self.fallbacks += 1
+        else:
+            self.verified += 1
+        return claims
+
+    def _verify(self, token):
+        try:
+            header_segment, payload_segment, signature_segment = token.split(".")
+            header = json.loads(_b64decode(header_segment))
+            claims = json.loads(_b64decode(payload_segment))
+            signature = _b64decode(signature_segment)
+        except ValueError:
+            return None
+        if not isinstance(header, dict) or not isinstance(claims, dict):
+            return None
+
+        alg = header.get("alg")
+        if not isinstance(alg, str):
+            return None
+        if alg not in _HMAC_DIGESTS and (alg not in _ASYMMETRIC_ALGORITHMS or hashes is None):
+            return None
+        key = self._find_key(alg, header.get("kid"))
+        if key is None:
+            return None
+
+        signing_input = f"{header_segment}.{payload_segment}".encode()
+        if not self._signature_ok(alg, key, signing_input, signature):
+            # Puede ser una rotación de claves: la decisión final es del Auth Service
+            return None
+
+        self._check_claims(claims)
+        return claims
+
+    def _check_claims(self, claims):
+        now = time.time()
+        try:
+            if "exp" in claims and now > float(claims["exp"]) + AUTH_JWT_LEEWAY:
+                raise TokenRejected("Token expirado")
+            if "nbf" in claims and now + AUTH_JWT_LEEWAY < float(claims["nbf"]):
+                raise TokenRejected("Token aún no válido")
+        except (TypeError, ValueError):
+            raise TokenRejected("Claims de tiempo inválidos")
+        if AUTH_JWT_ISSUER and claims.get("iss") != AUTH_JWT_ISSUER:
+            raise TokenRejected("Emisor inválido")
+        if AUTH_JWT_AUDIENCE:
+            audience = claims.get("aud")
+            audiences = audience if isinstance(audience, list) else [audience]
+            if AUTH_JWT_AUDIENCE not in audiences:
+                raise TokenRejected("Audiencia inválida")
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "keys": len(self._keys) + (1 if self.secret else 0),
+            "verified": self.verified,
+            "rejected": self.rejected,
+            "fallbacks": self.fallbacks,
+        }
+
+
+# Instancia única usada por el middleware
+jwt_verifier = JwtVerifier()
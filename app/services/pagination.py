@@ -0,0 +1,57 @@
+import base64
+import json
+import os
+from operator import itemgetter
+from fastapi import HTTPException
+
+# Tamaño de página cuando se envía cursor sin limit, y máximo permitido para limit
+PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT', 50))
+PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', 500))
+
+
+def encode_cursor(after_id, offset):
+    """Cursor opaco: ID del último elemento entregado y su posición"""
+    raw = json.dumps({"after": after_id, "offset": offset}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        offset = int(data["offset"])
+        if offset < 0:
+            raise ValueError
+        return data["after"], offset
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def is_paginated(limit, cursor):
+    return limit is not None or cursor is not None
+
+
+def paginate(rows, limit, cursor, key=itemgetter("id")):
+    """
+    Devolver (página, next_cursor) de una lista ordenada de filas.
+
+    La página siguiente empieza después del ID guardado en el cursor, por lo que
+    altas o bajas anteriores a ese elemento no duplican ni saltan filas; si el
+    elemento ya no existe se usa la posición guardada. next_cursor es None en la
+    última página.
+    """
+    limit = limit or PAGINATION_DEFAULT_LIMIT
+    start = 0
+    if cursor:
+        after_id, offset = decode_cursor(cursor)
+        if 0 < offset <= len(rows) and key(rows[offset - 1]) == after_id:
+            start = offset
+        else:
+            start = next(
+                (index + 1 for index, row in enumerate(rows) if key(row) == after_id),
+                min(offset, len(rows))
+            )
+    page = rows[start:start + limit]
+    end = start + len(page)
+    next_cursor = encode_cursor(key(page[-1]), end) if page and end < len(rows) else None
+    return page, next_cursor
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import time
+import grpc
+from app.grpc import products_pb2
+from app.grpc.channel_pool import channel_registry
+from app.services.response_cache import products_cache
+
+# Ventana (milisegundos) durante la que se juntan consultas de productos por ID
+PRODUCT_BATCH_WINDOW_MS = float(os.getenv('PRODUCT_BATCH_WINDOW_MS', 2))
+# Máximo de IDs por lote: al alcanzarlo el lote se envía sin esperar la ventana
+PRODUCT_BATCH_MAX_SIZE = int(os.getenv('PRODUCT_BATCH_MAX_SIZE', 100))
+# Si el microservicio no implementa GetProductsByIds, resolver el lote con un GetAllProducts
+PRODUCT_BATCH_CATALOG_FALLBACK = os.getenv('PRODUCT_BATCH_CATALOG_FALLBACK', 'true').lower() == 'true'
+# Segundos durante los que no se reintenta GetProductsByIds tras un UNIMPLEMENTED
+PRODUCT_BATCH_UNIMPLEMENTED_RETRY = float(os.getenv('PRODUCT_BATCH_UNIMPLEMENTED_RETRY', 300))
+
+
+class ProductLoader:
+    """
+    Agrupa las consultas de productos por ID que llegan dentro de una ventana corta
+    (estilo DataLoader) para resolverlas juntas.
+
+    Cada lote se resuelve primero con el catálogo vigente en caché (products_cache
+    "list") y los IDs restantes con una sola llamada GetProductsByIds. Si el
+    microservicio responde UNIMPLEMENTED se recuerda por PRODUCT_BATCH_UNIMPLEMENTED_RETRY
+    segundos y el lote se resuelve con un GetAllProducts. Si no hay forma de resolver
+    el lote en una llamada (fallback desactivado), no se espera la ventana: cada ID
+    va directo a GetProductById.
+    """
+
+    def __init__(self, window_ms=PRODUCT_BATCH_WINDOW_MS, max_size=PRODUCT_BATCH_MAX_SIZE,
+                 catalog_fallback=PRODUCT_BATCH_CATALOG_FALLBACK):
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self.catalog_fallback = catalog_fallback
+        self._pending = {}
+        self._timer = None
+        self._tasks = set()
+        # Instante desde el que se vuelve a intentar GetProductsByIds (None = disponible)
+        self._batch_rpc_retry_at = None
+        self.batches = 0
+        self.batched_ids = 0
+        self.catalog_hits = 0
+        self.batch_calls = 0
+        self.catalog_calls = 0
+        self.individual_calls = 0
+
+    @property
+    def enabled(self):
+        return self.window > 0 and self.max_size > 1
+
+    @property
+    def batching(self):
+        """True si un lote se puede resolver en una sola llamada gRPC"""
+        return self.enabled and (self.catalog_fallback or self._batch_rpc_available())
+
+    def _batch_rpc_available(self):
+        if self._batch_rpc_retry_at is None:
+            return True
+        if time.monotonic() < self._batch_rpc_retry_at:
+            return False
+        self._batch_rpc_retry_at = None
+        return True
+
+    async def load(self, product_id):
+        """Devolver el ProductResponse del producto (el mismo mensaje que GetProductById)"""
+        # Sin lotes, esperar la ventana solo agregaría latencia
+        if not self.batching:
+            return await self._load_one(product_id)
+
+        future = self._pending.get(product_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[product_id] = future
+            if len(self._pending) >= self.max_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        # Si este solicitante se cancela, los demás siguen esperando el mismo resultado
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(batch))
+        # Referencia fuerte hasta que termine la tarea
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        self.batches += 1
+        self.batched_ids += len(batch)
+        try:
+            missing = await self._resolve_from_catalog(batch)
+            if missing:
+                await self._resolve_batch(missing, batch)
+        except BaseException as e:
+            # Ningún solicitante del lote puede quedar esperando un resultado que no llegará
+            for future in batch.values():
+                if future.done():
+                    continue
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                    future.exception()
+                else:
+                    future.cancel()
+            if not isinstance(e, Exception):
+                raise
+
+    async def _resolve_from_catalog(self, batch):
+        """Resolver con el catálogo vigente en caché; devuelve los IDs que no estaban"""
+        cached = await products_cache.peek("list")
+        if cached is None:
+            return list(batch)
+        catalog = {row["id"]: row for row in cached.payload()["products"]}
+        missing = []
+        for product_id, future in batch.items():
+            row = catalog.get(product_id)
+            if row is None:
+                missing.append(product_id)
+            elif not future.done():
+                self.catalog_hits += 1
+                future.set_result(products_pb2.ProductResponse(success=True, product=products_pb2.Product(**row)))
+        return missing
+
+    async def _resolve_batch(self, ids, batch):
+        """Resolver los IDs con una sola llamada (GetProductsByIds o, si no existe, GetAllProducts)"""
+        client = channel_registry.products()
+        response = None
+        # GetProductsByIds responde por todos los IDs pedidos: los que omite no existen
+        exhaustive = False
+        if self._batch_rpc_available():
+            try:
+                response = await client.get_products_by_ids(ids)
+                self.batch_calls += 1
+                exhaustive = True
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                self._batch_rpc_retry_at = time.monotonic() + PRODUCT_BATCH_UNIMPLEMENTED_RETRY
+        if response is None and self.catalog_fallback:
+            response = await client.get_all_products()
+            self.catalog_calls += 1
+        if response is None:
+            # GetProductsByIds dejó de estar disponible con el lote ya armado
+            await asyncio.gather(*(self._resolve_one(product_id, batch[product_id]) for product_id in ids))
+            return
+
+        if not response.success:
+            for product_id in ids:
+                self._set_result(batch[product_id], products_pb2.ProductResponse(success=False, message=response.message))
+            return
+
+        found = {product.id: product for product in response.products}
+        unresolved = []
+        for product_id in ids:
+            product = found.get(product_id)
+            if product is not None:
+                self._set_result(batch[product_id], products_pb2.ProductResponse(success=True, product=product))
+            elif exhaustive:
+                self._set_result(batch[product_id], products_pb2.ProductResponse(success=False, message="Producto no encontrado"))
+            else:
+                unresolved.append(product_id)
+        # GetAllProducts puede no incluir todos los productos (p. ej. inactivos): se confirman uno a uno
+        await asyncio.gather(*(self._resolve_one(product_id, batch[product_id]) for product_id in unresolved))
+
+    @staticmethod
+    def _set_result(future, response):
+        if not future.done():
+            future.set_result(response)
+
+    async def _resolve_one(self, product_id, future):
+        try:
+            response = await self._load_one(product_id)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            # Marca la excepción como consumida aunque nadie siga esperando
+            future.exception()
+            return
+        self._set_result(future, response)
+
+    async def _load_one(self, product_id):
+        self.individual_calls += 1
+        return await channel_registry.products().get_product_by_id(product_id)
+
+    def stats(self):
+        return {
+            "window_ms": self.window * 1000,
+            "max_size": self.max_size,
+            "batches": self.batches,
+            "batched_ids": self.batched_ids,
+            "catalog_hits": self.catalog_hits,
+            "batch_calls": self.batch_calls,
+            "catalog_calls": self.catalog_calls,
+            "batch_rpc_available": self._batch_rpc_retry_at is None,
+            "individual_calls": self.individual_calls,
+        }
+
+
+# Instancia única usada por las rutas de productos
+product_loader = ProductLoader()
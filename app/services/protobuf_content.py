@@ -0,0 +1,116 @@
+from fastapi import HTTPException
+from fastapi.responses import Response
+from google.protobuf.message import DecodeError
+from pydantic import BaseModel
+from starlette.requests import Request
+from app.grpc.converter import to_dict
+from app.services.fast_json import FastJSONRoute, encode_json
+from app.services.streaming import accepts
+
+# Respuestas y cuerpos en protobuf binario para servicios internos (sin conversión a JSON)
+PROTOBUF_MEDIA_TYPE = "application/x-protobuf"
+
+
+def wants_protobuf(request):
+    """True si el encabezado Accept prefiere application/x-protobuf"""
+    return accepts(request, PROTOBUF_MEDIA_TYPE)
+
+
+def protobuf_response(message):
+    """
+    Mensaje del microservicio serializado tal cual (SerializeToString), sin pasar por
+    dict ni JSON. El tipo del mensaje va en X-Protobuf-Message para que el cliente sepa
+    cómo decodificarlo (por ejemplo, products.ProductListResponse).
+    """
+    return Response(
+        content=message.SerializeToString(),
+        media_type=PROTOBUF_MEDIA_TYPE,
+        headers={"X-Protobuf-Message": message.DESCRIPTOR.full_name, "Vary": "Accept"},
+    )
+
+
+def reject_json_options(**options):
+    """limit, cursor y fields solo aplican a JSON/NDJSON: en protobuf el mensaje va completo"""
+    for name, value in options.items():
+        if value is not None:
+            raise HTTPException(status_code=400, detail=f"{name} no se admite con {PROTOBUF_MEDIA_TYPE}")
+
+
+def protobuf_body(message_type):
+    """
+    Marca una ruta de escritura para aceptar también el cuerpo como mensaje protobuf
+    (Content-Type: application/x-protobuf). Se usa debajo del decorador del router:
+
+        @router.post("/")
+        @protobuf_body(products_pb2.CreateProductRequest)
+        async def create_product(product_data: CreateProductRequest, ...):
+    """
+    def decorator(endpoint):
+        endpoint._protobuf_body = message_type
+        return endpoint
+    return decorator
+
+
+class ProtobufBodyRoute(FastJSONRoute):
+    """
+    FastJSONRoute que además acepta cuerpos protobuf en las rutas marcadas con
+    @protobuf_body: el mensaje se traduce al JSON equivalente antes de que FastAPI lo
+    valide con el modelo pydantic de la ruta, así ambos formatos pasan por las mismas
+    validaciones.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        message_type = getattr(endpoint, "_protobuf_body", None)
+        if message_type is not None:
+            # El cuerpo protobuf también aparece en la documentación OpenAPI
+            extra = kwargs.get("openapi_extra") or {}
+            kwargs["openapi_extra"] = {**extra, "requestBody": {"content": {PROTOBUF_MEDIA_TYPE: {
+                "schema": {
+                    "type": "string",
+                    "format": "binary",
+                    "description": f"Mensaje {message_type.DESCRIPTOR.full_name}",
+                },
+            }}}}
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        message_type = getattr(self.endpoint, "_protobuf_body", None)
+        model = self.body_field.type_ if self.body_field is not None else None
+        if message_type is None or not (isinstance(model, type) and issubclass(model, BaseModel)):
+            return handler
+
+        async def protobuf_handler(request):
+            content_type = request.headers.get("content-type", "")
+            if content_type.split(";")[0].strip().lower() == PROTOBUF_MEDIA_TYPE:
+                request = await _as_json_request(request, message_type, model)
+            return await handler(request)
+
+        return protobuf_handler
+
+
+async def _as_json_request(request, message_type, model):
+    try:
+        message = message_type.FromString(await request.body())
+    except DecodeError:
+        raise HTTPException(status_code=400, detail=f"Cuerpo protobuf inválido ({message_type.DESCRIPTOR.full_name})")
+
+    # En proto3 un campo con su valor por defecto no se distingue de uno ausente: los
+    # obligatorios del modelo se envían siempre (un 0 o "" no debe dar 422) y los opcionales
+    # solo si vienen, para no pisar datos con "" o 0 en las actualizaciones parciales
+    present = {field.name for field, _ in message.ListFields()}
+    names = tuple(
+        field.name for field in message.DESCRIPTOR.fields
+        if field.name in model.model_fields
+        and (field.name in present or model.model_fields[field.name].is_required())
+    )
+    body = encode_json(to_dict(message, names))
+
+    headers = [
+        (name, value) for name, value in request.scope["headers"]
+        if name not in (b"content-type", b"content-length")
+    ]
+    headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    json_request = Request({**request.scope, "headers": headers}, request.receive)
+    json_request._body = body
+    return json_request
@@ -0,0 +1,563 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from fastapi import HTTPException
+from fastapi.responses import Response
+from app.services.fast_json import encode_json, decode_json
+from app.services.invalidation_bus import invalidation_bus
+
+# TTL (segundos) de las respuestas del catálogo de productos
+PRODUCTS_CACHE_TTL = float(os.getenv('PRODUCTS_CACHE_TTL', 30))
+# Tiempo máximo (segundos, pasado el TTL) que se sirve el catálogo vencido mientras se refresca
+PRODUCTS_CACHE_MAX_STALE = float(os.getenv('PRODUCTS_CACHE_MAX_STALE', 300))
+# Espera tras un refresco fallido: se duplica en cada fallo hasta el máximo
+CACHE_REFRESH_BACKOFF = float(os.getenv('CACHE_REFRESH_BACKOFF', 1))
+CACHE_REFRESH_MAX_BACKOFF = float(os.getenv('CACHE_REFRESH_MAX_BACKOFF', 60))
+# TTL (segundos) de GET /api/clients/{id}; los perfiles cambian poco y toda escritura invalida
+CLIENTS_CACHE_TTL = float(os.getenv('CLIENTS_CACHE_TTL', 300))
+# Cargar en segundo plano el perfil del usuario tras un login exitoso
+CLIENT_CACHE_WARM_ON_LOGIN = os.getenv('CLIENT_CACHE_WARM_ON_LOGIN', 'false').lower() == 'true'
+# TTL (segundos) de GET /api/orders/{id} según current_status: los pedidos en estado
+# terminal ya no cambian; los demás cambian con cada update_order_status
+ORDER_CACHE_TERMINAL_TTL = float(os.getenv('ORDER_CACHE_TERMINAL_TTL', 86400))
+ORDER_CACHE_ACTIVE_TTL = float(os.getenv('ORDER_CACHE_ACTIVE_TTL', 15))
+ORDER_TERMINAL_STATUSES = {
+    status.strip().upper()
+    for status in os.getenv('ORDER_TERMINAL_STATUSES', 'ENTREGADO,CANCELADO,DELIVERED,CANCELLED').split(",")
+    if status.strip()
+}
+# TTL (segundos) de las búsquedas por ID que no encontraron el recurso (404)
+NEGATIVE_CACHE_TTL = float(os.getenv('NEGATIVE_CACHE_TTL', 10))
+# Límites de memoria de la caché de respuestas (compartidos por todas las rutas)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 1000))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+# Almacén de la caché: "memory" (por instancia) o "sqlite" (archivo compartido por las instancias del host)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory').lower()
+CACHE_SQLITE_PATH = os.getenv(
+    'CACHE_SQLITE_PATH',
+    os.path.join(tempfile.gettempdir(), 'censudex_gateway_cache.db')
+)
+# Segundos que una entrada vencida se conserva en SQLite (para stale-while-revalidate)
+CACHE_SQLITE_RETENTION = float(os.getenv('CACHE_SQLITE_RETENTION', 3600))
+
+
+def compute_etag(body):
+    """ETag fuerte derivado del contenido exacto de la respuesta"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(etag, if_none_match):
+    """Comparación débil de If-None-Match (RFC 9110), admite listas y *"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class CachedResponse:
+    """Cuerpo JSON ya serializado (y su ETag), listo para enviarse sin volver a convertir"""
+
+    __slots__ = ("body", "status_code", "expires_at", "etag", "_payload")
+
+    def __init__(self, body, status_code=200, expires_at=0.0, etag=None):
+        self.body = body
+        self.status_code = status_code
+        self.expires_at = expires_at
+        self.etag = etag or compute_etag(body)
+        self._payload = None
+
+    def payload(self):
+        """Cuerpo decodificado (se decodifica una sola vez por entrada); no se debe modificar"""
+        if self._payload is None:
+            self._payload = decode_json(self.body)
+        return self._payload
+
+    @property
+    def size(self):
+        return len(self.body)
+
+    def is_fresh(self, now=None):
+        return (now or time.time()) < self.expires_at
+
+    def to_response(self, request=None):
+        """Respuesta HTTP; 304 sin cuerpo si el cliente ya tiene esta versión (If-None-Match)"""
+        # Las mismas URLs responden JSON, NDJSON o protobuf según Accept: las cachés
+        # compartidas (NGINX, proxies) deben guardar una variante por Accept
+        if self.status_code != 200:
+            return Response(content=self.body, status_code=self.status_code, media_type="application/json",
+                            headers={"Vary": "Accept"})
+        headers = {"ETag": self.etag, "Vary": "Accept"}
+        if request is not None and etag_matches(self.etag, request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, status_code=self.status_code, media_type="application/json", headers=headers)
+
+
+def json_response(payload, request=None):
+    """Respuesta JSON con ETag para rutas cuyo resultado no se guarda en caché"""
+    return CachedResponse(encode_json(payload)).to_response(request)
+
+
+class CacheStore(ABC):
+    """Interfaz de los almacenes de la caché de respuestas"""
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def get(self, key):
+        """Entrada guardada (CachedResponse) o None"""
+
+    @abstractmethod
+    async def set(self, key, entry):
+        """Guardar o reemplazar una entrada"""
+
+    @abstractmethod
+    async def delete(self, key):
+        """Eliminar una entrada, si existe"""
+
+    @abstractmethod
+    async def delete_prefix(self, prefix):
+        """Eliminar todas las entradas cuya clave empieza con prefix"""
+
+    @abstractmethod
+    async def clear(self):
+        """Eliminar todas las entradas"""
+
+    @abstractmethod
+    async def stats(self):
+        """Contadores para /metrics"""
+
+
+class MemoryCacheStore(CacheStore):
+    """Almacén LRU en memoria acotado por cantidad de entradas y bytes totales"""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key, entry):
+        if entry.size > self.max_bytes:
+            return
+        await self.delete(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    async def delete(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    async def delete_prefix(self, prefix):
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            await self.delete(key)
+
+    async def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    async def stats(self):
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class SqliteCacheStore(CacheStore):
+    """
+    Almacén en un archivo SQLite compartido por las instancias del mismo host,
+    de modo que una respuesta cacheada por una instancia sirve a las demás.
+    """
+
+    # Cada cuántas escrituras se revisan los límites de tamaño
+    PRUNE_EVERY = 32
+
+    def __init__(self, path=CACHE_SQLITE_PATH, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes=RESPONSE_CACHE_MAX_BYTES, retention=CACHE_SQLITE_RETENTION):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.retention = retention
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.evictions = 0
+
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " key TEXT PRIMARY KEY,"
+                " body BLOB NOT NULL,"
+                " status_code INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " etag TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _run(self, fn, *args):
+        with self._lock:
+            return fn(self._connection(), *args)
+
+    async def open(self):
+        await asyncio.to_thread(self._run, lambda conn: None)
+
+    async def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def get(self, key):
+        row = await asyncio.to_thread(self._run, self._get, key)
+        if row is None:
+            return None
+        body, status_code, expires_at, etag = row
+        return CachedResponse(bytes(body), status_code, expires_at, etag)
+
+    def _get(self, conn, key):
+        return conn.execute(
+            "SELECT body, status_code, expires_at, etag FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+
+    async def set(self, key, entry):
+        if entry.size > self.max_bytes:
+            return
+        await asyncio.to_thread(self._run, self._set, key, entry)
+
+    def _set(self, conn, key, entry):
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, body, status_code, expires_at, etag, size, stored_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, entry.body, entry.status_code, entry.expires_at, entry.etag, entry.size, time.time())
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune(conn)
+
+    def _prune(self, conn):
+        conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (time.time() - self.retention,))
+        while True:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+            if count <= self.max_entries and total <= self.max_bytes:
+                return
+            # Se eliminan las entradas más antiguas por tandas
+            batch = max(1, count // 10, count - self.max_entries)
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN"
+                " (SELECT key FROM cache_entries ORDER BY stored_at LIMIT ?)",
+                (batch,)
+            )
+            self.evictions += batch
+
+    async def delete(self, key):
+        await asyncio.to_thread(self._run, lambda conn: conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,)))
+
+    async def delete_prefix(self, prefix):
+        # Rango [prefix, prefix + U+10FFFF) en vez de LIKE para no escapar comodines
+        await asyncio.to_thread(self._run, lambda conn: conn.execute(
+            "DELETE FROM cache_entries WHERE key >= ? AND key < ?", (prefix, prefix + "\U0010ffff")
+        ))
+
+    async def clear(self):
+        await asyncio.to_thread(self._run, lambda conn: conn.execute("DELETE FROM cache_entries"))
+
+    async def stats(self):
+        try:
+            count, total = await asyncio.to_thread(
+                self._run,
+                lambda conn: conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+            )
+        except sqlite3.Error:
+            count, total = None, None
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "entries": count,
+            "bytes": total,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+def create_cache_store(backend=CACHE_BACKEND):
+    """Almacén configurado con CACHE_BACKEND"""
+    if backend == "sqlite":
+        return SqliteCacheStore()
+    return MemoryCacheStore()
+
+
+# Cachés registradas por nombre (para invalidaciones remotas y métricas)
+_caches = {}
+
+
+class ResponseCache:
+    """
+    Caché de respuestas de una ruta (o grupo de rutas) con TTL.
+    Las claves se agrupan por nombre dentro del almacén compartido.
+
+    Con max_stale > 0 funciona en modo stale-while-revalidate: una entrada vencida
+    se sigue sirviendo (hasta max_stale segundos) mientras una tarea en segundo
+    plano la refresca, con un único refresco por clave y backoff si el refresco falla.
+
+    ttl_for(payload), si se indica, decide el TTL de cada entrada según su contenido.
+    """
+
+    def __init__(self, name, ttl, store, max_stale=0.0, ttl_for=None):
+        _caches[name] = self
+        self.name = name
+        self.ttl = ttl
+        self.store = store
+        self.max_stale = max_stale
+        self.ttl_for = ttl_for
+        # Se incrementa en cada invalidación: una carga iniciada antes no debe sobrescribirla
+        self._epoch = 0
+        self._refreshing = {}
+        self._refresh_failures = {}
+        self._retry_at = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def _key(self, key):
+        return f"{self.name}:{key}"
+
+    async def get(self, key):
+        entry = await self.store.get(self._key(key))
+        if entry is not None and entry.is_fresh():
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    async def peek(self, key, stale=False):
+        """
+        Entrada vigente sin contar aciertos ni fallos (para decidir cómo responder).
+        Con stale=True también devuelve la que get_or_load serviría vencida (max_stale).
+        """
+        entry = await self.store.get(self._key(key))
+        if entry is None:
+            return None
+        now = time.time()
+        if entry.is_fresh(now) or (stale and now < entry.expires_at + self.max_stale):
+            return entry
+        return None
+
+    async def set(self, key, payload, status_code=200):
+        ttl = self.ttl_for(payload) if self.ttl_for is not None else self.ttl
+        entry = CachedResponse(encode_json(payload), status_code, time.time() + ttl)
+        if ttl > 0:
+            await self.store.set(self._key(key), entry)
+        return entry
+
+    async def _load(self, key, loader):
+        epoch = self._epoch
+        payload = await loader()
+        if epoch != self._epoch:
+            # Hubo una escritura mientras se consultaba el microservicio: no se guarda
+            return CachedResponse(encode_json(payload))
+        return await self.set(key, payload)
+
+    async def get_or_load(self, key, loader):
+        """Devolver la respuesta en caché o generarla con loader() (los errores no se guardan)"""
+        entry = await self.store.get(self._key(key))
+        now = time.time()
+        if entry is not None:
+            if entry.is_fresh(now):
+                self.hits += 1
+                return entry
+            if now < entry.expires_at + self.max_stale:
+                self.stale_hits += 1
+                self._schedule_refresh(key, loader, now)
+                return entry
+        self.misses += 1
+        return await self._load(key, loader)
+
+    def _schedule_refresh(self, key, loader, now):
+        if key in self._refreshing or now < self._retry_at.get(key, 0):
+            return
+        self._refreshing[key] = asyncio.create_task(self._refresh(key, loader))
+
+    async def _refresh(self, key, loader):
+        try:
+            await self._load(key, loader)
+            self.refreshes += 1
+            self._refresh_failures.pop(key, None)
+            self._retry_at.pop(key, None)
+        except Exception:
+            # Microservicio caído o con error: se sigue sirviendo la versión vencida
+            self.refresh_errors += 1
+            failures = self._refresh_failures.get(key, 0) + 1
+            self._refresh_failures[key] = failures
+            backoff = min(CACHE_REFRESH_BACKOFF * 2 ** (failures - 1), CACHE_REFRESH_MAX_BACKOFF)
+            self._retry_at[key] = time.time() + backoff
+        finally:
+            del self._refreshing[key]
+
+    async def invalidate(self, *keys):
+        """Eliminar las claves en esta instancia y avisar a las demás por el bus"""
+        await self.invalidate_local(*keys)
+        invalidation_bus.publish([self._key(key) for key in keys])
+
+    async def invalidate_local(self, *keys):
+        self._epoch += 1
+        for key in keys:
+            await self.store.delete(self._key(key))
+            self.invalidations += 1
+
+    async def invalidate_prefix(self, prefix):
+        """Eliminar todas las claves que empiezan con prefix, aquí y en las demás instancias"""
+        await self.invalidate_prefix_local(prefix)
+        invalidation_bus.publish(prefixes=[self._key(prefix)])
+
+    async def invalidate_prefix_local(self, prefix):
+        self._epoch += 1
+        await self.store.delete_prefix(self._key(prefix))
+        self.invalidations += 1
+
+    def stats(self):
+        return {
+            "ttl": self.ttl,
+            "max_stale": self.max_stale,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+class NotFoundError(HTTPException):
+    """404 confirmado por el microservicio: se puede recordar en la caché negativa"""
+
+    def __init__(self, detail):
+        super().__init__(status_code=404, detail=detail)
+
+
+class _CachedNotFound(Exception):
+    """Sale del loader de la caché positiva con el 404 (recordado o recién guardado)"""
+
+    def __init__(self, entry):
+        self.entry = entry
+
+
+class NegativeCache:
+    """
+    Caché de búsquedas por ID sin resultado, separada de las respuestas positivas
+    y con su propio TTL. Las claves son "<caché>:<clave>", por ejemplo "products:item:7".
+    """
+
+    def __init__(self, ttl, store):
+        self.cache = ResponseCache("notfound", ttl, store)
+
+    async def get_or_load(self, cache, key, loader):
+        """
+        Respuesta de cache.get_or_load(key, loader), salvo que loader() lance NotFoundError:
+        ese 404 se guarda y se devuelve como respuesta.
+        La caché negativa solo se consulta si la positiva no tiene la entrada, de modo
+        que los aciertos de la positiva no pagan una búsqueda más.
+        """
+        try:
+            return await cache.get_or_load(key, lambda: self._load(f"{cache.name}:{key}", loader))
+        except _CachedNotFound as e:
+            return e.entry
+
+    async def _load(self, key, loader):
+        cached = await self.cache.get(key)
+        if cached is not None:
+            raise _CachedNotFound(cached)
+        try:
+            return await loader()
+        except NotFoundError as e:
+            raise _CachedNotFound(await self.cache.set(key, {"detail": e.detail}, status_code=404))
+
+    async def clear(self, resource):
+        """Olvidar los 404 de un recurso (por ejemplo, al crear uno nuevo)"""
+        await self.cache.invalidate_prefix(f"{resource}:")
+
+
+# Almacén compartido por todas las cachés de respuestas del gateway
+response_store = create_cache_store()
+
+# Catálogo de productos: "list" (GET /api/products) e "item:<id>" (GET /api/products/{id})
+products_cache = ResponseCache("products", PRODUCTS_CACHE_TTL, response_store, max_stale=PRODUCTS_CACHE_MAX_STALE)
+
+# Perfiles de clientes por ID ("item:<id>"), sin el campo password
+clients_cache = ResponseCache("clients", CLIENTS_CACHE_TTL, response_store)
+
+
+def order_ttl(payload):
+    """TTL de un pedido: largo si current_status es terminal, corto si sigue en curso"""
+    status = str(payload.get("order", {}).get("current_status", "")).upper()
+    return ORDER_CACHE_TERMINAL_TTL if status in ORDER_TERMINAL_STATUSES else ORDER_CACHE_ACTIVE_TTL
+
+
+# Detalle de pedidos por ID ("item:<id>")
+orders_cache = ResponseCache("orders", ORDER_CACHE_ACTIVE_TTL, response_store, ttl_for=order_ttl)
+
+# Productos, clientes y pedidos inexistentes: "products:item:<id>", "clients:item:<id>", "orders:item:<id>"
+notfound_cache = NegativeCache(NEGATIVE_CACHE_TTL, response_store)
+
+
+async def _apply_remote_invalidation(keys, prefixes):
+    """Invalidaciones publicadas por otra instancia: "<cache>:<clave>" """
+    for full_key in keys:
+        name, _, key = str(full_key).partition(":")
+        cache = _caches.get(name)
+        if cache is not None:
+            await cache.invalidate_local(key)
+    for full_prefix in prefixes:
+        name, _, prefix = str(full_prefix).partition(":")
+        cache = _caches.get(name)
+        if cache is not None:
+            await cache.invalidate_prefix_local(prefix)
+
+
+invalidation_bus.subscribe(_apply_remote_invalidation)
+
+
+async def cache_stats():
+    """Contadores de todas las cachés de respuestas"""
+    stats = {"store": await response_store.stats(), "bus": invalidation_bus.stats()}
+    for name, cache in _caches.items():
+        stats[name] = cache.stats()
+    return stats
@@ -0,0 +1,227 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from app.services.token_cache import hash_token, token_expiry
+
+# Dónde se guardan las revocaciones: "sqlite" (archivo compartido por las instancias del host) o "memory"
+REVOCATION_BACKEND = os.getenv('REVOCATION_BACKEND', 'sqlite').lower()
+REVOCATION_DB_PATH = os.getenv(
+    'REVOCATION_DB_PATH',
+    os.path.join(tempfile.gettempdir(), 'censudex_gateway_revocations.db')
+)
+# Cada cuánto (segundos) se incorporan al filtro las revocaciones hechas por otras instancias
+REVOCATION_SYNC_INTERVAL = float(os.getenv('REVOCATION_SYNC_INTERVAL', 1))
+# Cada cuánto se eliminan las revocaciones expiradas y se reconstruye el filtro
+REVOCATION_PURGE_INTERVAL = float(os.getenv('REVOCATION_PURGE_INTERVAL', 600))
+# Tamaño del filtro de Bloom en bits y cantidad de funciones hash
+REVOCATION_BLOOM_BITS = int(os.getenv('REVOCATION_BLOOM_BITS', 1 << 20))
+REVOCATION_BLOOM_HASHES = int(os.getenv('REVOCATION_BLOOM_HASHES', 7))
+# Tiempo (segundos) que se recuerda un token revocado que no trae claim exp
+REVOCATION_DEFAULT_TTL = float(os.getenv('REVOCATION_DEFAULT_TTL', 86400))
+
+
+class BloomFilter:
+    """Filtro de Bloom sobre hashes SHA-256 de tokens (sin falsos negativos)"""
+
+    def __init__(self, bits=REVOCATION_BLOOM_BITS, hashes=REVOCATION_BLOOM_HASHES):
+        self.bits = max(8, bits)
+        self.hashes = max(1, hashes)
+        self._array = bytearray((self.bits + 7) // 8)
+        self.items = 0
+
+    def _positions(self, key):
+        # Doble hashing a partir del propio SHA-256 del token
+        digest = bytes.fromhex(key)
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.items += 1
+
+    def might_contain(self, key):
+        array = self._array
+        return all(array[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class _SqliteRevocationStore:
+    """Lista autoritativa de revocaciones en un archivo SQLite compartido por las instancias"""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " token_hash TEXT UNIQUE NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+
+    @property
+    def is_open(self):
+        return self._conn is not None
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def add(self, key, expires_at):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO revoked_tokens (token_hash, expires_at) VALUES (?, ?)"
+                " ON CONFLICT(token_hash) DO UPDATE SET expires_at = excluded.expires_at",
+                (key, expires_at)
+            )
+
+    def contains(self, key, now):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM revoked_tokens WHERE token_hash = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        return row is not None
+
+    def changes_since(self, last_id, now):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, token_hash FROM revoked_tokens WHERE id > ? AND expires_at > ? ORDER BY id",
+                (last_id, now)
+            ).fetchall()
+
+    def purge(self, now):
+        with self._lock:
+            self._conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+
+
+class RevocationList:
+    """
+    Tokens cerrados con logout en cualquiera de las instancias del gateway.
+    Un filtro de Bloom en memoria responde sin I/O para los tokens no revocados;
+    solo ante un posible acierto se consulta la lista autoritativa.
+    """
+
+    def __init__(self, backend=REVOCATION_BACKEND, path=REVOCATION_DB_PATH):
+        self.backend = backend
+        self._store = _SqliteRevocationStore(path) if backend == "sqlite" else None
+        self._bloom = BloomFilter()
+        # Revocaciones hechas por esta instancia (con backend memory es la lista completa)
+        self._local = {}
+        self._last_id = 0
+        self._next_purge = 0
+        self._task = None
+        self.bloom_negatives = 0
+        self.store_lookups = 0
+        self.false_positives = 0
+
+    async def start(self):
+        """Abrir la lista compartida, cargar el filtro y sincronizarlo periódicamente"""
+        if self._store is None or self._task is not None:
+            return
+        await asyncio.to_thread(self._store.open)
+        await self._rebuild()
+        self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._store is not None:
+            self._store.close()
+
+    async def revoke(self, token):
+        now = time.time()
+        key = hash_token(token)
+        expires_at = token_expiry(token) or now + REVOCATION_DEFAULT_TTL
+        self._local[key] = expires_at
+        self._bloom.add(key)
+        if self._store is not None and self._store.is_open:
+            await asyncio.to_thread(self._store.add, key, expires_at)
+        if self._store is None and now >= self._next_purge:
+            self._purge_local(now)
+
+    async def is_revoked(self, token):
+        key = hash_token(token)
+        if not self._bloom.might_contain(key):
+            self.bloom_negatives += 1
+            return False
+
+        now = time.time()
+        expires_at = self._local.get(key)
+        if expires_at is not None:
+            return expires_at > now
+        if self._store is None or not self._store.is_open:
+            self.false_positives += 1
+            return False
+
+        self.store_lookups += 1
+        revoked = await asyncio.to_thread(self._store.contains, key, now)
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(REVOCATION_SYNC_INTERVAL)
+            try:
+                if time.time() >= self._next_purge:
+                    await self._rebuild()
+                else:
+                    await self._sync()
+            except sqlite3.Error:
+                # Archivo ocupado o inaccesible: se reintenta en el próximo ciclo
+                continue
+
+    async def _sync(self):
+        rows = await asyncio.to_thread(self._store.changes_since, self._last_id, time.time())
+        for row_id, key in rows:
+            self._bloom.add(key)
+            self._last_id = row_id
+
+    async def _rebuild(self):
+        # Los bits de un filtro de Bloom no se pueden borrar: se reconstruye sin las revocaciones expiradas
+        now = time.time()
+        await asyncio.to_thread(self._store.purge, now)
+        rows = await asyncio.to_thread(self._store.changes_since, 0, now)
+        bloom = BloomFilter(self._bloom.bits, self._bloom.hashes)
+        for row_id, key in rows:
+            bloom.add(key)
+        # Las revocaciones locales cuyo INSERT terminó después de la lectura no vienen en rows:
+        # sin agregarlas, is_revoked no llegaría a consultar _local hasta el próximo _sync
+        self._local = {key: exp for key, exp in self._local.items() if exp > now}
+        for key in self._local:
+            bloom.add(key)
+        self._bloom = bloom
+        self._last_id = rows[-1][0] if rows else self._last_id
+        self._next_purge = now + REVOCATION_PURGE_INTERVAL
+
+    def _purge_local(self, now):
+        self._local = {key: exp for key, exp in self._local.items() if exp > now}
+        bloom = BloomFilter(self._bloom.bits, self._bloom.hashes)
+        for key in self._local:
+            bloom.add(key)
+        self._bloom = bloom
+        self._next_purge = now + REVOCATION_PURGE_INTERVAL
+
+    def stats(self):
+        return {
+            "backend": self.backend,
+            "bloom_bits": self._bloom.bits,
+            "bloom_items": self._bloom.items,
+            "bloom_negatives": self.bloom_negatives,
+            "store_lookups": self.store_lookups,
+            "false_positives": self.false_positives,
+        }
+
+
+# Instancia única compartida por el middleware y las rutas de autenticación
+revocation_list = RevocationList()
@@ -0,0 +1,41 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas concurrentes con la misma clave en una sola ejecución.
+    Todos los que esperan reciben el mismo resultado o la misma excepción.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        """Ejecutar fn() salvo que ya haya una ejecución en curso para key"""
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            # Se ejecuta en su propia tarea: si el primer solicitante se cancela
+            # (cliente desconectado), los demás siguen esperando el mismo resultado
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Marca la excepción como consumida aunque todos los solicitantes se hayan cancelado
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,144 @@
+import os
+import time
+import grpc
+from fastapi.responses import StreamingResponse
+from app.services.fast_json import encode_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Bytes acumulados antes de enviar un fragmento: evita un envío por fila sin crecer con el total
+NDJSON_CHUNK_SIZE = 64 * 1024
+# Segundos durante los que no se reintenta una RPC de streaming que respondió UNIMPLEMENTED
+STREAM_UNIMPLEMENTED_RETRY = float(os.getenv('STREAM_UNIMPLEMENTED_RETRY', 300))
+
+# RPC de streaming no implementadas por su microservicio → instante del próximo intento
+_unimplemented = {}
+
+
+# Tipos de respuesta de las rutas con negociación de contenido (el primero es el predeterminado)
+NEGOTIATED_MEDIA_TYPES = ("application/json", NDJSON_MEDIA_TYPE, "application/x-protobuf")
+
+
+def _accept_ranges(header):
+    """Rangos de Accept como (tipo, q, posición), sin los de q inválido"""
+    ranges = []
+    for index, media_range in enumerate(header.split(",")):
+        range_type, *params = [part.strip() for part in media_range.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if range_type:
+            ranges.append((range_type.lower(), q, index))
+    return ranges
+
+
+def negotiate(request, offered=NEGOTIATED_MEDIA_TYPES):
+    """
+    Tipo de offered que prefiere el encabezado Accept: el de mayor q; a igual q, el
+    nombrado explícitamente antes que un comodín y luego el que aparece primero.
+    Sin Accept (o sin coincidencias) se usa el primero de offered.
+    """
+    ranges = _accept_ranges(request.headers.get("accept", ""))
+    best, best_rank = offered[0], None
+    for order, media_type in enumerate(offered):
+        wildcard = media_type.split("/")[0] + "/*"
+        # Gana el rango más específico que coincide (tipo exacto, luego type/*, luego */*)
+        match = None
+        for specificity, pattern in ((2, media_type), (1, wildcard), (0, "*/*")):
+            match = next(((q, specificity, index) for range_type, q, index in ranges if range_type == pattern), None)
+            if match is not None:
+                break
+        if match is None or match[0] <= 0:
+            continue
+        q, specificity, index = match
+        rank = (q, specificity, -index, -order)
+        if best_rank is None or rank > best_rank:
+            best, best_rank = media_type, rank
+    return best
+
+
+def accepts(request, media_type):
+    """True si media_type es el tipo preferido por el encabezado Accept (ver negotiate)"""
+    return negotiate(request) == media_type
+
+
+def wants_ndjson(request):
+    """True si el encabezado Accept prefiere application/x-ndjson"""
+    return accepts(request, NDJSON_MEDIA_TYPE)
+
+
+async def open_stream(method, start_call):
+    """
+    Leer el primer mensaje de una RPC server-streaming antes de responder, para que
+    sus errores todavía se puedan traducir a HTTP.
+    Devuelve un iterador asíncrono con todos los mensajes de la llamada, o None si
+    el microservicio no implementa la RPC (UNIMPLEMENTED) y se debe usar la unaria.
+    El UNIMPLEMENTED se recuerda por método (STREAM_UNIMPLEMENTED_RETRY segundos) para
+    no pagar una llamada fallida en cada petición.
+    """
+    retry_at = _unimplemented.get(method)
+    if retry_at is not None:
+        if time.monotonic() < retry_at:
+            return None
+        del _unimplemented[method]
+
+    call = start_call()
+    try:
+        first = await call.read()
+    except grpc.RpcError as e:
+        call.cancel()
+        if e.code() == grpc.StatusCode.UNIMPLEMENTED:
+            _unimplemented[method] = time.monotonic() + STREAM_UNIMPLEMENTED_RETRY
+            return None
+        raise
+    except BaseException:
+        call.cancel()
+        raise
+
+    async def messages():
+        try:
+            message = first
+            while message is not grpc.aio.EOF:
+                yield message
+                # Se lee el siguiente mensaje solo cuando el anterior ya se envió (backpressure)
+                message = await call.read()
+        finally:
+            # Cliente HTTP desconectado: se cancela la llamada al microservicio
+            call.cancel()
+
+    return messages()
+
+
+async def _ndjson_lines(rows, convert):
+    if hasattr(rows, "__aiter__"):
+        # Filas que llegan desde el microservicio: cada una se envía apenas llega
+        async for row in rows:
+            yield encode_json(convert(row) if convert is not None else row) + b"\n"
+        return
+    buffer = bytearray()
+    for row in rows:
+        buffer += encode_json(convert(row) if convert is not None else row)
+        buffer += b"\n"
+        if len(buffer) >= NDJSON_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def ndjson_response(rows, convert=None, next_cursor=None):
+    """
+    Respuesta NDJSON (una fila JSON por línea) que convierte y serializa las filas
+    a medida que se envían, sin armar la lista ni el documento completo en memoria.
+    Con paginación, el cursor de la página siguiente va en el encabezado X-Next-Cursor.
+    """
+    # La misma URL responde JSON, NDJSON o protobuf según Accept
+    headers = {"Vary": "Accept"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return StreamingResponse(_ndjson_lines(rows, convert), media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,95 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+# TTL máximo (segundos) de una validación en caché y cantidad máxima de tokens guardados
+TOKEN_CACHE_TTL = float(os.getenv('TOKEN_CACHE_TTL', 60))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv('TOKEN_CACHE_MAX_SIZE', 10000))
+
+
+def hash_token(token):
+    """Clave de caché: nunca se guarda el token en claro"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_expiry(token):
+    """
+    Leer el claim exp del JWT sin verificar la firma.
+    Solo se usa para acotar el TTL; la validez la decide el Auth Service.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+class TokenCache:
+    """
+    Caché LRU en memoria de validaciones de token.
+    Cada entrada expira en el menor entre el TTL configurado y el exp del token.
+    """
+
+    def __init__(self, ttl=TOKEN_CACHE_TTL, max_size=TOKEN_CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token):
+        key = hash_token(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, user_data = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return user_data
+
+    def set(self, token, user_data):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        exp = token_expiry(token)
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        if expires_at <= time.time():
+            return
+
+        key = hash_token(token)
+        self._entries[key] = (expires_at, user_data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def evict(self, token):
+        self._entries.pop(hash_token(token), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Instancia única compartida por el middleware y las rutas de autenticación
+token_cache = TokenCache()
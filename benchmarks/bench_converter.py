@@ -0,0 +1,127 @@
+"""
+Comparación de las formas de convertir mensajes gRPC a dict para las respuestas JSON.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_converter [filas]
+
+Mide, para un listado de productos y uno de órdenes con ítems, el tiempo de:
+  - dict escrito a mano (como estaban las rutas originalmente)
+  - tabla de getters (nombre → lambda), como el antiguo row_converter
+  - json_format.MessageToDict de protobuf
+  - conversor armado desde el descriptor (app.grpc.converter)
+
+El conversor no supera al dict a mano (un literal de dict es lo más rápido que hay en
+Python): cuesta alrededor de 1,5 veces más por fila. Lo que aporta es no mantener esos
+dicts a mano y evitar el costo de MessageToDict, varias veces más lento.
+"""
+import sys
+import timeit
+from datetime import datetime
+from google.protobuf import json_format
+from app.grpc import products_pb2, orders_pb2
+from app.grpc.converter import converter
+
+PRODUCT_FIELDS = (
+    "id", "name", "category", "price", "imageUrl", "imagePublicId", "isActive", "dateCreated"
+)
+ORDER_ITEM_FIELDS = ("item_id", "product_id", "quantity", "price_at_purchase")
+ORDER_DETAIL_FIELDS = (
+    "id", "user_id", "total_amount", "current_status", "order_date",
+    "delivery_address", "tracking_number", ("items", ORDER_ITEM_FIELDS)
+)
+
+
+def make_products(rows):
+    return [
+        products_pb2.Product(
+            id=f"p-{i}", name=f"Producto {i}", category="general", price=i * 1.5,
+            imageUrl=f"https://img/{i}.png", imagePublicId=f"img-{i}", isActive=True,
+            dateCreated="2025-01-01T00:00:00"
+        )
+        for i in range(rows)
+    ]
+
+
+def make_orders(rows):
+    orders = []
+    for i in range(rows):
+        order = orders_pb2.OrderResponse(
+            id=i, user_id=i % 100, total_amount=i * 2.0, current_status="PENDIENTE",
+            delivery_address="Calle 123", tracking_number=f"T{i}"
+        )
+        order.order_date.FromDatetime(datetime(2025, 1, 1, 12, 30))
+        for j in range(3):
+            order.items.add(item_id=j, product_id=j, quantity=1, price_at_purchase=9.9)
+        orders.append(order)
+    return orders
+
+
+def product_by_hand(p):
+    return {
+        "id": p.id, "name": p.name, "category": p.category, "price": p.price,
+        "imageUrl": p.imageUrl, "imagePublicId": p.imagePublicId,
+        "isActive": p.isActive, "dateCreated": p.dateCreated
+    }
+
+
+def order_by_hand(o):
+    return {
+        "id": o.id, "user_id": o.user_id, "total_amount": o.total_amount,
+        "current_status": o.current_status,
+        "order_date": o.order_date.ToDatetime().isoformat() if o.order_date else None,
+        "delivery_address": o.delivery_address, "tracking_number": o.tracking_number,
+        "items": [
+            {"item_id": i.item_id, "product_id": i.product_id,
+             "quantity": i.quantity, "price_at_purchase": i.price_at_purchase}
+            for i in o.items
+        ]
+    }
+
+
+def getter_table(getters):
+    selected = list(getters.items())
+    return lambda message: {name: get(message) for name, get in selected}
+
+
+product_getters = getter_table({name: (lambda n: lambda m: getattr(m, n))(name) for name in PRODUCT_FIELDS})
+item_getters = getter_table({name: (lambda n: lambda m: getattr(m, n))(name) for name in ORDER_ITEM_FIELDS})
+order_getters = getter_table({
+    "id": lambda o: o.id,
+    "user_id": lambda o: o.user_id,
+    "total_amount": lambda o: o.total_amount,
+    "current_status": lambda o: o.current_status,
+    "order_date": lambda o: o.order_date.ToDatetime().isoformat(),
+    "delivery_address": lambda o: o.delivery_address,
+    "tracking_number": lambda o: o.tracking_number,
+    "items": lambda o: [item_getters(i) for i in o.items],
+})
+
+
+def message_to_dict(message):
+    return json_format.MessageToDict(message, preserving_proto_field_name=True)
+
+
+def bench(label, function, messages, repeat):
+    best = min(timeit.repeat(lambda: [function(m) for m in messages], number=1, repeat=repeat))
+    print(f"  {label:<28} {best * 1000:8.2f} ms  ({best / len(messages) * 1e6:6.2f} µs/fila)")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeat = 5
+    cases = [
+        ("productos", make_products(rows), product_by_hand, product_getters,
+         converter(products_pb2.Product, PRODUCT_FIELDS)),
+        ("órdenes con 3 ítems", make_orders(rows), order_by_hand, order_getters,
+         converter(orders_pb2.OrderResponse, ORDER_DETAIL_FIELDS)),
+    ]
+    for title, messages, by_hand, getters, from_descriptor in cases:
+        print(f"{title} ({rows} filas, mejor de {repeat}):")
+        bench("dict a mano", by_hand, messages, repeat)
+        bench("tabla de getters", getters, messages, repeat)
+        bench("MessageToDict", message_to_dict, messages, repeat)
+        bench("conversor (descriptor)", from_descriptor, messages, repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+
+import grpc
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.grpc import clients_pb2, orders_pb2, products_pb2
+from app.grpc.channel_pool import channel_registry
+from app.middleware.auth_middleware import verify_token
+from app.routes import clients_routes, orders_routes, products_routes
+from app.services import product_loader as product_loader_module
+from app.services import response_cache
+from app.services.response_cache import MemoryCacheStore, NegativeCache, ResponseCache, SqliteCacheStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache_store(request, tmp_path, monkeypatch):
+    """Almacén de la caché de respuestas: las pruebas corren con ambos backends"""
+    # Las cachés creadas en la prueba no reemplazan a las registradas por la aplicación
+    monkeypatch.setattr(response_cache, "_caches", {})
+    if request.param == "memory":
+        store = MemoryCacheStore(max_entries=100, max_bytes=1024 * 1024)
+    else:
+        store = SqliteCacheStore(str(tmp_path / "cache.db"), max_entries=100, max_bytes=1024 * 1024)
+    yield store
+    asyncio.run(store.close())
+
+
+class NotFoundRpcError(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.NOT_FOUND
+
+    def details(self):
+        return "not found"
+
+
+class FakeUpstream:
+    """Base de los microservicios falsos: cuenta las llamadas por método"""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def count(self, method):
+        self.calls[method] += 1
+
+
+class FakeProducts(FakeUpstream):
+    def __init__(self):
+        super().__init__()
+        self.products = {
+            product_id: {"id": product_id, "name": f"Producto {product_id}", "category": "c", "price": 1.5,
+                         "imageUrl": "", "imagePublicId": "", "isActive": True, "dateCreated": "2025-01-01"}
+            for product_id in ("1", "2", "3")
+        }
+
+    async def get_all_products(self):
+        self.count("GetAllProducts")
+        products = [products_pb2.Product(**row) for row in self.products.values()]
+        return products_pb2.ProductListResponse(success=True, count=len(products), products=products)
+
+    async def get_product_by_id(self, product_id):
+        self.count("GetProductById")
+        row = self.products.get(product_id)
+        if row is None:
+            return products_pb2.ProductResponse(success=False, message="Producto no encontrado")
+        return products_pb2.ProductResponse(success=True, product=products_pb2.Product(**row))
+
+    async def get_products_by_ids(self, product_ids):
+        self.count("GetProductsByIds")
+        products = [products_pb2.Product(**self.products[product_id]) for product_id in product_ids if product_id in self.products]
+        return products_pb2.ProductListResponse(success=True, count=len(products), products=products)
+
+    async def create_product(self, data):
+        self.count("CreateProduct")
+        product_id = str(len(self.products) + 1)
+        self.products[product_id] = {**self.products["1"], **data, "id": product_id}
+        return products_pb2.ProductResponse(success=True, message="creado", product=products_pb2.Product(**self.products[product_id]))
+
+    async def update_product(self, product_id, data):
+        self.count("UpdateProduct")
+        self.products[product_id].update(data)
+        return products_pb2.ProductResponse(success=True, message="actualizado", product=products_pb2.Product(**self.products[product_id]))
+
+    async def delete_product(self, product_id):
+        self.count("DeleteProduct")
+        self.products.pop(product_id, None)
+        return products_pb2.DeleteProductResponse(success=True, message="eliminado")
+
+
+class FakeClients(FakeUpstream):
+    def __init__(self):
+        super().__init__()
+        self.clients = {
+            "1": {"id": "1", "firstName": "Ana", "lastName": "Pérez", "email": "ana@x.cl", "username": "ana",
+                  "password": "hash-secreto", "role": "client", "isActive": True}
+        }
+
+    async def get_client_by_id(self, client_id):
+        self.count("GetClientById")
+        row = self.clients.get(client_id)
+        if row is None:
+            raise NotFoundRpcError()
+        return clients_pb2.ClientResponse(**row)
+
+    async def create_client(self, data):
+        self.count("CreateClient")
+        client_id = str(len(self.clients) + 1)
+        self.clients[client_id] = {"id": client_id, "firstName": data["firstName"], "password": data["password"]}
+        return clients_pb2.ClientResponse(**self.clients[client_id], message="creado")
+
+    async def update_client(self, client_id, data):
+        self.count("UpdateClient")
+        self.clients[client_id].update(data)
+        return clients_pb2.ClientResponse(**self.clients[client_id], message="actualizado")
+
+    async def update_password(self, client_id, password):
+        self.count("UpdatePassword")
+        self.clients[client_id]["password"] = password
+        return clients_pb2.MessageResponse(message="contraseña actualizada")
+
+    async def delete_client(self, client_id):
+        self.count("DeleteClient")
+        self.clients[client_id]["isActive"] = False
+        return clients_pb2.MessageResponse(message="eliminado")
+
+
+class FakeOrders(FakeUpstream):
+    orders_pb2 = orders_pb2
+
+    def __init__(self):
+        super().__init__()
+        self.orders = {
+            1: {"id": 1, "user_id": 1, "total_amount": 10.0, "current_status": "PENDIENTE"},
+            2: {"id": 2, "user_id": 1, "total_amount": 20.0, "current_status": "ENTREGADO"},
+        }
+
+    async def get_order_by_id(self, request):
+        self.count("GetOrderById")
+        row = self.orders.get(request.id)
+        if row is None:
+            raise NotFoundRpcError()
+        return orders_pb2.OrderResponse(**row)
+
+    async def update_order_status(self, request):
+        self.count("UpdateOrderStatus")
+        self.orders[request.id]["current_status"] = request.new_status
+        return orders_pb2.OrderResponse(**self.orders[request.id], message="actualizado")
+
+    async def delete_order(self, request):
+        self.count("DeleteOrder")
+        self.orders[request.id]["current_status"] = "CANCELADO"
+        return orders_pb2.MessageResponse(message="cancelado")
+
+
+@pytest.fixture
+def gateway(cache_store, monkeypatch):
+    """
+    Aplicación con las rutas de productos, clientes y pedidos sobre microservicios falsos,
+    sin autenticación y con las cachés de respuestas en cache_store.
+    """
+    products, clients, orders = FakeProducts(), FakeClients(), FakeOrders()
+    monkeypatch.setattr(channel_registry, "products", lambda: products)
+    monkeypatch.setattr(channel_registry, "clients", lambda: clients)
+    monkeypatch.setattr(channel_registry, "orders", lambda: orders)
+
+    products_cache = ResponseCache("products", 30, cache_store, max_stale=300)
+    clients_cache = ResponseCache("clients", 300, cache_store)
+    orders_cache = ResponseCache("orders", 15, cache_store, ttl_for=response_cache.order_ttl)
+    notfound_cache = NegativeCache(10, cache_store)
+    for module in (products_routes, product_loader_module):
+        monkeypatch.setattr(module, "products_cache", products_cache)
+    monkeypatch.setattr(clients_routes, "clients_cache", clients_cache)
+    monkeypatch.setattr(orders_routes, "orders_cache", orders_cache)
+    for module in (products_routes, clients_routes, orders_routes):
+        monkeypatch.setattr(module, "notfound_cache", notfound_cache)
+
+    app = FastAPI()
+    for module in (products_routes, clients_routes, orders_routes):
+        app.include_router(module.router)
+    app.dependency_overrides[verify_token] = lambda: {"sub": "1"}
+    with TestClient(app) as client:
+        yield SimpleNamespace(
+            http=client, products=products, clients=clients, orders=orders,
+            products_cache=products_cache, clients_cache=clients_cache,
+            orders_cache=orders_cache, notfound_cache=notfound_cache,
+        )
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.response_cache import (
+    CachedResponse, CacheStore, MemoryCacheStore, ResponseCache, SqliteCacheStore, create_cache_store,
+)
+
+
+def test_cache_store_is_an_abstract_interface():
+    with pytest.raises(TypeError):
+        CacheStore()
+
+    class Incomplete(CacheStore):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_backend_is_selected_by_name():
+    assert isinstance(create_cache_store("memory"), MemoryCacheStore)
+    assert isinstance(create_cache_store("sqlite"), SqliteCacheStore)
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.db")
+    # Dos instancias del gateway: cada una con su conexión y sus cachés
+    first_store, second_store = SqliteCacheStore(path), SqliteCacheStore(path)
+    first = ResponseCache("products", 60, first_store)
+    second = ResponseCache("products", 60, second_store)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return {"success": True, "count": 0, "products": []}
+
+    async def scenario():
+        await first_store.open()
+        await second_store.open()
+        try:
+            loaded = await first.get_or_load("list", load)
+            shared = await second.get_or_load("list", load)
+            assert shared.body == loaded.body and shared.etag == loaded.etag
+
+            await second.invalidate("list")
+            assert await first.peek("list") is None
+        finally:
+            await first_store.close()
+            await second_store.close()
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+    assert second.hits == 1
+
+
+def test_stats_report_size_and_backend(cache_store):
+    async def scenario():
+        await cache_store.set("products:list", CachedResponse(b"x" * 10, 200, time.time() + 60))
+        return await cache_store.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 10
+    assert stats["backend"] in ("memory", "sqlite")
+
+
+def test_sqlite_prune_drops_entries_past_retention(tmp_path):
+    store = SqliteCacheStore(str(tmp_path / "retention.db"), retention=10)
+
+    async def scenario():
+        await store.set("old", CachedResponse(b"{}", 200, time.time() - 11))
+        await store.set("stale", CachedResponse(b"{}", 200, time.time() - 5))
+        store._run(store._prune)
+        result = await store.get("old"), await store.get("stale")
+        await store.close()
+        return result
+
+    old, stale = asyncio.run(scenario())
+    # Lo vencido dentro de la retención se conserva para stale-while-revalidate
+    assert old is None and stale is not None
@@ -0,0 +1,57 @@
+import asyncio
+
+from app.routes import clients_routes
+
+
+def test_profile_is_cached_without_the_password(gateway, cache_store):
+    http, upstream = gateway.http, gateway.clients
+
+    first = http.get("/api/clients/1").json()
+    second = http.get("/api/clients/1").json()
+    assert first == second
+    assert "password" not in first["client"]
+    assert upstream.calls["GetClientById"] == 1
+
+    stored = asyncio.run(cache_store.get("clients:item:1"))
+    assert b"hash-secreto" not in stored.body and b"password" not in stored.body
+
+
+def test_every_write_invalidates_the_profile(gateway):
+    http, upstream = gateway.http, gateway.clients
+    writes = [
+        lambda: http.patch("/api/clients/1", json={"firstName": "Ana María"}),
+        lambda: http.patch("/api/clients/1/password", json={"password": "nueva-clave"}),
+        lambda: http.delete("/api/clients/1"),
+    ]
+    http.get("/api/clients/1")
+    for index, write in enumerate(writes, start=2):
+        write().raise_for_status()
+        http.get("/api/clients/1")
+        assert upstream.calls["GetClientById"] == index
+
+    profile = http.get("/api/clients/1").json()["client"]
+    assert profile["firstName"] == "Ana María"
+    assert profile["isActive"] is False
+
+
+def test_missing_client_is_remembered_until_one_is_created(gateway):
+    http, upstream = gateway.http, gateway.clients
+    assert http.get("/api/clients/2").status_code == 404
+    assert http.get("/api/clients/2").status_code == 404
+    assert upstream.calls["GetClientById"] == 1
+
+    http.post("/api/clients/", json={
+        "firstName": "Luis", "lastName": "Soto", "email": "luis@x.cl", "username": "luis",
+        "password": "clave-segura-123", "birthDate": "1990-01-01", "address": "Calle 1", "phone": "+56912345678",
+    }).raise_for_status()
+    assert http.get("/api/clients/2").status_code == 200
+
+
+def test_login_warm_up_fills_the_cache(gateway):
+    asyncio.run(clients_routes.warm_client_cache(1))
+    assert gateway.clients.calls["GetClientById"] == 1
+    gateway.http.get("/api/clients/1")
+    assert gateway.clients.calls["GetClientById"] == 1
+
+    # Un ID inexistente no rompe la precarga
+    asyncio.run(clients_routes.warm_client_cache(99))
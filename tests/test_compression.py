@@ -0,0 +1,109 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import compression_middleware
+from app.middleware.compression_middleware import CompressedVariants, CompressionMiddleware, select_encoding
+from app.services.response_cache import CachedResponse
+
+BIG_BODY = b'{"products":[' + b",".join(b'{"id":"%d","name":"Producto"}' % i for i in range(200)) + b"]}"
+CATALOG = CachedResponse(BIG_BODY)
+
+
+@pytest.fixture
+def http(monkeypatch):
+    variants = CompressedVariants(max_bytes=1024 * 1024)
+    monkeypatch.setattr(compression_middleware, "compressed_variants", variants)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/catalog")
+    async def catalog(request: Request):
+        return CATALOG.to_response(request)
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for _ in range(3):
+                yield BIG_BODY + b"\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    with TestClient(app) as client:
+        client.variants = variants
+        yield client
+
+
+def test_encoding_choice_follows_accept_encoding():
+    assert select_encoding(None) is None
+    assert select_encoding("identity") is None
+    assert select_encoding("gzip") == "gzip"
+    assert select_encoding("gzip;q=0") is None
+    assert select_encoding("deflate, *;q=0.5") in compression_middleware.ENCODERS
+    assert select_encoding("*;q=0") is None
+    if "br" in compression_middleware.ENCODERS:
+        assert select_encoding("gzip;q=1, br;q=0.5") == "gzip"
+        assert select_encoding("gzip, br") == "br"
+
+
+def test_large_json_is_compressed_with_a_weak_etag(http):
+    response = http.get("/catalog", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BIG_BODY
+    assert int(response.headers["content-length"]) < len(BIG_BODY)
+    assert response.headers["etag"] == "W/" + CATALOG.etag
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+def test_uncompressed_response_still_varies_on_accept_encoding(http):
+    response = http.get("/catalog", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == BIG_BODY
+    assert response.headers["etag"] == CATALOG.etag
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+def test_small_bodies_are_sent_as_is(http):
+    response = http.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+
+def test_streaming_responses_pass_through(http):
+    with http.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert "content-encoding" not in response.headers
+        assert response.read() == (BIG_BODY + b"\n") * 3
+
+
+def test_compressed_variant_is_reused_and_304_round_trips(http):
+    first = http.get("/catalog", headers={"Accept-Encoding": "gzip"})
+    http.get("/catalog", headers={"Accept-Encoding": "gzip"})
+    assert http.variants.stats()["entries"] == 1
+    assert http.variants.hits == 1
+
+    # El cliente devuelve el ETag débil que recibió: sigue valiendo para la comparación débil
+    revalidated = http.get("/catalog", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
+def test_variant_cache_is_bounded_in_bytes():
+    variants = CompressedVariants(max_bytes=100)
+    variants.set(("a", "gzip"), b"x" * 60)
+    variants.set(("b", "gzip"), b"y" * 60)
+    variants.set(("c", "gzip"), b"z" * 200)
+    assert variants.get(("a", "gzip")) is None
+    assert variants.get(("b", "gzip")) == b"y" * 60
+    assert variants.get(("c", "gzip")) is None
+    assert variants.stats()["bytes"] == 60
+
+
+def test_gzip_output_is_deterministic():
+    assert compression_middleware._gzip(BIG_BODY) == compression_middleware._gzip(BIG_BODY)
+    assert gzip.decompress(compression_middleware._gzip(BIG_BODY)) == BIG_BODY
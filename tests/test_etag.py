@@ -0,0 +1,72 @@
+from app.services.response_cache import CachedResponse, compute_etag, etag_matches, json_response
+
+
+class FakeRequest:
+    def __init__(self, if_none_match=None):
+        self.headers = {"if-none-match": if_none_match} if if_none_match else {}
+
+
+def test_etag_is_strong_and_depends_only_on_the_body():
+    body = b'{"success":true}'
+    assert compute_etag(body) == compute_etag(bytes(body))
+    assert compute_etag(body) != compute_etag(b'{"success":false}')
+    assert compute_etag(body).startswith('"') and compute_etag(body).endswith('"')
+
+
+def test_if_none_match_comparison():
+    etag = compute_etag(b"{}")
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag, f'"otro", W/{etag}')
+    assert etag_matches(etag, "*")
+    assert not etag_matches(etag, '"otro"')
+    assert not etag_matches(etag, None)
+
+
+def test_matching_if_none_match_gets_304_without_body():
+    entry = CachedResponse(b'{"id":1}')
+    response = entry.to_response(FakeRequest(entry.etag))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == entry.etag
+
+    response = entry.to_response(FakeRequest('"otro"'))
+    assert response.status_code == 200
+    assert response.body == b'{"id":1}'
+
+
+def test_errors_do_not_get_an_etag():
+    entry = CachedResponse(b'{"detail":"no encontrado"}', status_code=404)
+    response = entry.to_response(FakeRequest(entry.etag))
+    assert response.status_code == 404
+    assert "etag" not in response.headers
+
+
+def test_json_response_has_the_same_etag_as_the_cached_body():
+    response = json_response({"id": 1})
+    assert response.headers["etag"] == compute_etag(response.body)
+
+
+def test_catalog_and_entities_answer_304_when_unchanged(gateway):
+    http = gateway.http
+    for url in ("/api/products/", "/api/products/1", "/api/clients/1", "/api/orders/1"):
+        first = http.get(url)
+        etag = first.headers["etag"]
+        again = http.get(url, headers={"If-None-Match": etag})
+        assert again.status_code == 304, url
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+    # Tras un cambio, el ETag anterior ya no coincide
+    etag = http.get("/api/products/1").headers["etag"]
+    http.patch("/api/products/1", json={"name": "Otro", "category": "c", "price": 2.0}).raise_for_status()
+    changed = http.get("/api/products/1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_etag_survives_the_store_round_trip(gateway):
+    http = gateway.http
+    etag = http.get("/api/products/").headers["etag"]
+    # Segunda lectura: la entrada sale del almacén (en SQLite, deserializada)
+    assert http.get("/api/products/").headers["etag"] == etag
+    assert gateway.products.calls["GetAllProducts"] == 1
@@ -0,0 +1,57 @@
+import json
+import math
+import random
+import struct
+
+import pytest
+
+from app.services import fast_json
+from app.services.fast_json import encode_json
+
+
+def stdlib_json(payload):
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def sample_floats(count=20000):
+    rng = random.Random(1)
+    values = [0.0, -0.0, 1e-4, -1e-4, 1e16, -1e16, 9999999999999998.0, 0.00009999999999999999, 5e-324, 1.7e308]
+    for _ in range(count):
+        # Mitad con bits aleatorios (exponentes extremos), mitad en magnitudes habituales
+        values.append(struct.unpack("<d", rng.getrandbits(64).to_bytes(8, "little"))[0])
+        values.append(rng.uniform(-1, 1) * 10 ** rng.uniform(-8, 20))
+    return [value for value in values if math.isfinite(value)]
+
+
+def test_floats_are_encoded_like_stdlib():
+    values = sample_floats()
+    assert encode_json(values) == stdlib_json(values)
+    for value in values[:2000]:
+        assert encode_json({"value": value}) == stdlib_json({"value": value})
+
+
+def test_realistic_ids_do_not_force_the_stdlib_path(monkeypatch):
+    pytest.importorskip("orjson")
+    calls = []
+    stdlib_encode = fast_json._stdlib_encode
+    monkeypatch.setattr(fast_json, "_stdlib_encode", lambda payload: calls.append(1) or stdlib_encode(payload))
+    payload = {
+        "success": True,
+        "products": [
+            {
+                "id": "65f1e2d3c4b5a6978e1e0f21",
+                "clientId": "3f2504e0-4f89-11d3-9a0c-0305e82c3301",
+                "dateCreated": "2025-01-01T12:30:00.0000000Z",
+                "price": 1990.5,
+                "stock": 0.0,
+            }
+        ],
+    }
+    assert encode_json(payload) == stdlib_json(payload)
+    assert calls == []
+
+
+def test_exponent_float_falls_back_to_stdlib_format():
+    payload = {"nested": [{"big": 1e16}], "small": 0.00001}
+    assert encode_json(payload) == b'{"nested":[{"big":1e+16}],"small":1e-05}'
+    assert encode_json(1e-05) == b"1e-05"
@@ -0,0 +1,42 @@
+import pytest
+from fastapi import HTTPException
+
+from datetime import datetime
+
+from app.grpc import orders_pb2, products_pb2
+from app.grpc.converter import converter
+from app.grpc.fields import parse_fields
+
+PRODUCT_FIELDS = ("id", "name", "price", "isActive")
+
+
+def test_selection_follows_exposed_order_regardless_of_request_order():
+    descriptor = products_pb2.Product.DESCRIPTOR
+    first = parse_fields("price,id", descriptor, PRODUCT_FIELDS)
+    second = parse_fields(" id , price,id", descriptor, PRODUCT_FIELDS)
+    assert first == second == ("id", "price")
+    message = products_pb2.Product(id="7", name="x", price=2.5)
+    assert list(converter(products_pb2.Product, first)(message)) == ["id", "price"]
+
+
+def test_unexposed_or_empty_selection_is_rejected():
+    descriptor = products_pb2.Product.DESCRIPTOR
+    with pytest.raises(HTTPException):
+        parse_fields("id,category", descriptor, PRODUCT_FIELDS)
+    with pytest.raises(HTTPException):
+        parse_fields(" , ", descriptor, PRODUCT_FIELDS)
+
+
+def test_converter_handles_timestamps_nested_and_repeated_fields():
+    order = orders_pb2.OrderResponse(id=1, tracking_number="T1")
+    order.order_date.FromDatetime(datetime(2025, 1, 1, 12, 30))
+    order.items.add(item_id=1, product_id=7, quantity=2, price_at_purchase=9.9)
+
+    fields = ("id", "order_date", ("items", ("product_id", "quantity")))
+    assert converter(orders_pb2.OrderResponse, fields)(order) == {
+        "id": 1,
+        "order_date": "2025-01-01T12:30:00",
+        "items": [{"product_id": 7, "quantity": 2}],
+    }
+    # Con un solo campo attrgetter no devuelve una tupla
+    assert converter(orders_pb2.OrderResponse, ("tracking_number",))(order) == {"tracking_number": "T1"}
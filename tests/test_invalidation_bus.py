@@ -0,0 +1,83 @@
+import asyncio
+
+from app.services import response_cache
+from app.services.invalidation_bus import InvalidationBus
+from app.services.response_cache import ResponseCache
+
+
+def make_pair():
+    """Dos buses en puertos libres de loopback, cada uno con el otro como vecino"""
+    return InvalidationBus(True, "127.0.0.1:0"), InvalidationBus(True, "127.0.0.1:0")
+
+
+async def connect(first, second):
+    await first.start()
+    await second.start()
+    first.peers = [second._transport.get_extra_info("sockname")]
+    second.peers = [first._transport.get_extra_info("sockname")]
+
+
+async def wait_for(condition, timeout=1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.005)
+
+
+def test_published_keys_reach_the_other_instance():
+    first, second = make_pair()
+    received = []
+
+    async def handler(keys, prefixes):
+        received.append((keys, prefixes))
+
+    first.subscribe(handler)
+    second.subscribe(handler)
+
+    async def scenario():
+        await connect(first, second)
+        try:
+            first.publish(["products:list", "products:item:1"], prefixes=["notfound:products:"])
+            await wait_for(lambda: received)
+            await asyncio.sleep(0.02)
+        finally:
+            await first.stop()
+            await second.stop()
+
+    asyncio.run(scenario())
+    # Solo la otra instancia aplica la invalidación (la propia ya la aplicó localmente)
+    assert received == [(["products:list", "products:item:1"], ["notfound:products:"])]
+    assert (first.published, second.received) == (1, 1)
+
+
+def test_malformed_messages_are_counted_and_ignored():
+    bus = InvalidationBus(True, "127.0.0.1:0")
+    for data in (b"no es json", b'{"keys": []}', b'["lista"]'):
+        bus._on_message(data)
+    assert bus.errors == 3 and bus.received == 0
+
+
+def test_remote_invalidation_evicts_registered_caches(cache_store):
+    products = ResponseCache("products", 60, cache_store)
+    notfound = ResponseCache("notfound", 60, cache_store)
+
+    async def scenario():
+        await products.set("list", {"products": []})
+        await products.set("item:1", {"id": "1"})
+        await notfound.set("products:item:9", {"detail": "no encontrado"})
+        await response_cache._apply_remote_invalidation(["products:list", "desconocida:x"], ["notfound:products:"])
+        return [await cache.peek(key) for cache, key in ((products, "list"), (products, "item:1"), (notfound, "products:item:9"))]
+
+    listing, item, missing = asyncio.run(scenario())
+    assert listing is None and missing is None
+    assert item is not None
+    # La escritura remota también descarta las cargas en curso de esta instancia
+    assert products._epoch == 1
+
+
+def test_product_update_publishes_list_and_item(gateway, monkeypatch):
+    published = []
+    monkeypatch.setattr(response_cache.invalidation_bus, "publish", lambda keys=(), prefixes=(): published.append((list(keys), list(prefixes))))
+
+    gateway.http.patch("/api/products/1", json={"name": "Otro", "category": "c", "price": 2.0}).raise_for_status()
+    assert published == [(["products:list", "products:item:1"], [])]
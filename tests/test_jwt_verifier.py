@@ -0,0 +1,185 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.middleware import auth_middleware
+from app.services import jwt_verifier as verifier_module
+from app.services.jwt_verifier import JwtVerifier, TokenRejected
+from app.services.revocation import RevocationList
+from app.services.token_cache import TokenCache
+
+pytest.importorskip("cryptography")
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import padding, rsa  # noqa: E402
+
+SECRET = b"secreto-compartido"
+RSA_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def b64(data):
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def b64int(value):
+    return b64(value.to_bytes((value.bit_length() + 7) // 8, "big"))
+
+
+def sign(header, claims, signer):
+    signing_input = f"{b64(json.dumps(header).encode())}.{b64(json.dumps(claims).encode())}"
+    return f"{signing_input}.{b64(signer(signing_input.encode()))}"
+
+
+def hs_token(claims, key=SECRET, kid=None):
+    header = {"alg": "HS256", "typ": "JWT"}
+    if kid is not None:
+        header["kid"] = kid
+    return sign(header, claims, lambda data: hmac.new(key, data, hashlib.sha256).digest())
+
+
+def rs_token(claims, kid="rsa-1", private_key=RSA_KEY):
+    header = {"alg": "RS256", "typ": "JWT", "kid": kid}
+    return sign(header, claims, lambda data: private_key.sign(data, padding.PKCS1v15(), hashes.SHA256()))
+
+
+def rsa_jwk(kid="rsa-1", private_key=RSA_KEY):
+    numbers = private_key.public_key().public_numbers()
+    return {"kty": "RSA", "kid": kid, "n": b64int(numbers.n), "e": b64int(numbers.e)}
+
+
+def claims(**extra):
+    return {"sub": "42", "role": "admin", "exp": time.time() + 3600, **extra}
+
+
+def make_verifier(monkeypatch, jwks=None, secret=SECRET):
+    """Verificador con el JWKS servido por un Auth Service falso"""
+    requests = []
+
+    async def get_jwks(url=None):
+        requests.append(url)
+        return {"keys": jwks or []}
+
+    monkeypatch.setattr(verifier_module.auth_service, "get_jwks", get_jwks)
+    verifier = JwtVerifier(enabled=True, secret=secret.decode() if secret else "", jwks_url="http://auth/jwks")
+    asyncio.run(verifier.refresh_keys())
+    return verifier, requests
+
+
+def test_valid_hs_token_is_verified_locally(monkeypatch):
+    verifier, _ = make_verifier(monkeypatch)
+    assert verifier.verify(hs_token(claims()))["sub"] == "42"
+    assert verifier.verified == 1
+
+
+def test_valid_rs_token_is_verified_with_the_jwks_key(monkeypatch):
+    verifier, _ = make_verifier(monkeypatch, jwks=[rsa_jwk()], secret=None)
+    assert verifier.verify(rs_token(claims()))["role"] == "admin"
+
+
+def test_hs_token_signed_with_the_rsa_public_key_is_not_accepted(monkeypatch):
+    # Confusión de algoritmos: la clave pública (conocida por todos) usada como secreto HMAC
+    verifier, _ = make_verifier(monkeypatch, jwks=[rsa_jwk()], secret=None)
+    public_pem = RSA_KEY.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    modulus = RSA_KEY.public_key().public_numbers().n.to_bytes(256, "big")
+    for key in (public_pem, modulus):
+        assert verifier.verify(hs_token(claims(role="admin"), key=key, kid="rsa-1")) is None
+        assert verifier.verify(hs_token(claims(role="admin"), key=key)) is None
+    assert verifier.verified == 0
+
+
+def test_rs_token_with_tampered_claims_is_not_accepted(monkeypatch):
+    verifier, _ = make_verifier(monkeypatch, jwks=[rsa_jwk()], secret=None)
+    header, _, signature = rs_token(claims(role="client")).split(".")
+    forged = f"{header}.{b64(json.dumps(claims(role='admin')).encode())}.{signature}"
+    assert verifier.verify(forged) is None
+
+
+def test_unknown_kid_falls_back_and_reloads_the_jwks(monkeypatch):
+    verifier, requests = make_verifier(monkeypatch, jwks=[rsa_jwk()], secret=None)
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    monkeypatch.setattr(verifier_module, "JWKS_MIN_RELOAD_INTERVAL", 0)
+
+    async def scenario():
+        assert verifier.verify(rs_token(claims(), kid="rsa-2", private_key=other_key)) is None
+        await verifier._reload_task
+
+    asyncio.run(scenario())
+    assert len(requests) == 2
+    assert verifier.fallbacks == 1
+
+
+def test_expired_or_not_yet_valid_token_is_rejected(monkeypatch):
+    verifier, _ = make_verifier(monkeypatch)
+    with pytest.raises(TokenRejected):
+        verifier.verify(hs_token(claims(exp=time.time() - 1)))
+    with pytest.raises(TokenRejected):
+        verifier.verify(hs_token(claims(nbf=time.time() + 60)))
+    assert verifier.rejected == 2
+
+
+def test_token_with_another_secret_is_left_to_the_auth_service(monkeypatch):
+    verifier, _ = make_verifier(monkeypatch)
+    assert verifier.verify(hs_token(claims(), key=b"otro-secreto")) is None
+    assert verifier.fallbacks == 1
+
+
+@pytest.fixture
+def middleware(monkeypatch):
+    """verify_token con verificación local, sin caché previa y con un Auth Service falso"""
+    verifier, _ = make_verifier(monkeypatch)
+    revocations = RevocationList("memory")
+    validations = []
+
+    async def validate_token(token):
+        validations.append(token)
+        return {"sub": "desde-auth-service"}
+
+    monkeypatch.setattr(auth_middleware, "jwt_verifier", verifier)
+    monkeypatch.setattr(auth_middleware, "revocation_list", revocations)
+    monkeypatch.setattr(auth_middleware, "token_cache", TokenCache(ttl=60, max_size=10))
+    monkeypatch.setattr(auth_middleware.auth_service, "validate_token", validate_token)
+    return revocations, validations
+
+
+def test_locally_verified_token_skips_the_auth_service(middleware):
+    _, validations = middleware
+    token = hs_token(claims())
+    assert asyncio.run(auth_middleware.verify_token(f"Bearer {token}"))["sub"] == "42"
+    assert validations == []
+
+
+def test_revoked_token_is_rejected_even_with_a_valid_signature(middleware):
+    revocations, validations = middleware
+    token = hs_token(claims(jti="sesion-1"))
+
+    async def scenario():
+        await revocations.revoke(token)
+        with pytest.raises(HTTPException) as error:
+            await auth_middleware.verify_token(f"Bearer {token}")
+        return error.value.status_code
+
+    assert asyncio.run(scenario()) == 401
+    assert validations == []
+
+
+def test_unverifiable_token_falls_back_to_the_auth_service(middleware):
+    _, validations = middleware
+    token = hs_token(claims(), key=b"otro-secreto")
+    assert asyncio.run(auth_middleware.verify_token(f"Bearer {token}")) == {"sub": "desde-auth-service"}
+    assert validations == [token]
+
+
+def test_expired_token_is_rejected_without_asking_the_auth_service(middleware):
+    _, validations = middleware
+    token = hs_token(claims(exp=time.time() - 1))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(auth_middleware.verify_token(f"Bearer {token}"))
+    assert error.value.status_code == 401
+    assert validations == []
@@ -0,0 +1,103 @@
+import asyncio
+
+import grpc
+import pytest
+from fastapi import HTTPException
+
+from app.grpc import products_pb2
+from app.routes import products_routes
+from app.services.response_cache import NegativeCache, NotFoundError, ResponseCache
+
+
+def make_caches(store):
+    return ResponseCache("products", 60, store), NegativeCache(10, store)
+
+
+def test_positive_hit_does_not_touch_the_negative_cache(cache_store):
+    products, notfound = make_caches(cache_store)
+
+    async def load():
+        return {"product": {"id": "1"}}
+
+    async def scenario():
+        await notfound.get_or_load(products, "item:1", load)
+        for _ in range(3):
+            entry = await notfound.get_or_load(products, "item:1", load)
+            assert entry.payload() == {"product": {"id": "1"}}
+
+    asyncio.run(scenario())
+    assert products.hits == 3
+    # Solo el primer fallo de la caché positiva consultó la negativa
+    assert notfound.cache.misses == 1
+    assert notfound.cache.hits == 0
+
+
+def test_not_found_is_remembered_until_cleared(cache_store):
+    products, notfound = make_caches(cache_store)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        raise NotFoundError("Producto no encontrado")
+
+    async def scenario():
+        for _ in range(3):
+            entry = await notfound.get_or_load(products, "item:9", load)
+            assert entry.status_code == 404
+            assert entry.payload() == {"detail": "Producto no encontrado"}
+        await notfound.clear("products")
+        await notfound.get_or_load(products, "item:9", load)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert notfound.cache.hits == 2
+
+
+def test_other_errors_are_not_cached(cache_store):
+    products, notfound = make_caches(cache_store)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        raise HTTPException(status_code=500, detail="microservicio caído")
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await notfound.get_or_load(products, "item:9", load)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+
+class UnavailableError(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self):
+        return "connection refused"
+
+
+def fetch_with(monkeypatch, load):
+    monkeypatch.setattr(products_routes.product_loader, "load", load)
+    return asyncio.run(products_routes._fetch_product("9"))
+
+
+def test_fetch_product_only_reports_real_not_found(monkeypatch):
+    async def not_found(product_id):
+        return products_pb2.ProductResponse(success=False, message="Producto no encontrado")
+
+    async def failed(product_id):
+        return products_pb2.ProductResponse(success=False, message="Error al consultar la base de datos")
+
+    async def unavailable(product_id):
+        raise UnavailableError()
+
+    with pytest.raises(NotFoundError):
+        fetch_with(monkeypatch, not_found)
+    with pytest.raises(HTTPException) as error:
+        fetch_with(monkeypatch, failed)
+    assert not isinstance(error.value, NotFoundError)
+    with pytest.raises(HTTPException) as error:
+        fetch_with(monkeypatch, unavailable)
+    assert error.value.status_code == 500
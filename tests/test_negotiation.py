@@ -0,0 +1,57 @@
+import pytest
+from starlette.requests import Request
+
+from app.services.protobuf_content import PROTOBUF_MEDIA_TYPE
+from app.services.streaming import NDJSON_MEDIA_TYPE, negotiate
+
+
+def request_with(accept):
+    headers = [(b"accept", accept.encode())] if accept is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, "application/json"),
+    ("*/*", "application/json"),
+    ("text/html", "application/json"),
+    ("application/x-protobuf", PROTOBUF_MEDIA_TYPE),
+    ("application/json, application/x-protobuf;q=0.1", "application/json"),
+    ("application/x-protobuf;q=0.1, */*;q=0.5", "application/json"),
+    ("application/x-protobuf, */*;q=0.1", PROTOBUF_MEDIA_TYPE),
+    ("application/x-protobuf, application/json", PROTOBUF_MEDIA_TYPE),
+    ("application/json, application/x-protobuf", "application/json"),
+    ("application/*;q=0.5, application/x-ndjson", NDJSON_MEDIA_TYPE),
+    ("application/x-ndjson;q=0", "application/json"),
+    ("application/x-ndjson;q=0.8, application/x-protobuf;q=0.9", PROTOBUF_MEDIA_TYPE),
+])
+def test_negotiation_picks_the_highest_q_type(accept, expected):
+    assert negotiate(request_with(accept)) == expected
+
+
+def test_json_preferred_over_protobuf_is_served_as_json(gateway):
+    response = gateway.http.get("/api/products/", headers={"Accept": "application/json, application/x-protobuf;q=0.1"})
+    assert response.headers["content-type"].startswith("application/json")
+    assert response.json()["count"] == 3
+
+
+def test_every_negotiated_response_varies_on_accept(gateway):
+    listing = gateway.http.get("/api/products/")
+    assert listing.headers["vary"] == "Accept"
+
+    not_modified = gateway.http.get("/api/products/", headers={"If-None-Match": listing.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["vary"] == "Accept"
+
+    projected = gateway.http.get("/api/products/1", params={"fields": "id,name"})
+    assert projected.headers["vary"] == "Accept"
+
+    missing = gateway.http.get("/api/products/99")
+    assert missing.status_code == 404
+    assert missing.headers["vary"] == "Accept"
+
+    ndjson = gateway.http.get("/api/products/", headers={"Accept": NDJSON_MEDIA_TYPE})
+    assert ndjson.headers["content-type"].startswith(NDJSON_MEDIA_TYPE)
+    assert ndjson.headers["vary"] == "Accept"
+
+    protobuf = gateway.http.get("/api/products/", headers={"Accept": PROTOBUF_MEDIA_TYPE})
+    assert protobuf.headers["vary"] == "Accept"
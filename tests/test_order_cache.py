@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from app.services import response_cache
+from app.services.response_cache import order_ttl
+
+
+def test_ttl_depends_on_the_order_status():
+    assert order_ttl({"order": {"current_status": "ENTREGADO"}}) == response_cache.ORDER_CACHE_TERMINAL_TTL
+    assert order_ttl({"order": {"current_status": "cancelled"}}) == response_cache.ORDER_CACHE_TERMINAL_TTL
+    assert order_ttl({"order": {"current_status": "PENDIENTE"}}) == response_cache.ORDER_CACHE_ACTIVE_TTL
+    assert order_ttl({"detail": "sin pedido"}) == response_cache.ORDER_CACHE_ACTIVE_TTL
+
+
+def expires_in(cache_store, key):
+    return asyncio.run(cache_store.get(key)).expires_at - time.time()
+
+
+def test_terminal_orders_are_cached_longer(gateway, cache_store):
+    http = gateway.http
+    http.get("/api/orders/1")
+    http.get("/api/orders/2")
+    assert expires_in(cache_store, "orders:item:1") <= response_cache.ORDER_CACHE_ACTIVE_TTL
+    assert expires_in(cache_store, "orders:item:2") > response_cache.ORDER_CACHE_ACTIVE_TTL
+
+    http.get("/api/orders/2")
+    assert gateway.orders.calls["GetOrderById"] == 2
+
+
+def test_status_update_and_delete_invalidate_the_order(gateway, cache_store):
+    http, upstream = gateway.http, gateway.orders
+    assert http.get("/api/orders/1").json()["order"]["current_status"] == "PENDIENTE"
+
+    http.patch("/api/orders/1/status", json={"new_status": "ENTREGADO"}).raise_for_status()
+    assert http.get("/api/orders/1").json()["order"]["current_status"] == "ENTREGADO"
+    assert upstream.calls["GetOrderById"] == 2
+    # Ahora en estado terminal: se guarda con el TTL largo
+    assert expires_in(cache_store, "orders:item:1") > response_cache.ORDER_CACHE_ACTIVE_TTL
+
+    http.request("DELETE", "/api/orders/1", json={"cancellation_reason": "prueba"}).raise_for_status()
+    assert http.get("/api/orders/1").json()["order"]["current_status"] == "CANCELADO"
+    assert upstream.calls["GetOrderById"] == 3
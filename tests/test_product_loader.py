@@ -0,0 +1,146 @@
+import asyncio
+from collections import Counter
+
+import grpc
+
+from app.grpc import products_pb2
+from app.grpc.channel_pool import channel_registry
+from app.services import product_loader as loader_module
+from app.services.product_loader import ProductLoader
+from app.services.response_cache import CachedResponse
+from app.services.fast_json import encode_json
+
+
+class CatalogCache:
+    """Sustituto de products_cache con un catálogo fijo (o sin catálogo)"""
+
+    def __init__(self, products=None):
+        self.entry = None
+        if products is not None:
+            self.entry = CachedResponse(encode_json({"success": True, "products": products}))
+
+    async def peek(self, key, stale=False):
+        return self.entry
+
+
+def product_row(product_id):
+    return {
+        "id": product_id, "name": f"Producto {product_id}", "category": "c", "price": 1.0,
+        "imageUrl": "", "imagePublicId": "", "isActive": True, "dateCreated": "2025-01-01",
+    }
+
+
+class UnimplementedError(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNIMPLEMENTED
+
+
+class Products:
+    """Microservicio de productos falso; con batch_rpc=False no implementa GetProductsByIds
+    y su catálogo omite los productos inactivos"""
+
+    def __init__(self, batch_rpc=True):
+        self.batch_rpc = batch_rpc
+        self.calls = Counter()
+        self.products = {product_id: product_row(product_id) for product_id in ("1", "2", "3")}
+
+    async def get_products_by_ids(self, product_ids):
+        self.calls["GetProductsByIds"] += 1
+        if not self.batch_rpc:
+            raise UnimplementedError()
+        products = [products_pb2.Product(**self.products[product_id]) for product_id in product_ids if product_id in self.products]
+        return products_pb2.ProductListResponse(success=True, count=len(products), products=products)
+
+    async def get_all_products(self):
+        self.calls["GetAllProducts"] += 1
+        products = [products_pb2.Product(**row) for row in self.products.values() if row["isActive"]]
+        return products_pb2.ProductListResponse(success=True, count=len(products), products=products)
+
+    async def get_product_by_id(self, product_id):
+        self.calls["GetProductById"] += 1
+        row = self.products.get(product_id)
+        if row is None:
+            return products_pb2.ProductResponse(success=False, message="Producto no encontrado")
+        return products_pb2.ProductResponse(success=True, product=products_pb2.Product(**row))
+
+
+def make_loader(monkeypatch, catalog=None, upstream=None, **options):
+    upstream = upstream or Products()
+    monkeypatch.setattr(channel_registry, "products", lambda: upstream)
+    monkeypatch.setattr(loader_module, "products_cache", CatalogCache(catalog))
+    return ProductLoader(window_ms=1, max_size=100, **options), upstream
+
+
+def load_all(loader, product_ids):
+    async def scenario():
+        return await asyncio.gather(*(loader.load(product_id) for product_id in product_ids))
+    return asyncio.run(scenario())
+
+
+def test_batch_is_resolved_with_one_get_products_by_ids_call(monkeypatch):
+    loader, upstream = make_loader(monkeypatch)
+    responses = load_all(loader, ["1", "2", "2", "3", "9"])
+
+    assert [response.product.id for response in responses[:4]] == ["1", "2", "2", "3"]
+    # Los IDs que GetProductsByIds omite son inexistentes
+    assert not responses[4].success and responses[4].message == "Producto no encontrado"
+    assert upstream.calls == {"GetProductsByIds": 1}
+    assert loader.batches == 1
+
+
+def test_batch_uses_fresh_cached_catalog(monkeypatch):
+    loader, upstream = make_loader(monkeypatch, catalog=[product_row("1"), product_row("2")])
+    responses = load_all(loader, ["1", "2", "3"])
+
+    assert responses[0].product.name == "Producto 1"
+    assert responses[2].product.id == "3"
+    # Solo el ID que no está en el catálogo va al microservicio
+    assert loader.catalog_hits == 2
+    assert upstream.calls == {"GetProductsByIds": 1}
+
+
+def test_unimplemented_batch_rpc_falls_back_to_one_catalog_call(monkeypatch):
+    upstream = Products(batch_rpc=False)
+    upstream.products["3"]["isActive"] = False
+    loader, _ = make_loader(monkeypatch, upstream=upstream)
+
+    responses = load_all(loader, ["1", "2", "3", "9"])
+    assert [response.success for response in responses] == [True, True, True, False]
+    # Los IDs ausentes del catálogo (inactivos o inexistentes) se confirman con GetProductById
+    assert upstream.calls == {"GetProductsByIds": 1, "GetAllProducts": 1, "GetProductById": 2}
+
+    # El UNIMPLEMENTED se recuerda: el siguiente lote va directo a GetAllProducts
+    load_all(loader, ["1", "2"])
+    assert upstream.calls["GetProductsByIds"] == 1
+    assert upstream.calls["GetAllProducts"] == 2
+
+
+def test_without_a_batch_call_the_window_is_skipped(monkeypatch):
+    loader, upstream = make_loader(monkeypatch, upstream=Products(batch_rpc=False), catalog_fallback=False)
+    load_all(loader, ["1"])
+    assert not loader.batching
+
+    batches = loader.batches
+    responses = load_all(loader, ["1", "2"])
+    assert [response.product.id for response in responses] == ["1", "2"]
+    # Sin forma de agrupar, cada consulta va directo a GetProductById, sin formar lotes
+    assert loader.batches == batches
+    assert upstream.calls["GetProductById"] == 3
+
+
+def test_unexpected_error_fails_the_whole_batch_instead_of_hanging(monkeypatch):
+    loader, _ = make_loader(monkeypatch)
+
+    async def broken_catalog(batch):
+        raise ValueError("catálogo corrupto")
+
+    loader._resolve_from_catalog = broken_catalog
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(*(loader.load(product_id) for product_id in ["1", "2"]), return_exceptions=True),
+            timeout=1,
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
@@ -0,0 +1,168 @@
+import asyncio
+import time
+
+from app.services.response_cache import CachedResponse, MemoryCacheStore, ResponseCache, SqliteCacheStore
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def counting_loader(payload):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return payload
+
+    return load, calls
+
+
+def test_get_or_load_serves_from_cache_until_expired(cache_store):
+    cache = ResponseCache("products", 60, cache_store)
+    load, calls = counting_loader({"success": True, "products": []})
+
+    async def scenario():
+        first = await cache.get_or_load("list", load)
+        second = await cache.get_or_load("list", load)
+        assert first.body == second.body
+        # Se vence la entrada: la siguiente petición vuelve al microservicio
+        expired = CachedResponse(first.body, 200, time.time() - 1)
+        await cache_store.set(cache._key("list"), expired)
+        await cache.get_or_load("list", load)
+
+    run(scenario())
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_invalidate_drops_the_entry(cache_store):
+    cache = ResponseCache("products", 60, cache_store)
+    load, calls = counting_loader({"success": True})
+
+    async def scenario():
+        await cache.get_or_load("item:1", load)
+        await cache.invalidate("item:1")
+        assert await cache.peek("item:1") is None
+        await cache.get_or_load("item:1", load)
+
+    run(scenario())
+    assert len(calls) == 2
+    assert cache.invalidations == 1
+
+
+def test_load_started_before_an_invalidation_is_not_stored(cache_store):
+    cache = ResponseCache("products", 60, cache_store)
+
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_load():
+            started.set()
+            await release.wait()
+            return {"product": {"name": "antes de la escritura"}}
+
+        load = asyncio.ensure_future(cache.get_or_load("item:1", slow_load))
+        await started.wait()
+        await cache.invalidate("item:1")
+        release.set()
+        entry = await load
+        # La respuesta se entrega, pero no se guarda sobre la escritura
+        assert entry.payload()["product"]["name"] == "antes de la escritura"
+        assert await cache.peek("item:1") is None
+
+    run(scenario())
+
+
+def test_errors_are_not_cached(cache_store):
+    cache = ResponseCache("products", 60, cache_store)
+    calls = []
+
+    async def failing_load():
+        calls.append(1)
+        raise RuntimeError("microservicio caído")
+
+    async def scenario():
+        for _ in range(2):
+            try:
+                await cache.get_or_load("list", failing_load)
+            except RuntimeError:
+                pass
+
+    run(scenario())
+    assert len(calls) == 2
+
+
+def test_invalidate_prefix_only_drops_matching_keys(cache_store):
+    cache = ResponseCache("products", 60, cache_store)
+    other = ResponseCache("clients", 60, cache_store)
+
+    async def scenario():
+        await cache.set("item:1", {"id": 1})
+        await cache.set("item:2", {"id": 2})
+        await cache.set("list", {"products": []})
+        await other.set("item:1", {"id": "cliente"})
+        await cache.invalidate_prefix("item:")
+        return [await cache.peek(key) for key in ("item:1", "item:2", "list")] + [await other.peek("item:1")]
+
+    item1, item2, listing, client = run(scenario())
+    assert item1 is None and item2 is None
+    assert listing is not None and client is not None
+
+
+def test_store_bounds_evict_the_oldest_entries(tmp_path):
+    body = b"x" * 100
+
+    async def fill(store):
+        # 64 escrituras: múltiplo de PRUNE_EVERY, así SQLite revisa los límites al final
+        for index in range(SqliteCacheStore.PRUNE_EVERY * 2):
+            await store.set(f"products:item:{index}", CachedResponse(body, 200, time.time() + 60))
+        stats = await store.stats()
+        newest = await store.get(f"products:item:{SqliteCacheStore.PRUNE_EVERY * 2 - 1}")
+        oldest = await store.get("products:item:0")
+        await store.close()
+        return stats, newest, oldest
+
+    for store in (MemoryCacheStore(max_entries=5), SqliteCacheStore(str(tmp_path / "bounds.db"), max_entries=5)):
+        stats, newest, oldest = run(fill(store))
+        assert stats["entries"] <= 5
+        assert stats["evictions"] > 0
+        assert newest is not None and oldest is None
+
+    # Límite en bytes (y una entrada más grande que el límite no se guarda)
+    memory = MemoryCacheStore(max_entries=100, max_bytes=250)
+
+    async def fill_bytes():
+        for index in range(5):
+            await memory.set(f"k{index}", CachedResponse(body))
+        await memory.set("big", CachedResponse(b"x" * 300))
+        return await memory.stats(), await memory.get("big")
+
+    stats, big = run(fill_bytes())
+    assert stats["bytes"] <= 250 and stats["entries"] == 2
+    assert big is None
+
+
+def test_product_writes_keep_the_catalog_consistent(gateway):
+    http, upstream = gateway.http, gateway.products
+
+    assert http.get("/api/products/").json()["count"] == 3
+    assert http.get("/api/products/").json()["count"] == 3
+    assert upstream.calls["GetAllProducts"] == 1
+
+    # Actualizar: el detalle queda en caché con la nueva versión y el listado se invalida
+    http.get("/api/products/1")
+    http.patch("/api/products/1", json={"name": "Nuevo nombre", "category": "c", "price": 2.0})
+    calls = upstream.calls["GetProductById"]
+    assert http.get("/api/products/1").json()["product"]["name"] == "Nuevo nombre"
+    assert upstream.calls["GetProductById"] == calls
+    assert http.get("/api/products/").json()["products"][0]["name"] == "Nuevo nombre"
+    assert upstream.calls["GetAllProducts"] == 2
+
+    # Crear y eliminar también invalidan el listado
+    http.post("/api/products/", json={"name": "Otro", "category": "c", "price": 3.0, "imageUrl": ""}).raise_for_status()
+    assert http.get("/api/products/").json()["count"] == 4
+    http.delete("/api/products/2")
+    assert http.get("/api/products/").json()["count"] == 3
+    assert http.get("/api/products/2").status_code == 404
+    assert upstream.calls["GetAllProducts"] == 4
@@ -0,0 +1,122 @@
+import asyncio
+import base64
+import json
+import time
+
+from app.services import revocation
+from app.services.revocation import RevocationList
+
+
+def make_token(exp=None, sub="user"):
+    """JWT sin firma válida: la lista de revocación solo lee el claim exp"""
+    claims = {"sub": sub}
+    if exp is not None:
+        claims["exp"] = exp
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_revocation_is_visible_to_another_instance_after_sync(tmp_path, monkeypatch):
+    monkeypatch.setattr(revocation, "REVOCATION_SYNC_INTERVAL", 0.01)
+    path = str(tmp_path / "revocations.db")
+    token = make_token(exp=time.time() + 3600)
+
+    async def scenario():
+        first = RevocationList("sqlite", path)
+        second = RevocationList("sqlite", path)
+        await first.start()
+        await second.start()
+        try:
+            assert not await second.is_revoked(token)
+            await first.revoke(token)
+            assert await first.is_revoked(token)
+            await asyncio.sleep(0.1)
+            assert await second.is_revoked(token)
+        finally:
+            await first.stop()
+            await second.stop()
+
+    run(scenario())
+
+
+def test_instance_started_later_loads_existing_revocations(tmp_path):
+    path = str(tmp_path / "revocations.db")
+    token = make_token(exp=time.time() + 3600)
+
+    async def scenario():
+        first = RevocationList("sqlite", path)
+        await first.start()
+        await first.revoke(token)
+        await first.stop()
+
+        second = RevocationList("sqlite", path)
+        await second.start()
+        try:
+            assert await second.is_revoked(token)
+            assert not await second.is_revoked(make_token(exp=time.time() + 3600, sub="other"))
+        finally:
+            await second.stop()
+
+    run(scenario())
+
+
+def test_rebuild_keeps_local_revocation_not_yet_read_from_store(tmp_path):
+    path = str(tmp_path / "revocations.db")
+    token = make_token(exp=time.time() + 3600)
+
+    async def scenario():
+        revocations = RevocationList("sqlite", path)
+        await revocations.start()
+        try:
+            # El INSERT de esta revocación llega a SQLite después de la lectura del rebuild
+            store_add = revocations._store.add
+            revocations._store.add = lambda key, expires_at: None
+            await revocations.revoke(token)
+            await revocations._rebuild()
+            assert await revocations.is_revoked(token)
+
+            store_add(revocation.hash_token(token), time.time() + 3600)
+            await revocations._rebuild()
+            assert await revocations.is_revoked(token)
+        finally:
+            await revocations.stop()
+
+    run(scenario())
+
+
+def test_expired_revocation_is_not_reported(tmp_path):
+    path = str(tmp_path / "revocations.db")
+    token = make_token(exp=time.time() - 1)
+
+    async def scenario():
+        first = RevocationList("sqlite", path)
+        second = RevocationList("sqlite", path)
+        await first.start()
+        await second.start()
+        try:
+            await first.revoke(token)
+            assert not await first.is_revoked(token)
+            await second._rebuild()
+            assert not await second.is_revoked(token)
+        finally:
+            await first.stop()
+            await second.stop()
+
+    run(scenario())
+
+
+def test_memory_backend_only_sees_its_own_revocations():
+    token = make_token(exp=time.time() + 3600)
+
+    async def scenario():
+        first = RevocationList("memory")
+        second = RevocationList("memory")
+        await first.revoke(token)
+        assert await first.is_revoked(token)
+        assert not await second.is_revoked(token)
+
+    run(scenario())
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+from app.services import response_cache
+from app.services.response_cache import CachedResponse, ResponseCache
+from app.services.fast_json import encode_json
+
+
+async def expire(cache, key, payload, seconds_ago=1):
+    """Guardar payload como una entrada vencida hace seconds_ago segundos"""
+    await cache.store.set(cache._key(key), CachedResponse(encode_json(payload), 200, time.time() - seconds_ago))
+
+
+def test_expired_entry_is_served_while_a_single_refresh_runs(cache_store):
+    cache = ResponseCache("products", 60, cache_store, max_stale=300)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"version": 2}
+
+    async def scenario():
+        await expire(cache, "list", {"version": 1})
+        entries = await asyncio.gather(*(cache.get_or_load("list", load) for _ in range(5)))
+        assert all(entry.payload() == {"version": 1} for entry in entries)
+        await asyncio.gather(*cache._refreshing.values())
+        return await cache.get_or_load("list", load)
+
+    fresh = asyncio.run(scenario())
+    assert fresh.payload() == {"version": 2}
+    assert len(calls) == 1
+    assert cache.stale_hits == 5
+    assert cache.refreshes == 1
+
+
+def test_failed_refresh_keeps_serving_stale_and_backs_off(cache_store, monkeypatch):
+    monkeypatch.setattr(response_cache, "CACHE_REFRESH_BACKOFF", 60)
+    cache = ResponseCache("products", 60, cache_store, max_stale=300)
+    calls = []
+
+    async def failing_load():
+        calls.append(1)
+        raise RuntimeError("microservicio caído")
+
+    async def scenario():
+        await expire(cache, "list", {"version": 1})
+        assert (await cache.get_or_load("list", failing_load)).payload() == {"version": 1}
+        await asyncio.gather(*cache._refreshing.values())
+        # Dentro del backoff no se reintenta, pero se sigue respondiendo
+        for _ in range(3):
+            assert (await cache.get_or_load("list", failing_load)).payload() == {"version": 1}
+        assert not cache._refreshing
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+    assert cache.refresh_errors == 1
+    assert cache._retry_at["list"] > time.time() + 50
+
+
+def test_entry_past_max_stale_is_loaded_before_responding(cache_store):
+    cache = ResponseCache("products", 60, cache_store, max_stale=10)
+
+    async def load():
+        return {"version": 2}
+
+    async def scenario():
+        await expire(cache, "list", {"version": 1}, seconds_ago=11)
+        return await cache.get_or_load("list", load)
+
+    assert asyncio.run(scenario()).payload() == {"version": 2}
+    assert cache.stale_hits == 0
+    assert cache.misses == 1
+
+
+def test_without_max_stale_an_expired_entry_is_a_miss(cache_store):
+    cache = ResponseCache("clients", 60, cache_store)
+
+    async def load():
+        return {"version": 2}
+
+    async def scenario():
+        await expire(cache, "item:1", {"version": 1})
+        return await cache.get_or_load("item:1", load)
+
+    assert asyncio.run(scenario()).payload() == {"version": 2}
+    assert not cache._refreshing
@@ -0,0 +1,69 @@
+import asyncio
+
+import grpc
+
+from app.services import streaming
+from app.services.streaming import open_stream
+
+
+class UnimplementedError(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNIMPLEMENTED
+
+
+class FakeCall:
+    """Llamada server-streaming de grpc.aio con mensajes fijos o un error en la primera lectura"""
+
+    def __init__(self, messages=(), error=None):
+        self.messages = list(messages)
+        self.error = error
+        self.cancelled = False
+
+    async def read(self):
+        if self.error is not None:
+            raise self.error
+        return self.messages.pop(0) if self.messages else grpc.aio.EOF
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def collect(stream):
+    async def drain():
+        return [message async for message in stream]
+    return drain()
+
+
+def test_unimplemented_stream_is_not_retried_until_the_interval_passes(monkeypatch):
+    monkeypatch.setattr(streaming, "_unimplemented", {})
+    calls = []
+
+    def start_call():
+        calls.append(1)
+        return FakeCall(error=UnimplementedError())
+
+    async def scenario():
+        assert await open_stream("StreamThings", start_call) is None
+        assert await open_stream("StreamThings", start_call) is None
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+
+    # Vencido el intervalo se vuelve a probar la RPC (el microservicio pudo actualizarse)
+    monkeypatch.setattr(streaming, "_unimplemented", {"StreamThings": 0})
+
+    async def retry():
+        return await collect(await open_stream("StreamThings", lambda: FakeCall(["a", "b"])))
+
+    assert asyncio.run(retry()) == ["a", "b"]
+    assert "StreamThings" not in streaming._unimplemented
+
+
+def test_unimplemented_is_remembered_per_method(monkeypatch):
+    monkeypatch.setattr(streaming, "_unimplemented", {})
+
+    async def scenario():
+        assert await open_stream("StreamThings", lambda: FakeCall(error=UnimplementedError())) is None
+        return await collect(await open_stream("StreamOthers", lambda: FakeCall(["x"])))
+
+    assert asyncio.run(scenario()) == ["x"]
@@ -0,0 +1,112 @@
+import asyncio
+import base64
+import json
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.middleware import auth_middleware
+from app.services import token_cache as token_cache_module
+from app.services.jwt_verifier import JwtVerifier
+from app.services.revocation import RevocationList
+from app.services.token_cache import TokenCache
+
+
+def make_token(exp=None, sub="user"):
+    """JWT sin firma válida: la caché solo lee el claim exp"""
+    claims = {"sub": sub}
+    if exp is not None:
+        claims["exp"] = exp
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+class Clock:
+    """Reemplazo de time.time controlado por la prueba"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(token_cache_module.time, "time", clock)
+    return clock
+
+
+def test_entry_expires_with_the_cache_ttl(clock):
+    cache = TokenCache(ttl=60, max_size=10)
+    token = make_token(exp=clock.now + 3600)
+    cache.set(token, {"sub": "user"})
+
+    clock.now += 59
+    assert cache.get(token) == {"sub": "user"}
+    clock.now += 1
+    assert cache.get(token) is None
+
+
+def test_entry_expires_with_the_token_exp_when_it_comes_first(clock):
+    cache = TokenCache(ttl=60, max_size=10)
+    token = make_token(exp=clock.now + 10)
+    cache.set(token, {"sub": "user"})
+
+    clock.now += 9
+    assert cache.get(token) == {"sub": "user"}
+    clock.now += 1
+    assert cache.get(token) is None
+
+
+def test_already_expired_token_is_not_cached(clock):
+    cache = TokenCache(ttl=60, max_size=10)
+    cache.set(make_token(exp=clock.now - 1), {"sub": "user"})
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_bound_discards_the_least_recently_used(clock):
+    cache = TokenCache(ttl=60, max_size=2)
+    first, second, third = (make_token(sub=name) for name in ("a", "b", "c"))
+    cache.set(first, {"sub": "a"})
+    cache.set(second, {"sub": "b"})
+    # Leer el primero lo vuelve el más reciente: se descarta el segundo
+    assert cache.get(first) == {"sub": "a"}
+    cache.set(third, {"sub": "c"})
+
+    assert cache.stats()["size"] == 2
+    assert cache.get(second) is None
+    assert cache.get(first) == {"sub": "a"}
+    assert cache.get(third) == {"sub": "c"}
+
+
+def test_revoked_token_is_never_served_from_the_cache(monkeypatch):
+    cache = TokenCache(ttl=60, max_size=10)
+    revocations = RevocationList("memory")
+    validations = []
+
+    async def validate_token(token):
+        validations.append(token)
+        return {"sub": "user"}
+
+    monkeypatch.setattr(auth_middleware, "token_cache", cache)
+    monkeypatch.setattr(auth_middleware, "revocation_list", revocations)
+    monkeypatch.setattr(auth_middleware, "jwt_verifier", JwtVerifier(enabled=False))
+    monkeypatch.setattr(auth_middleware.auth_service, "validate_token", validate_token)
+    token = make_token(exp=time.time() + 3600)
+
+    async def scenario():
+        assert await auth_middleware.verify_token(f"Bearer {token}") == {"sub": "user"}
+        assert await auth_middleware.verify_token(f"Bearer {token}") == {"sub": "user"}
+        assert len(validations) == 1
+
+        # Revocado por otra vía (otra instancia): la entrada sigue en caché pero no se usa
+        await revocations.revoke(token)
+        assert cache.get(token) is not None
+        with pytest.raises(HTTPException) as error:
+            await auth_middleware.verify_token(f"Bearer {token}")
+        assert error.value.status_code == 401
+
+    asyncio.run(scenario())